@@ -0,0 +1,438 @@
+function makePopupsDraggable() {
+function makePopupDraggable(popup) {
+var popupContent = popup.getContent();
+if (!popupContent) {
+console.log('makePopupDraggable: No popup content');
+return;
+}
+var popupElement = popup._container;
+if (!popupElement) {
+console.log('makePopupDraggable: No popup container');
+return;
+}
+var alreadySetup = popupElement.hasAttribute('data-draggable-setup');
+var header = popupElement.querySelector('.popup-header');
+if (!header) {
+console.log('makePopupDraggable: Header not found, will retry');
+if (!alreadySetup) {
+setTimeout(function() {
+makePopupDraggable(popup);
+}, 50);
+}
+return;
+}
+var closeBtn = popupElement.querySelector('.popup-close-btn');
+var hasCloseHandler = closeBtn && closeBtn.hasAttribute('data-close-handler');
+var hasDragHandler = header.hasAttribute('data-drag-handler');
+if (alreadySetup && hasCloseHandler && hasDragHandler) {
+console.log('makePopupDraggable: Popup appears set up, but re-checking handlers');
+}
+if (!alreadySetup) {
+popupElement.setAttribute('data-draggable-setup', 'true');
+console.log('makePopupDraggable: Setting up popup for the first time');
+} else {
+console.log('makePopupDraggable: Re-setting up popup elements (may be first popup)');
+}
+var isDragging = false;
+var hasBeenDragged = false;
+var startX, startY, initialX, initialY;
+var popupPane = popup._container.closest('.leaflet-popup-pane');
+if (!popupPane) return;
+popupElement.style.zIndex = '99999';
+popupElement.style.setProperty('z-index', '99999', 'important');
+if (popupPane) {
+popupPane.style.zIndex = '99999';
+popupPane.style.setProperty('z-index', '99999', 'important');
+}
+popup.options.closeOnClick = false;
+popup.options.autoClose = false;
+if (!popup._originalClosePopup) {
+popup._originalClosePopup = popup.closePopup;
+}
+popup._isDragging = false;
+popup._allowClose = true;
+popup._forceClose = false;
+popup.closePopup = function(forceClose) {
+if (forceClose === true) {
+this._forceClose = true;
+this._isDragging = false;
+this._allowClose = true;
+}
+if (this._isDragging && !this._forceClose) {
+return;
+}
+if (this._originalClosePopup) {
+this._originalClosePopup.call(this);
+} else {
+if (this._map) {
+this._map.closePopup(this);
+} else {
+if (this._container && this._container.parentNode) {
+this._container.parentNode.removeChild(this._container);
+}
+}
+}
+this._forceClose = false;
+};
+popupElement.setAttribute('data-draggable', 'true');
+var closeBtn = popupElement.querySelector('.popup-close-btn');
+if (closeBtn) {
+var needsSetup = !closeBtn.hasAttribute('data-close-handler');
+if (needsSetup) {
+var newCloseBtn = closeBtn.cloneNode(true);
+closeBtn.parentNode.replaceChild(newCloseBtn, closeBtn);
+closeBtn = newCloseBtn;
+closeBtn.addEventListener('click', function(e) {
+e.stopPropagation();
+e.preventDefault();
+e.stopImmediatePropagation();
+popup._isDragging = false;
+popup._allowClose = true;
+if (popup._map && popup._map.closePopup) {
+try {
+popup._map.closePopup(popup);
+return;
+} catch(err) {}
+}
+if (popup._originalClosePopup) {
+try {
+popup._originalClosePopup.call(popup);
+return;
+} catch(err) {}
+}
+if (popupElement && popupElement.parentNode) {
+popupElement.parentNode.removeChild(popupElement);
+}
+if (popupElement) {
+popupElement.style.display = 'none';
+}
+}, true);
+closeBtn.addEventListener('mouseup', function(e) {
+e.stopPropagation();
+e.preventDefault();
+e.stopImmediatePropagation();
+}, true);
+closeBtn.setAttribute('data-close-handler', 'true');
+console.log('Close button handler set up');
+} else {
+console.log('Close button marked as set up, but ensuring it works');
+var newCloseBtn = closeBtn.cloneNode(true);
+closeBtn.parentNode.replaceChild(newCloseBtn, closeBtn);
+closeBtn = newCloseBtn;
+closeBtn.addEventListener('click', function(e) {
+e.stopPropagation();
+e.preventDefault();
+e.stopImmediatePropagation();
+popup._isDragging = false;
+popup._allowClose = true;
+if (popup._map && popup._map.closePopup) {
+popup._map.closePopup(popup);
+} else if (popup._originalClosePopup) {
+popup._originalClosePopup.call(popup);
+}
+}, true);
+closeBtn.setAttribute('data-close-handler', 'true');
+}
+} else {
+console.log('Close button not found!');
+}
+popupElement._dragHeader = header;
+popupElement._dragPopup = popup;
+popupElement._dragPopupElement = popupElement;
+function dragStart(e) {
+var currentHeader = popupElement.querySelector('.popup-header') || popupElement._dragHeader;
+if (!currentHeader) {
+console.log('dragStart: Header not found');
+return;
+}
+if (e.target.classList.contains('popup-close-btn') ||
+e.target.closest('.popup-close-btn') ||
+e.target.tagName === 'A' ||
+e.target.closest('a')) {
+return;
+}
+var clickedOnHeader = (e.target === currentHeader || currentHeader.contains(e.target));
+if (!clickedOnHeader) {
+return;
+}
+console.log('dragStart: Starting drag on header');
+e.preventDefault();
+e.stopPropagation();
+e.stopImmediatePropagation();
+isDragging = true;
+hasBeenDragged = false;
+popup._isDragging = true;
+currentHeader.style.cursor = 'grabbing';
+popupElement.style.cursor = 'grabbing';
+if (popup._source) {
+popup._source._popup = popup;
+}
+popup._updatePosition = function() {};
+popup.options.closeOnClick = false;
+popup.options.autoClose = false;
+if (!popup._originalRemove) {
+popup._originalRemove = popup.remove;
+}
+popup.remove = function() {
+if (!isDragging) {
+if (popup._originalRemove) {
+popup._originalRemove.call(this);
+}
+}
+};
+startX = e.clientX || e.pageX;
+startY = e.clientY || e.pageY;
+var rect = popupElement.getBoundingClientRect();
+initialX = rect.left;
+initialY = rect.top;
+document.removeEventListener('mousemove', drag, true);
+document.removeEventListener('mouseup', dragEnd, true);
+document.removeEventListener('click', preventClick, true);
+document.addEventListener('mousemove', drag, true);
+document.addEventListener('mouseup', dragEnd, true);
+document.addEventListener('click', preventClick, true);
+if (popup._map) {
+popup._map.dragging.disable();
+}
+console.log('Drag started');
+}
+if (header._dragStartHandler) {
+header.removeEventListener('mousedown', header._dragStartHandler, true);
+header.removeEventListener('mousedown', header._dragStartHandler, false);
+}
+header.addEventListener('mousedown', dragStart, true);
+header.addEventListener('mousedown', dragStart, false);
+header._dragStartHandler = dragStart;
+header.setAttribute('data-drag-handler', 'true');
+console.log('Drag handler set up on header - header found:', !!header, 'header text:', header.textContent.substring(0, 50));
+var popupMousedownHandler = function(e) {
+var currentHeader = popupElement.querySelector('.popup-header');
+if (currentHeader && currentHeader.contains(e.target) && !e.target.classList.contains('popup-close-btn') && !e.target.closest('.popup-close-btn')) {
+dragStart(e);
+}
+};
+if (popupElement._dragMousedownHandler) {
+popupElement.removeEventListener('mousedown', popupElement._dragMousedownHandler, true);
+}
+popupElement.addEventListener('mousedown', popupMousedownHandler, true);
+popupElement._dragMousedownHandler = popupMousedownHandler;
+function preventClick(e) {
+if (isDragging) {
+e.preventDefault();
+e.stopPropagation();
+e.stopImmediatePropagation();
+return false;
+}
+}
+function drag(e) {
+if (!isDragging) return;
+e.preventDefault();
+e.stopPropagation();
+e.stopImmediatePropagation();
+var deltaX = e.clientX - startX;
+var deltaY = e.clientY - startY;
+if (Math.abs(deltaX) > 2 || Math.abs(deltaY) > 2) {
+hasBeenDragged = true;
+popupElement.setAttribute('data-has-been-dragged', 'true');
+}
+var newX = initialX + deltaX;
+var newY = initialY + deltaY;
+popup._updatePosition = function() {};
+popupElement.style.left = newX + 'px';
+popupElement.style.top = newY + 'px';
+popupElement.style.transform = 'none';
+popupElement.style.position = 'fixed';
+popupElement.style.margin = '0';
+popupElement.style.zIndex = '99999';
+popupElement.style.setProperty('z-index', '99999', 'important');
+var tip = popupElement.querySelector('.leaflet-popup-tip');
+if (tip) {
+tip.style.display = 'none';
+}
+popup.options.closeOnClick = false;
+popup.options.autoClose = false;
+if (popup._map) {
+popup._map.dragging.disable();
+}
+}
+function dragEnd(e) {
+if (!isDragging) return;
+e.preventDefault();
+e.stopPropagation();
+e.stopImmediatePropagation();
+isDragging = false;
+popup._isDragging = false;
+var currentHeader = popupElement.querySelector('.popup-header') || popupElement._dragHeader;
+if (currentHeader) {
+currentHeader.style.cursor = 'move';
+}
+popupElement.style.cursor = 'default';
+if (popup._originalRemove) {
+popup.remove = popup._originalRemove;
+delete popup._originalRemove;
+}
+if (popup._map) {
+popup._map.dragging.enable();
+if (hasBeenDragged) {
+popup.options.closeOnClick = false;
+popup.options.autoClose = false;
+var mapClickHandler = function(clickEvent) {
+if (!popupElement.contains(clickEvent.originalEvent.target)) {
+clickEvent.originalEvent.stopPropagation();
+clickEvent.originalEvent.preventDefault();
+}
+};
+popupElement._mapClickHandler = mapClickHandler;
+popup._map.on('click', mapClickHandler, popup);
+}
+}
+document.removeEventListener('mousemove', drag, true);
+document.removeEventListener('mouseup', dragEnd, true);
+document.removeEventListener('click', preventClick, true);
+setTimeout(function() {
+if (popup._updatePosition) {
+popup._updatePosition = function() {};
+}
+}, 100);
+}
+}
+setTimeout(function() {
+var map = null;
+if (typeof getMap === 'function') {
+map = getMap();
+}
+if (!map) {
+var container = document.querySelector('.leaflet-container');
+if (container && container._leaflet_id) {
+var id = container._leaflet_id;
+if (window[id]) {
+map = window[id];
+}
+}
+}
+if (!map) {
+var container = document.querySelector('.leaflet-container');
+for (var key in window) {
+try {
+var obj = window[key];
+if (obj && obj._container === container && obj.eachLayer) {
+map = obj;
+break;
+}
+} catch(e) {}
+}
+}
+if (map) {
+map.on('click', function(e) {
+var clickedElement = e.originalEvent.target;
+if (clickedElement && clickedElement.closest('.leaflet-popup')) {
+e.originalEvent.stopPropagation();
+return;
+}
+map.eachLayer(function(layer) {
+if (layer instanceof L.Marker) {
+var popup = layer.getPopup();
+if (popup && popup.isOpen() && !popup.options.closeOnClick) {
+e.originalEvent.stopPropagation();
+}
+}
+});
+}, true);
+map.on('popupopen', function(e) {
+console.log('Popup opened, setting up draggable functionality');
+e.popup.options.closeOnClick = false;
+e.popup.options.autoClose = false;
+function setZIndex() {
+if (e.popup._container) {
+e.popup._container.style.zIndex = '99999';
+e.popup._container.style.setProperty('z-index', '99999', 'important');
+var popupPane = e.popup._container.closest('.leaflet-popup-pane');
+if (popupPane) {
+popupPane.style.zIndex = '99999';
+popupPane.style.setProperty('z-index', '99999', 'important');
+}
+}
+}
+setZIndex();
+setTimeout(setZIndex, 1);
+setTimeout(setZIndex, 5);
+setTimeout(setZIndex, 10);
+setTimeout(setZIndex, 50);
+setTimeout(setZIndex, 100);
+if (e.popup._updatePosition) {
+e.popup._updatePosition = function() {};
+}
+requestAnimationFrame(function() {
+console.log('Setting up draggable popup - requestAnimationFrame');
+makePopupDraggable(e.popup);
+setZIndex();
+});
+console.log('Setting up draggable popup - attempt 1 (immediate)');
+makePopupDraggable(e.popup);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 2 (1ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 1);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 3 (5ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 5);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 4 (10ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 10);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 5 (25ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 25);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 6 (50ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 50);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 7 (100ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 100);
+setTimeout(function() {
+console.log('Setting up draggable popup - attempt 8 (200ms)');
+makePopupDraggable(e.popup);
+setZIndex();
+}, 200);
+if (e.popup._container) {
+var observer = new MutationObserver(function(mutations) {
+console.log('MutationObserver: DOM changed, setting up popup');
+makePopupDraggable(e.popup);
+setZIndex();
+observer.disconnect();
+});
+observer.observe(e.popup._container, { childList: true, subtree: true });
+setTimeout(function() {
+observer.disconnect();
+}, 500);
+}
+});
+var popups = document.querySelectorAll('.leaflet-popup');
+popups.forEach(function(popupEl) {
+var popup = popupEl._leaflet_popup;
+if (popup) {
+makePopupDraggable(popup);
+setTimeout(function() {
+makePopupDraggable(popup);
+}, 10);
+}
+});
+}
+}, 1000);
+}
+document.addEventListener('DOMContentLoaded', function() {
+setTimeout(makePopupsDraggable, 2000);
+});
+window.addEventListener('load', function() {
+setTimeout(makePopupsDraggable, 3000);
+});
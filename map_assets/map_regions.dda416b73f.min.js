@@ -0,0 +1,573 @@
+var leafletMap = null;
+function getMap() {
+if (leafletMap) return leafletMap;
+var container = document.querySelector('.leaflet-container');
+if (!container) return null;
+for (var key in window) {
+try {
+var obj = window[key];
+if (obj && obj._container === container && obj.eachLayer) {
+leafletMap = obj;
+return leafletMap;
+}
+} catch(e) {}
+}
+if (container._leaflet_id) {
+var id = container._leaflet_id;
+if (window[id]) {
+leafletMap = window[id];
+return leafletMap;
+}
+}
+return null;
+}
+function toggleRegionLayer(region, show) {
+var map = getMap();
+if (!map) {
+setTimeout(function() { toggleRegionLayer(region, show); }, 300);
+return;
+}
+if (regionGroupLayers[region]) {
+var layer = regionGroupLayers[region];
+try {
+if (show) {
+if (!map.hasLayer(layer)) {
+map.addLayer(layer);
+}
+} else {
+if (map.hasLayer(layer)) {
+map.removeLayer(layer);
+}
+}
+updateLayerControlCheckbox(region, show);
+updateFilterPanelCheckbox(region, show);
+return;
+} catch(e) {
+console.log('Error with stored reference:', e);
+}
+}
+var layerControl = document.querySelector('.leaflet-control-layers');
+if (!layerControl) {
+console.log('Layer control not found in DOM');
+return;
+}
+var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+if (!overlaySection) {
+console.log('Overlay section not found');
+return;
+}
+var labels = overlaySection.querySelectorAll('label');
+console.log('Found', labels.length, 'labels in overlay section');
+for (var d = 0; d < labels.length; d++) {
+var labelText = labels[d].textContent || labels[d].innerText || '';
+console.log('Label', d, ':', labelText);
+}
+var foundLabel = null;
+for (var i = 0; i < labels.length; i++) {
+var label = labels[i];
+var text = label.textContent || label.innerText || '';
+var textLower = text.toLowerCase();
+var regionLower = region.toLowerCase();
+var matches = false;
+if (text.indexOf(region) === 0 ||
+text.indexOf(region + ' ') === 0 ||
+textLower.indexOf(regionLower) === 0) {
+matches = true;
+} else if (region === 'Canada') {
+if (textLower.indexOf('canada') >= 0 || text.indexOf('🇨🇦') >= 0 || text.indexOf('Canada') >= 0) {
+matches = true;
+}
+}
+if (matches) {
+foundLabel = label;
+console.log('Found matching label:', text, 'for region:', region);
+break;
+}
+}
+if (foundLabel) {
+var input = foundLabel.querySelector('input');
+if (input) {
+console.log('Found input, current checked state:', input.checked, 'desired:', show);
+if (input.type === 'radio') {
+input.type = 'checkbox';
+}
+if (input.checked !== show) {
+console.log('Setting checkbox to:', show);
+isProgrammaticChange = true;
+var layerToggled = false;
+var allFeatureGroups = [];
+map.eachLayer(function(layer) {
+if (layer instanceof L.FeatureGroup) {
+allFeatureGroups.push(layer);
+}
+});
+var inputIndex = Array.from(overlaySection.querySelectorAll('input')).indexOf(input);
+if (inputIndex >= 0 && inputIndex < allFeatureGroups.length) {
+var targetLayer = allFeatureGroups[inputIndex];
+try {
+if (show) {
+if (!map.hasLayer(targetLayer)) {
+map.addLayer(targetLayer);
+}
+} else {
+if (map.hasLayer(targetLayer)) {
+map.removeLayer(targetLayer);
+}
+}
+regionGroupLayers[region] = targetLayer;
+layerToggled = true;
+console.log('Directly toggled layer for:', region);
+} catch(e) {
+console.log('Error toggling layer directly:', e);
+}
+}
+if (!layerToggled) {
+input.checked = show;
+var clickEvent = new MouseEvent('click', {
+bubbles: true,
+cancelable: true,
+view: window
+});
+input.dispatchEvent(clickEvent);
+var changeEvent = new Event('change', {
+bubbles: true,
+cancelable: true
+});
+input.dispatchEvent(changeEvent);
+} else {
+input.checked = show;
+}
+setTimeout(function() {
+isProgrammaticChange = false;
+}, 100);
+if (!regionGroupLayers[region]) {
+var inputIndex = Array.from(overlaySection.querySelectorAll('input')).indexOf(input);
+console.log('Input index:', inputIndex, 'FeatureGroups:', allFeatureGroups.length, 'for region:', region);
+if (inputIndex >= 0 && inputIndex < allFeatureGroups.length) {
+regionGroupLayers[region] = allFeatureGroups[inputIndex];
+console.log('Stored layer reference for:', region);
+} else {
+console.log('Could not match by index, trying to find layer by name for:', region);
+var layerControlObj = null;
+if (map._controls && map._controls.length > 0) {
+for (var c = 0; c < map._controls.length; c++) {
+var control = map._controls[c];
+if (control instanceof L.Control.Layers) {
+layerControlObj = control;
+break;
+}
+}
+}
+if (layerControlObj && layerControlObj._layers) {
+for (var l = 0; l < layerControlObj._layers.length; l++) {
+var layerInfo = layerControlObj._layers[l];
+if (layerInfo.overlay && layerInfo.name) {
+var layerName = layerInfo.name.trim();
+if (layerName.indexOf(region) === 0 ||
+(region === 'Canada' && (layerName.toLowerCase().indexOf('canada') >= 0 || layerName.indexOf('🇨🇦') >= 0))) {
+regionGroupLayers[region] = layerInfo.layer;
+console.log('Stored layer reference for', region, 'by name matching');
+break;
+}
+}
+}
+}
+}
+}
+updateFilterPanelCheckbox(region, show);
+} else {
+console.log('Checkbox already in desired state');
+updateFilterPanelCheckbox(region, show);
+}
+return;
+} else {
+console.log('No input found in label');
+}
+} else {
+console.log('Could not find checkbox for region:', region);
+console.log('Available labels:', Array.from(labels).map(function(l) { return l.textContent || l.innerText; }));
+if (window.regionCoordinates && window.regionCoordinates[region]) {
+var expectedCoord = window.regionCoordinates[region];
+var expectedLat = expectedCoord[0];
+var expectedLon = expectedCoord[1];
+console.log('Trying coordinate matching for region:', region, 'expected:', expectedLat, expectedLon);
+var allFeatureGroups = [];
+map.eachLayer(function(layer) {
+if (layer instanceof L.FeatureGroup) {
+allFeatureGroups.push(layer);
+}
+});
+for (var i = 0; i < allFeatureGroups.length; i++) {
+var fg = allFeatureGroups[i];
+var foundMarker = false;
+fg.eachLayer(function(marker) {
+if (marker instanceof L.Marker) {
+var markerLat = marker.getLatLng().lat;
+var markerLon = marker.getLatLng().lng;
+if (Math.abs(markerLat - expectedLat) < 0.1 && Math.abs(markerLon - expectedLon) < 0.1) {
+foundMarker = true;
+}
+}
+});
+if (foundMarker) {
+console.log('Matched FeatureGroup by coordinates for region:', region);
+try {
+if (show) {
+if (!map.hasLayer(fg)) {
+map.addLayer(fg);
+}
+} else {
+if (map.hasLayer(fg)) {
+map.removeLayer(fg);
+}
+}
+regionGroupLayers[region] = fg;
+updateLayerControlCheckbox(region, show);
+updateFilterPanelCheckbox(region, show);
+return;
+} catch(e) {
+console.log('Error toggling matched layer:', e);
+}
+}
+}
+}
+}
+}
+function updateLayerControlCheckbox(region, show) {
+var layerControl = document.querySelector('.leaflet-control-layers');
+if (layerControl) {
+var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+if (overlaySection) {
+var labels = overlaySection.querySelectorAll('label');
+labels.forEach(function(label) {
+var text = label.textContent || label.innerText || '';
+var textLower = text.toLowerCase();
+var regionLower = region.toLowerCase();
+var matches = false;
+if (text.indexOf(region) === 0 ||
+text.indexOf(region + ' ') === 0 ||
+textLower.indexOf(regionLower) === 0) {
+matches = true;
+} else if (region === 'Canada') {
+if (textLower.indexOf('canada') >= 0 || text.indexOf('🇨🇦') >= 0 || text.indexOf('Canada') >= 0) {
+matches = true;
+}
+}
+if (matches) {
+var input = label.querySelector('input');
+if (input) {
+if (input.type === 'radio') {
+input.type = 'checkbox';
+}
+input.checked = show;
+}
+}
+});
+}
+}
+}
+function updateFilterPanelCheckbox(region, show) {
+var filterCheckbox = document.getElementById('filter_' + region);
+if (filterCheckbox) {
+filterCheckbox.checked = show;
+} else {
+console.log('Filter panel checkbox not found for region:', region);
+}
+}
+if (!window.regionGroupLayers) {
+window.regionGroupLayers = {};
+}
+var regionGroupLayers = window.regionGroupLayers;
+var isProgrammaticChange = false;
+document.addEventListener('DOMContentLoaded', function() {
+setTimeout(function() {
+var map = getMap();
+if (!map) {
+setTimeout(arguments.callee, 500);
+return;
+}
+var layerControl = document.querySelector('.leaflet-control-layers');
+if (layerControl) {
+var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+if (overlaySection) {
+var inputs = overlaySection.querySelectorAll('input[type="radio"]');
+inputs.forEach(function(input) {
+input.type = 'checkbox';
+});
+var allOverlayInputs = overlaySection.querySelectorAll('input[type="checkbox"]');
+allOverlayInputs.forEach(function(input) {
+input.addEventListener('change', function() {
+if (isProgrammaticChange) {
+return;
+}
+var label = this.closest('label');
+if (label) {
+var labelText = label.textContent || label.innerText || '';
+var labelTextLower = labelText.toLowerCase();
+var regions = ['West', 'South', 'Midwest', 'Northeast', 'Alaska', 'Hawaii', 'Canada'];
+for (var r = 0; r < regions.length; r++) {
+var region = regions[r];
+var regionLower = region.toLowerCase();
+if (labelText.indexOf(region) === 0 ||
+labelText.indexOf(region + ' ') === 0 ||
+labelTextLower.indexOf(regionLower) === 0 ||
+(region === 'Canada' && (labelTextLower.indexOf('canada') >= 0 || labelText.indexOf('🇨🇦') >= 0))) {
+console.log('Layer control checkbox changed for region:', region, 'checked:', this.checked);
+updateFilterPanelCheckbox(region, this.checked);
+break;
+}
+}
+}
+});
+});
+}
+}
+var layerControlObj = null;
+if (map._controls && map._controls.length > 0) {
+for (var i = 0; i < map._controls.length; i++) {
+var control = map._controls[i];
+if (control instanceof L.Control.Layers) {
+layerControlObj = control;
+break;
+}
+}
+}
+console.log('Initializing region groups...');
+var regions = ['West', 'South', 'Midwest', 'Northeast', 'Alaska', 'Hawaii', 'Canada'];
+console.log('Map controls:', map._controls ? map._controls.length : 'null');
+if (map._controls) {
+for (var c = 0; c < map._controls.length; c++) {
+console.log('  Control', c, ':', map._controls[c].constructor.name);
+}
+}
+if (layerControlObj) {
+console.log('Layer control object found');
+console.log('Layer control _layers:', layerControlObj._layers ? layerControlObj._layers.length : 'null');
+if (layerControlObj._layers && layerControlObj._layers.length > 0) {
+console.log('Found layer control with', layerControlObj._layers.length, 'layers');
+for (var i = 0; i < layerControlObj._layers.length; i++) {
+var layerInfo = layerControlObj._layers[i];
+console.log('Layer', i, ':', {
+overlay: layerInfo.overlay,
+name: layerInfo.name,
+hasLayer: !!layerInfo.layer
+});
+if (layerInfo.overlay && layerInfo.name) {
+var layerName = layerInfo.name.trim();
+console.log('Processing layer:', layerName);
+for (var j = 0; j < regions.length; j++) {
+if (layerName.indexOf(regions[j]) === 0) {
+if (!regionGroupLayers[regions[j]]) {
+regionGroupLayers[regions[j]] = layerInfo.layer;
+console.log('✓ Stored', regions[j], 'from layer control');
+} else {
+console.log('  (Already stored:', regions[j], ')');
+}
+break;
+}
+}
+}
+}
+} else {
+console.log('Layer control has no _layers array or it is empty');
+}
+} else {
+console.log('Layer control object not found in map._controls');
+}
+if (window.regionCoordinates) {
+console.log('Using coordinate matching to store region groups...');
+var mapLayerCount = 0;
+var allFeatureGroups = [];
+map.eachLayer(function(layer) {
+if (layer instanceof L.FeatureGroup) {
+mapLayerCount++;
+allFeatureGroups.push(layer);
+}
+});
+console.log('Found', mapLayerCount, 'FeatureGroups on map');
+for (var r = 0; r < regions.length; r++) {
+var region = regions[r];
+if (window.regionCoordinates[region]) {
+var expectedCoord = window.regionCoordinates[region];
+var expectedLat = expectedCoord[0];
+var expectedLon = expectedCoord[1];
+for (var i = 0; i < allFeatureGroups.length; i++) {
+var fg = allFeatureGroups[i];
+var foundMarker = false;
+fg.eachLayer(function(marker) {
+if (marker instanceof L.Marker) {
+var markerLat = marker.getLatLng().lat;
+var markerLon = marker.getLatLng().lng;
+if (Math.abs(markerLat - expectedLat) < 0.1 && Math.abs(markerLon - expectedLon) < 0.1) {
+foundMarker = true;
+}
+}
+});
+if (foundMarker && !regionGroupLayers[region]) {
+regionGroupLayers[region] = fg;
+console.log('✓ Stored', region, 'by coordinate matching');
+break;
+}
+}
+}
+}
+}
+console.log('Region groups stored:', Object.keys(regionGroupLayers));
+console.log('Total groups found:', Object.keys(regionGroupLayers).length);
+if (Object.keys(regionGroupLayers).length > 0) {
+console.log('✓ Region groups initialized successfully!');
+} else {
+console.log('Note: Region groups will be stored on first toggle');
+}
+setupParkHighlighting(map);
+}, 2000);
+});
+function setupParkHighlighting(map) {
+if (!window.parkData || !map) return;
+var highlightedMarkers = [];
+var originalIcons = {};
+var clickedMarker = null;
+var currentPopup = null;
+function resetHighlights() {
+if (clickedMarker && originalIcons[clickedMarker._leaflet_id]) {
+clickedMarker.setIcon(originalIcons[clickedMarker._leaflet_id]);
+}
+highlightedMarkers.forEach(function(item) {
+if (item instanceof L.CircleMarker) {
+map.removeLayer(item);
+} else if (item instanceof L.Marker && originalIcons[item._leaflet_id]) {
+item.setIcon(originalIcons[item._leaflet_id]);
+}
+});
+highlightedMarkers = [];
+originalIcons = {};
+clickedMarker = null;
+currentPopup = null;
+}
+function highlightNearbyParks(clickedPark, clickedLayer) {
+resetHighlights();
+clickedMarker = clickedLayer;
+if (clickedLayer) {
+if (!originalIcons[clickedLayer._leaflet_id]) {
+originalIcons[clickedLayer._leaflet_id] = clickedLayer.options.icon;
+}
+var orangeIcon = L.icon({
+iconUrl: 'https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/marker-icon-orange.png',
+shadowUrl: 'https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.7/images/marker-shadow.png',
+iconSize: [25, 41],
+iconAnchor: [12, 41],
+popupAnchor: [1, -34],
+shadowSize: [41, 41]
+});
+clickedLayer.setIcon(orangeIcon);
+}
+if (!clickedPark.nearby_parks || clickedPark.nearby_parks.length === 0) {
+return;
+}
+var nearbyParkNames = clickedPark.nearby_parks.map(function(p) { return p.name; });
+map.eachLayer(function(layer) {
+if (layer instanceof L.Marker) {
+var markerLat = layer.getLatLng().lat;
+var markerLon = layer.getLatLng().lng;
+for (var i = 0; i < window.parkData.length; i++) {
+var park = window.parkData[i];
+if (Math.abs(park.lat - markerLat) < 0.01 && Math.abs(park.lon - markerLon) < 0.01) {
+if (nearbyParkNames.indexOf(park.name) >= 0) {
+if (!originalIcons[layer._leaflet_id]) {
+originalIcons[layer._leaflet_id] = layer.options.icon;
+}
+var circle = L.circleMarker([markerLat, markerLon], {
+radius: 25,
+fillColor: '#3388ff',
+color: '#0066cc',
+weight: 3,
+opacity: 0.8,
+fillOpacity: 0.3
+});
+circle.addTo(map);
+highlightedMarkers.push(circle);
+break;
+}
+}
+}
+}
+});
+console.log('Highlighted clicked park and', highlightedMarkers.length, 'nearby parks');
+}
+setTimeout(function() {
+map.eachLayer(function(layer) {
+if (layer instanceof L.Marker) {
+layer.on('click', function(e) {
+var markerLat = e.latlng.lat;
+var markerLon = e.latlng.lng;
+var clickedLayer = e.target;
+setTimeout(function() {
+if (currentPopup && currentPopup.isOpen()) {
+var newPopup = clickedLayer.getPopup();
+if (!newPopup || !newPopup.isOpen() || currentPopup !== newPopup) {
+try {
+currentPopup.closePopup(true);
+} catch(err) {
+console.log('Error closing currentPopup:', err);
+}
+}
+}
+var newPopup = clickedLayer.getPopup();
+map.eachLayer(function(layer) {
+if (layer instanceof L.Marker) {
+var popup = layer.getPopup();
+if (popup && popup.isOpen() && popup !== newPopup) {
+try {
+popup.closePopup(true);
+} catch(err) {}
+}
+}
+});
+var newPopup = clickedLayer.getPopup();
+if (map._popup && map._popup.isOpen() && map._popup !== newPopup) {
+try {
+map._popup.closePopup(true);
+} catch(err) {}
+}
+}, 50);
+for (var i = 0; i < window.parkData.length; i++) {
+var park = window.parkData[i];
+if (Math.abs(park.lat - markerLat) < 0.01 && Math.abs(park.lon - markerLon) < 0.01) {
+highlightNearbyParks(park, clickedLayer);
+setTimeout(function() {
+var popup = clickedLayer.getPopup();
+if (popup && popup.isOpen()) {
+currentPopup = popup;
+console.log('Tracking popup for highlights');
+}
+}, 100);
+break;
+}
+}
+});
+}
+});
+map.on('popupopen', function(e) {
+currentPopup = e.popup;
+console.log('Popup opened, setting z-index and keeping highlights');
+setTimeout(function() {
+if (e.popup._container) {
+e.popup._container.style.zIndex = '99999';
+e.popup._container.style.setProperty('z-index', '99999', 'important');
+var popupPane = e.popup._container.closest('.leaflet-popup-pane');
+if (popupPane) {
+popupPane.style.zIndex = '99999';
+popupPane.style.setProperty('z-index', '99999', 'important');
+}
+}
+}, 10);
+});
+map.on('popupclose', function(e) {
+console.log('Popup closed, resetting highlights');
+if (currentPopup === e.popup || !currentPopup || !currentPopup.isOpen()) {
+resetHighlights();
+}
+});
+console.log('Park highlighting setup complete');
+}, 3000);
+}
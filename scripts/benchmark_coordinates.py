@@ -0,0 +1,121 @@
+"""
+Benchmark coordinate extraction over saved Wikipedia pages
+Compares wiki_coordinates.extract_coordinates with the BeautifulSoup lookup
+the scrapers used to do, checking that both return the same (lat, lon) and
+reporting time and peak memory per page
+
+Usage:
+    python3 scripts/benchmark_coordinates.py [page.html | directory ...]
+With no arguments the committed fixture pages in scripts/fixtures/wiki_pages are
+used; pass build/http_cache to run over the pages the scrapers downloaded
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from wiki_coordinates import extract_coordinates, parse_geohack_params
+
+# Small pages covering each shape the extractor handles, including markup
+# inside HTML comments that must be ignored
+FIXTURE_PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'wiki_pages')
+
+
+def soup_coordinates(content):
+    """Reference implementation: full DOM parse, as get_coordinates_from_page did"""
+    soup = BeautifulSoup(content, 'html.parser')
+    coord_span = soup.find('span', {'class': 'geo'})
+    if coord_span:
+        text = coord_span.get_text()
+        if ';' in text:
+            parts = text.split(';')
+            if len(parts) == 2:
+                try:
+                    return float(parts[0].strip()), float(parts[1].strip())
+                except ValueError:
+                    pass
+    coord_link = soup.find('a', href=lambda x: x and 'geohack' in x)
+    if coord_link:
+        return parse_geohack_params(coord_link.get('href', ''))
+    return None, None
+
+
+def find_pages(paths):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ('*.html', '*.htm', '*.body'):
+                pages.extend(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        else:
+            pages.append(path)
+    return sorted(pages)
+
+
+def expected_coordinates(pages):
+    """{page: (lat, lon)} from the expected.json next to any of the pages"""
+    expected = {}
+    for directory in sorted({os.path.dirname(page) for page in pages}):
+        path = os.path.join(directory, 'expected.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for filename, coordinates in json.load(f).items():
+                    expected[os.path.join(directory, filename)] = tuple(coordinates)
+    return expected
+
+
+def measure(function, content):
+    """(result, seconds, peak bytes allocated) for one call"""
+    start = time.perf_counter()
+    result = function(content)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    pages = find_pages(sys.argv[1:] or [FIXTURE_PAGES_DIR])
+    if not pages:
+        print(f"No saved pages found (looked in {', '.join(sys.argv[1:]) or FIXTURE_PAGES_DIR})")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"Coordinate extraction benchmark over {len(pages)} pages")
+    print("=" * 60)
+
+    totals = {'soup': [0.0, 0], 'fast': [0.0, 0]}
+    known = expected_coordinates(pages)
+    mismatches = []
+    for path in pages:
+        with open(path, 'rb') as f:
+            content = f.read()
+        expected, soup_time, soup_peak = measure(soup_coordinates, content)
+        actual, fast_time, fast_peak = measure(extract_coordinates, content)
+        totals['soup'][0] += soup_time
+        totals['soup'][1] = max(totals['soup'][1], soup_peak)
+        totals['fast'][0] += fast_time
+        totals['fast'][1] = max(totals['fast'][1], fast_peak)
+        if actual != expected:
+            mismatches.append((path, f"soup={expected}", actual))
+        elif path in known and actual != known[path]:
+            mismatches.append((path, f"expected={known[path]}", actual))
+
+    for label, name in (('soup', 'BeautifulSoup'), ('fast', 'extract_coordinates')):
+        seconds, peak = totals[label]
+        print(f"{name:>20}: {seconds / len(pages) * 1000:8.3f} ms/page, peak {peak / 1024:8.1f} KB")
+    speedup = totals['soup'][0] / max(totals['fast'][0], 1e-9)
+    print(f"{'speedup':>20}: {speedup:.1f}x")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} pages differ:")
+        for path, expected, actual in mismatches[:20]:
+            print(f"   {path}: {expected} fast={actual}")
+        sys.exit(1)
+    print("\n✅ Same coordinates on every page")
@@ -0,0 +1,298 @@
+"""
+Autocomplete index for attraction names
+Builds a path-compressed trie over normalized names and aliases (the
+parenthesised alternate names that open many descriptions), where every node
+keeps its best completions, plus a trigram index over the name vocabulary for
+one-typo fallback, and writes them to public/data/autocomplete.json
+
+Usage:
+    python3 scripts/build_autocomplete.py [--query TEXT ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+from build_cache import write_if_changed
+from build_search_index import tokenize
+from build_world_catalog import sort_order
+from catalog_binary import load_packed_catalog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTOCOMPLETE_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data', 'autocomplete.json'))
+
+AUTOCOMPLETE_VERSION = 1
+
+# Completions stored per trie node, so a lookup never visits the subtree
+TOP_K = 10
+
+# How a key was derived from an attraction; lower ranks first
+NAME, ALIAS, INNER_WORD = 0, 1, 2
+
+# Typo fallback: shortest query word it is tried for and the most corrected
+# words tried per query word
+FUZZY_MIN_LENGTH = 4
+FUZZY_CANDIDATES = 10
+
+
+def normalize(text):
+    return ' '.join(tokenize(text))
+
+
+def aliases(name, description):
+    """Alternate names from descriptions such as 'Name (Alias/Other) - ...'"""
+    match = re.match(r'\s*' + re.escape(name) + r'\s*\(([^)]+)\)', description or '')
+    if not match:
+        return []
+    return [alias.strip() for alias in match.group(1).split('/') if alias.strip()]
+
+
+def attraction_keys(name, description):
+    """(normalized key, rank) pairs an attraction can be completed from"""
+    keys = {}
+    for text, rank in [(name, NAME)] + [(alias, ALIAS) for alias in aliases(name, description)]:
+        words = tokenize(text)
+        for start in range(len(words)):
+            key = ' '.join(words[start:])
+            keys[key] = min(keys.get(key, INNER_WORD), rank if start == 0 else INNER_WORD)
+    return keys
+
+
+class _Node:
+    __slots__ = ('children', 'entries', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+        self.top = []
+
+
+def _fill_top(node, top_k):
+    """Best top_k (order, document) pairs of the subtree, one per document, bottom-up"""
+    stack = [(node, False)]
+    while stack:
+        current, done = stack.pop()
+        if not done:
+            stack.append((current, True))
+            stack.extend((child, False) for child in current.children.values())
+            continue
+        best = {}
+        candidates = current.entries + [entry for child in current.children.values() for entry in child.top]
+        for order, document in candidates:
+            if document not in best or order < best[document]:
+                best[document] = order
+        current.top = sorted((order, document) for document, order in best.items())[:top_k]
+
+
+def build_trie(keyed_documents, top_k=TOP_K):
+    """
+    Path-compressed trie as [label, [child node, ...], [document, ...]] lists,
+    root first. A node's documents are the best completions of every key
+    below it, ordered by (rank, name length, document)
+    """
+    root = _Node()
+    for key, order, document in keyed_documents:
+        node = root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+        node.entries.append((order, document))
+    _fill_top(root, top_k)
+
+    nodes = [['', [], [document for _, document in root.top]]]
+    stack = [(0, root)]
+    while stack:
+        index, node = stack.pop()
+        for char in sorted(node.children):
+            child = node.children[char]
+            label = char
+            # Chains of single-child nodes without keys of their own share
+            # the same completions, so they collapse into one labelled edge
+            while len(child.children) == 1 and not child.entries:
+                (char, child), = child.children.items()
+                label += char
+            nodes[index][1].append(len(nodes))
+            nodes.append([label, [], [document for _, document in child.top]])
+            stack.append((len(nodes) - 1, child))
+    return nodes
+
+
+def trigrams(word):
+    """Start-padded trigrams; a word of n letters has n of them"""
+    padded = '$$' + word
+    return [padded[i:i + 3] for i in range(len(word))]
+
+
+def build_autocomplete(catalog, top_k=TOP_K):
+    _, order = sort_order(catalog)
+    keyed_documents = []
+    vocabulary = set()
+    for document, i in enumerate(order):
+        name = catalog.names[i]
+        for key, rank in attraction_keys(name, catalog.descriptions[i]).items():
+            keyed_documents.append((key, (rank, len(name)), document))
+            vocabulary.update(key.split())
+
+    words = sorted(vocabulary)
+    postings = defaultdict(list)
+    for index, word in enumerate(words):
+        for trigram in dict.fromkeys(trigrams(word)):
+            postings[trigram].append(index)
+    # Word numbers are stored as gaps from the previous one
+    for posting in postings.values():
+        posting[1:] = [b - a for a, b in zip(posting, posting[1:])]
+
+    return {
+        'version': AUTOCOMPLETE_VERSION,
+        'top_k': top_k,
+        'attractions': [catalog.ids[i] for i in order],
+        'nodes': build_trie(keyed_documents, top_k),
+        'words': words,
+        'trigrams': dict(sorted(postings.items())),
+    }
+
+
+def write_autocomplete(index, output_path=AUTOCOMPLETE_PATH):
+    data = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(output_path, data)
+
+
+def load_autocomplete(path=AUTOCOMPLETE_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def lookup(index, prefix):
+    """Documents completing a normalized prefix, best first; one step per character"""
+    nodes = index['nodes']
+    node = 0
+    position = 0
+    while position < len(prefix):
+        for child in nodes[node][1]:
+            label = nodes[child][0]
+            if label[0] == prefix[position]:
+                break
+        else:
+            return []
+        rest = prefix[position:position + len(label)]
+        if not label.startswith(rest):
+            return []
+        node = child
+        position += len(label)
+    return nodes[node][2]
+
+
+def edit_distance(a, b, prefix=False):
+    """Levenshtein distance from a to b, or to the closest prefix of b"""
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        previous = current
+    return min(previous) if prefix else previous[-1]
+
+
+def corrections(index, word, prefix=False):
+    """Vocabulary words one edit from word (from a prefix of them when prefix is set)"""
+    grams = set(trigrams(word))
+    # One edit changes at most three of the word's trigrams
+    needed = len(grams) - 3
+    if len(word) < FUZZY_MIN_LENGTH or needed < 1:
+        return []
+    shared = defaultdict(int)
+    for trigram in grams:
+        candidate = 0
+        for gap in index['trigrams'].get(trigram, ()):
+            candidate += gap
+            shared[candidate] += 1
+    found = []
+    for candidate in sorted(c for c, count in shared.items() if count >= needed):
+        other = index['words'][candidate]
+        if other != word and edit_distance(word, other, prefix) <= 1:
+            found.append(other)
+            if len(found) >= FUZZY_CANDIDATES:
+                break
+    return found
+
+
+def complete(index, query, limit=TOP_K):
+    """
+    Attraction ids completing query, best first. Exact prefix matches come
+    first; when there are fewer than limit, completions with one query word
+    corrected by a single edit follow (the last word as a prefix)
+    """
+    words = normalize(query).split()
+    if not words:
+        return []
+    documents = list(lookup(index, ' '.join(words)))
+    for position, word in enumerate(words):
+        if len(documents) >= limit:
+            break
+        for correction in corrections(index, word, prefix=position == len(words) - 1):
+            corrected = words[:position] + [correction] + words[position + 1:]
+            documents += [d for d in lookup(index, ' '.join(corrected)) if d not in documents]
+    return [index['attractions'][document] for document in documents[:limit]]
+
+
+def benchmark(index, queries, repeat=5):
+    """(mean, 95th percentile) milliseconds per complete() call over queries"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            complete(index, query)
+        timings.append((time.perf_counter() - start) * 1000 / repeat)
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.95)]
+
+
+def benchmark_queries(catalog):
+    """The first 3-8 letters of every name, plus the same with one letter dropped"""
+    queries = []
+    for name in catalog.names:
+        key = normalize(name)
+        for length in range(3, min(len(key), 8) + 1):
+            queries.append(key[:length])
+            queries.append(key[:length // 2] + key[length // 2 + 1:length])
+    return queries
+
+
+def print_completions(index, query):
+    start = time.perf_counter()
+    results = complete(index, query)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔍 {len(results)} completions for {query!r} in {elapsed:.3f} ms")
+    for attraction_id in results:
+        print(f"   {attraction_id}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the attraction name autocomplete index')
+    parser.add_argument('--query', action='append', help='complete against the built index instead of rebuilding it')
+    parser.add_argument('--benchmark', action='store_true', help='time completions of name prefixes against the built index')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        with load_packed_catalog() as catalog:
+            queries = benchmark_queries(catalog)
+        mean, p95 = benchmark(load_autocomplete(), queries)
+        print(f"⏱️  {len(queries)} queries: mean {mean:.3f} ms, p95 {p95:.3f} ms")
+    elif args.query:
+        index = load_autocomplete()
+        for query in args.query:
+            print_completions(index, query)
+    else:
+        print("=" * 60)
+        print("Autocomplete Builder")
+        print("=" * 60)
+
+        with load_packed_catalog() as catalog:
+            index = build_autocomplete(catalog)
+        rewritten = write_autocomplete(index)
+        print(f"✅ {len(index['attractions'])} attractions, {len(index['nodes'])} trie nodes, "
+              f"{len(index['words'])} words, {len(index['trigrams'])} trigrams")
+        print(f"📁 {'Saved' if rewritten else 'Unchanged'}: {AUTOCOMPLETE_PATH} "
+              f"({os.path.getsize(AUTOCOMPLETE_PATH) / 1024:.1f} KB)")
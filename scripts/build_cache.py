@@ -0,0 +1,111 @@
+"""
+Content-hash build cache
+Remembers a key for every build step (hash of its sources and inputs) plus
+the hashes of the files it wrote, so unchanged steps are skipped and
+unchanged outputs are never rewritten
+"""
+
+import hashlib
+import json
+import os
+
+from catalog import BUILD_DIR
+
+PROJECT_ROOT = os.path.dirname(BUILD_DIR)
+CACHE_PATH = os.path.join(BUILD_DIR, 'build_cache.json')
+CACHE_VERSION = 1
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly them. Returns True when written"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return True
+
+
+def replace_if_changed(temp_path, path):
+    """Move temp_path over path if the contents differ, otherwise drop it. Returns True when replaced"""
+    with open(temp_path, 'rb') as f:
+        data = f.read()
+    os.remove(temp_path)
+    return write_if_changed(path, data)
+
+
+class BuildCache:
+    """
+    Step keys and output hashes stored in build/build_cache.json.
+
+    File hashes are memoized by (size, mtime_ns), so checking a step whose
+    files have not been touched costs one stat() per file.
+    """
+
+    def __init__(self, path=CACHE_PATH, root=PROJECT_ROOT):
+        self.path = path
+        self.root = root
+        self.files = {}
+        self.steps = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.files = data['files']
+                self.steps = data['steps']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.join(self.root, path), self.root).replace(os.sep, '/')
+
+    def file_hash(self, path):
+        """SHA-256 of a file relative to the project root, or None when it does not exist"""
+        relative = self._relative(path)
+        try:
+            stat = os.stat(os.path.join(self.root, relative))
+        except OSError:
+            self.files.pop(relative, None)
+            return None
+        cached = self.files.get(relative)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        with open(os.path.join(self.root, relative), 'rb') as f:
+            digest = hash_bytes(f.read())
+        self.files[relative] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def key(self, *parts, files=()):
+        """Step key from JSON-serializable parts and the contents of files"""
+        digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8'))
+        for path in sorted(self._relative(p) for p in files):
+            digest.update(f"\0{path}\0{self.file_hash(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, step, key):
+        """True when step last ran with key and its outputs are still what it wrote"""
+        entry = self.steps.get(step)
+        if not entry or entry['key'] != key:
+            return False
+        return all(self.file_hash(path) == digest for path, digest in entry['outputs'].items())
+
+    def record(self, step, key, outputs):
+        self.steps[step] = {'key': key, 'outputs': {self._relative(p): self.file_hash(p) for p in outputs}}
+
+    def forget(self, step):
+        self.steps.pop(step, None)
+
+    def save(self):
+        data = json.dumps({'version': CACHE_VERSION, 'files': self.files, 'steps': self.steps},
+                          sort_keys=True, separators=(',', ':')).encode('utf-8')
+        write_if_changed(self.path, data)
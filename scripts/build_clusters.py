@@ -0,0 +1,134 @@
+"""
+Precomputed marker clusters for the low zoom levels
+Greedily merges mapped attractions lying within CLUSTER_RADIUS pixels of each
+other at zooms 2-5, building each zoom from the clusters of the zoom above, and
+writes centroids, counts and category mixes to public/data/clusters.json
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from build_cache import write_if_changed
+from build_vector_tiles import mercator
+from catalog_binary import load_packed_catalog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CLUSTERS_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data', 'clusters.json'))
+
+MIN_ZOOM = 2
+MAX_ZOOM = 5
+# Screen pixels on Leaflet's 256-pixel tiles
+TILE_SIZE = 256
+CLUSTER_RADIUS = 40
+
+CLUSTER_FIELDS = ['lat', 'lon', 'count', 'categories', 'children']
+
+
+def unmercator(x, y):
+    """Inverse of build_vector_tiles.mercator: (lat, lon) in degrees"""
+    lon = x * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(math.pi * (1 - 2 * y))))
+    return lat, lon
+
+
+def cluster_level(x, y, weight, radius):
+    """
+    One greedy supercluster-style pass. Points are visited heaviest first and
+    each point not yet taken starts a cluster that absorbs every free point
+    within radius (in world fractions). Returns (cluster of every point, clusters).
+    Distances do not wrap across the antimeridian.
+    """
+    cx = np.floor(x / radius).astype(np.int64)
+    cy = np.floor(y / radius).astype(np.int64)
+    grid = {}
+    for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+        grid.setdefault(key, []).append(i)
+
+    parent = np.full(len(x), -1, dtype=np.int64)
+    radius_sq = radius * radius
+    clusters = 0
+    for i in np.lexsort((np.arange(len(x)), -weight)):
+        if parent[i] >= 0:
+            continue
+        parent[i] = clusters
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in grid.get((cx[i] + dx, cy[i] + dy), ()):
+                    if parent[j] < 0 and (x[j] - x[i]) ** 2 + (y[j] - y[i]) ** 2 <= radius_sq:
+                        parent[j] = clusters
+        clusters += 1
+    return parent, clusters
+
+
+def build_clusters(catalog, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, radius=CLUSTER_RADIUS):
+    """
+    Cluster hierarchy as a JSON-ready dict. zooms[z] lists clusters as
+    CLUSTER_FIELDS rows: categories is flattened (category index, count) pairs
+    and children indexes the clusters of zoom z + 1, or, at max_zoom, the
+    attractions list.
+    """
+    indices = np.nonzero(catalog.has_coordinates)[0]
+    categories = list(catalog.category.values)
+    code_of = {category: i for i, category in enumerate(categories)}
+
+    x, y = mercator(catalog.lat[indices], catalog.lon[indices])
+    weight = np.ones(len(indices))
+    mix = np.zeros((len(indices), len(categories)), dtype=np.int64)
+    mix[np.arange(len(indices)), [code_of[catalog.category[i]] for i in indices]] = 1
+
+    zooms = {}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        parent, count = cluster_level(x, y, weight, radius / (TILE_SIZE << zoom))
+        cluster_weight = np.bincount(parent, weights=weight, minlength=count)
+        x = np.bincount(parent, weights=x * weight, minlength=count) / cluster_weight
+        y = np.bincount(parent, weights=y * weight, minlength=count) / cluster_weight
+        cluster_mix = np.zeros((count, len(categories)), dtype=np.int64)
+        np.add.at(cluster_mix, parent, mix)
+
+        children = [[] for _ in range(count)]
+        for child, cluster in enumerate(parent.tolist()):
+            children[cluster].append(child)
+
+        lat, lon = unmercator(x, y)
+        zooms[str(zoom)] = [
+            [round(float(lat[c]), 5), round(float(lon[c]), 5), int(cluster_weight[c]),
+             [int(v) for code in np.nonzero(cluster_mix[c])[0] for v in (code, cluster_mix[c, code])],
+             children[c]]
+            for c in range(count)
+        ]
+        weight, mix = cluster_weight, cluster_mix
+
+    return {
+        'min_zoom': min_zoom,
+        'max_zoom': max_zoom,
+        'radius': radius,
+        'tile_size': TILE_SIZE,
+        'categories': categories,
+        'attractions': [catalog.ids[i] for i in indices],
+        'fields': CLUSTER_FIELDS,
+        'zooms': zooms,
+    }
+
+
+def write_clusters(clusters, output_path=CLUSTERS_PATH):
+    data = json.dumps(clusters, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(output_path, data)
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Cluster Builder")
+    print("=" * 60)
+
+    with load_packed_catalog() as catalog:
+        clusters = build_clusters(catalog)
+    rewritten = write_clusters(clusters)
+    print(f"✅ {len(clusters['attractions'])} attractions")
+    for zoom in range(clusters['min_zoom'], clusters['max_zoom'] + 1):
+        rows = clusters['zooms'][str(zoom)]
+        largest = max(row[2] for row in rows)
+        print(f"   zoom {zoom}: {len(rows)} clusters, largest {largest}")
+    print(f"📁 {'Saved' if rewritten else 'Unchanged'}: {CLUSTERS_PATH}")
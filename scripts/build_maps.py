@@ -0,0 +1,295 @@
+"""
+Build per-country, per-category and world attraction maps in parallel
+Loads the catalog, airports and precomputed nearby index once, then renders
+every map variant in a process pool into build/maps (one HTML file each plus
+the shared map_assets and an index.html linking them)
+
+Usage:
+    python3 scripts/build_maps.py [variant ...] [--workers N] [--list] [--output-dir DIR] [--compress gzip|br]
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import folium
+import numpy as np
+from folium import plugins
+
+from build_cache import write_if_changed
+from build_nearby_index import attraction_radius, build_nearby_index, file_hash, load_previous
+from catalog import AIRPORTS_FILE, BUILD_DIR, PUBLIC_DATA_DIR, get_source, load_airports
+from catalog_binary import load_packed_catalog
+from map_assets import build_assets
+from map_export import COMPRESSIONS, save_map
+from map_layers import ParkFeatureLayer
+
+MAPS_DIR = os.path.join(BUILD_DIR, 'maps')
+NEARBY_INDEX_PATH = os.path.join(PUBLIC_DATA_DIR, 'nearby_index.json')
+
+# Countries with fewer attractions are only shown on the world and regional maps
+MIN_COUNTRY_ATTRACTIONS = 10
+# Categories spread over several countries also get a world-wide map
+WORLD_CATEGORIES = ['Parks', 'UNESCO', 'MostPhotographed']
+NEARBY_SHOWN = 5
+
+# AwesomeMarkers colour and glyphicon per category
+CATEGORY_MARKERS = {
+    'Parks': ('green', 'tree-conifer'),
+    'UNESCO': ('blue', 'globe'),
+    'MostPhotographed': ('purple', 'camera'),
+    'Jyotirlinga': ('orange', 'star'),
+    'ShaktiPeetha': ('darkred', 'star'),
+    'DivyaDesam': ('orange', 'star'),
+    'OtherTemples': ('orange', 'star'),
+    'Temples': ('orange', 'star'),
+    'Matham': ('cadetblue', 'home'),
+    'Forts': ('gray', 'tower'),
+    'TrekkingFlights': ('darkblue', 'plane'),
+}
+DEFAULT_MARKER = ('lightgray', 'map-marker')
+
+LOCATION_LABELS = {'United States': 'State(s)', 'Canada': 'Province(s)'}
+
+# filters are catalog.where() keyword arguments
+MapVariant = namedtuple('MapVariant', 'name title filters')
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def spaced(key):
+    """'WestAsia-UNESCO' -> 'West Asia UNESCO', 'India-DivyaDesam' -> 'India Divya Desam'"""
+    return re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', key.replace('-', ' '))
+
+
+def map_variants(catalog, min_country=MIN_COUNTRY_ATTRACTIONS):
+    """World map, one map per country with at least min_country mapped attractions and one per category region"""
+    mapped = np.nonzero(catalog.has_coordinates)[0]
+    variants = [MapVariant('world', 'World Attractions', {})]
+
+    for category in WORLD_CATEGORIES:
+        variants.append(MapVariant(f"world-{slugify(category)}", f"World {spaced(category)}", {'category': category}))
+
+    countries = Counter(catalog.country[i] for i in mapped)
+    for country, count in sorted(countries.items()):
+        if count >= min_country:
+            variants.append(MapVariant(slugify(country), f"{country} Attractions", {'country': country}))
+
+    # Category regions such as India-DivyaDesam, Nepal-Temples or WestAsia-UNESCO
+    regions = sorted({catalog.region[i] for i in mapped if '-' in catalog.region[i]})
+    for region in regions:
+        variants.append(MapVariant(slugify(region), spaced(region), {'region': region}))
+    return variants
+
+
+def load_nearby(catalog, airports):
+    """
+    Neighbour lists from public/data/nearby_index.json as
+    ({attraction id: [(name, miles), ...]}, {attraction id: [(iata, name, miles), ...]}).
+    The index is rebuilt first when a CSV changed since it was written.
+    """
+    index = load_previous(NEARBY_INDEX_PATH)
+    current = {
+        filename: file_hash(os.path.join(PUBLIC_DATA_DIR, filename))
+        for filename in sorted(os.listdir(PUBLIC_DATA_DIR))
+        if filename.endswith('.csv') and (filename == AIRPORTS_FILE or get_source(filename))
+    }
+    if index is None or index['hashes'] != current:
+        print("Nearby index is missing or stale, updating it")
+        build_nearby_index(PUBLIC_DATA_DIR, NEARBY_INDEX_PATH)
+        index = load_previous(NEARBY_INDEX_PATH)
+
+    names = dict(zip(catalog.ids, catalog.names))
+    airport_names = dict(zip(airports.ids, airports.names))
+    nearby_parks = {
+        attraction_id: [(names.get(neighbour, ''), tenths / 10) for neighbour, tenths in row[:NEARBY_SHOWN]]
+        for attraction_id, row in index['parks'].items()
+    }
+    nearby_airports = {
+        attraction_id: [(iata, airport_names.get(iata, ''), tenths / 10) for iata, tenths in row[:NEARBY_SHOWN]]
+        for attraction_id, row in index['airports'].items()
+    }
+    return nearby_parks, nearby_airports
+
+
+# Shared read-only state of each pool worker, set once by init_worker
+_shared = {}
+
+
+def init_worker(catalog, nearby_parks, nearby_airports, assets):
+    _shared.update(catalog=catalog, nearby_parks=nearby_parks, nearby_airports=nearby_airports, assets=assets)
+
+
+def variant_size(catalog, variant):
+    return int((catalog.where(**variant.filters) & catalog.has_coordinates).sum())
+
+
+def build_variant(variant, output_dir, compress=()):
+    """Render one map variant to output_dir/<name>.html (plus compressed copies). Returns (name, attractions, seconds)"""
+    start = time.perf_counter()
+    catalog = _shared['catalog']
+    nearby_parks, nearby_airports = _shared['nearby_parks'], _shared['nearby_airports']
+    indices = np.nonzero(catalog.where(**variant.filters) & catalog.has_coordinates)[0]
+
+    m = folium.Map(location=[20.0, 0.0], zoom_start=2, tiles='CartoDB positron', min_zoom=2, max_zoom=18)
+    folium.TileLayer('OpenStreetMap', name='OpenStreetMap', show=False).add_to(m)
+
+    region_counts = Counter(catalog.region[i] or 'Other' for i in indices)
+    groups = {
+        region: folium.FeatureGroup(name=f"{spaced(region)} ({count})")
+        for region, count in sorted(region_counts.items())
+    }
+    for group in groups.values():
+        group.add_to(m)
+
+    features, table = [], []
+    for number, i in enumerate(indices, start=1):
+        lat, lon = float(catalog.lat[i]), float(catalog.lon[i])
+        attraction_id = catalog.ids[i]
+        color, icon = CATEGORY_MARKERS.get(catalog.category[i], DEFAULT_MARKER)
+        description = catalog.descriptions[i]
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {
+                'id': f"park_{number}",
+                'name': catalog.names[i],
+                'country': catalog.country[i],
+                'states': catalog.states[i],
+                'region': catalog.region[i] or 'Other',
+                'color': color,
+                'icon': icon,
+            }
+        })
+        table.append([
+            catalog.designations[i],
+            description[:250] + '...' if len(description) > 250 else description,
+            catalog.urls[i],
+            [list(airport) for airport in nearby_airports.get(attraction_id, [])],
+            [list(park) for park in nearby_parks.get(attraction_id, [])],
+            attraction_radius(catalog.country[i]),
+        ])
+
+    ParkFeatureLayer(features, table, groups, location_labels=LOCATION_LABELS,
+                     default_location_label='State/Region', link_text='More information').add_to(m)
+    if len(indices):
+        m.fit_bounds([[float(catalog.lat[indices].min()), float(catalog.lon[indices].min())],
+                      [float(catalog.lat[indices].max()), float(catalog.lon[indices].max())]])
+
+    folium.LayerControl(collapsed=True, position='topleft').add_to(m)
+    plugins.Fullscreen(position='topleft', force_separate_button=True).add_to(m)
+    m.get_root().html.add_child(folium.Element(f"""
+    <div style="position: fixed; top: 10px; left: 50px; z-index: 9999; background-color: white;
+                border: 2px solid #4CAF50; border-radius: 8px; padding: 8px 12px; font-size: 14px;
+                box-shadow: 0 4px 8px rgba(0,0,0,0.3);">
+        <b>🗺️ {html.escape(variant.title)}</b>
+        <span style="color: #666; font-size: 11px;">({len(indices)} attractions)</span>
+    </div>
+    """))
+    for name, asset_path in _shared['assets'].items():
+        if name.endswith('.css'):
+            m.get_root().header.add_child(folium.CssLink(asset_path), name=name)
+        else:
+            m.get_root().html.add_child(folium.JavascriptLink(asset_path), name=name)
+
+    save_map(m, os.path.join(output_dir, f"{variant.name}.html"), compress)
+    return variant.name, len(indices), time.perf_counter() - start
+
+
+def write_index(output_dir, variants, sizes):
+    items = '\n'.join(
+        f'    <li><a href="{variant.name}.html">{html.escape(variant.title)}</a> ({sizes[variant.name]})</li>'
+        for variant in variants
+    )
+    page = f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>World Attractions Maps</title></head>
+<body style="font-family: Arial, sans-serif;">
+<h2>🗺️ World Attractions Maps</h2>
+<ul>
+{items}
+</ul>
+</body>
+</html>
+"""
+    write_if_changed(os.path.join(output_dir, 'index.html'), page.encode('utf-8'))
+
+
+def build_maps(variants, output_dir=MAPS_DIR, workers=None, catalog=None, compress=()):
+    """
+    Render variants in a process pool, largest first. The catalog and neighbour
+    lists are loaded once here and handed to each worker at start-up.
+    Returns {name: (attractions, seconds)} and the failures as {name: error}.
+    """
+    catalog = catalog or load_packed_catalog()
+    nearby_parks, nearby_airports = load_nearby(catalog, load_airports())
+    os.makedirs(output_dir, exist_ok=True)
+    assets = build_assets(output_dir)
+
+    sizes = {variant.name: variant_size(catalog, variant) for variant in variants}
+    ordered = sorted(variants, key=lambda variant: sizes[variant.name], reverse=True)
+    results, failures = {}, {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(catalog, nearby_parks, nearby_airports, assets)) as pool:
+        futures = {pool.submit(build_variant, variant, output_dir, compress): variant for variant in ordered}
+        for future in as_completed(futures):
+            variant = futures[future]
+            try:
+                name, count, seconds = future.result()
+                results[name] = (count, seconds)
+                print(f"✅ {name:<28} {count:>4} attractions in {seconds:.2f}s")
+            except Exception as e:
+                failures[variant.name] = e
+                print(f"❌ {variant.name}: {e}")
+
+    write_index(output_dir, [v for v in variants if v.name in results], sizes)
+    return results, failures
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description='Build per-country, per-category and world attraction maps')
+    parser.add_argument('variants', nargs='*', help='variant names to build (default: all)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default=MAPS_DIR, help=f'output directory (default: {MAPS_DIR})')
+    parser.add_argument('--min-country', type=int, default=MIN_COUNTRY_ATTRACTIONS,
+                        help='smallest country (in mapped attractions) that gets its own map')
+    parser.add_argument('--compress', action='append', choices=sorted(COMPRESSIONS), default=[],
+                        help='also write a gzip/brotli compressed copy of each map next to it (repeatable)')
+    parser.add_argument('--list', action='store_true', help='list the variants and exit')
+    args = parser.parse_args()
+
+    catalog = load_packed_catalog()
+    variants = map_variants(catalog, args.min_country)
+    if args.list:
+        for variant in variants:
+            print(f"{variant.name:<28} {variant_size(catalog, variant):>4}  {variant.title}")
+        sys.exit(0)
+    if args.variants:
+        known = {variant.name: variant for variant in variants}
+        unknown = [name for name in args.variants if name not in known]
+        if unknown:
+            parser.error(f"unknown variants: {', '.join(unknown)} (see --list)")
+        variants = [known[name] for name in args.variants]
+
+    print("=" * 60)
+    print(f"Building {len(variants)} maps into {args.output_dir}")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    results, failures = build_maps(variants, args.output_dir, args.workers, catalog, args.compress)
+    elapsed = time.perf_counter() - start
+    slowest = max((seconds for _, seconds in results.values()), default=0.0)
+
+    print(f"\n✅ {len(results)} maps in {elapsed:.2f}s (slowest single map {slowest:.2f}s)")
+    print(f"📁 Open {os.path.join(args.output_dir, 'index.html')}")
+    if failures:
+        print(f"❌ {len(failures)} failed: {', '.join(sorted(failures))}")
+        sys.exit(1)
@@ -0,0 +1,202 @@
+"""
+Build the precomputed nearby attractions/airports sidecar for the web app
+Reads every CSV in public/data through the shared catalog and writes public/data/nearby_index.json so
+dataService.js can look up neighbours instead of scanning every attraction
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from build_cache import write_if_changed
+from catalog import AIRPORTS_FILE, PUBLIC_DATA_DIR, load_airports
+from catalog_binary import load_packed_catalog
+from spatial_index import AIRPORTS_INDEX_PATH, ATTRACTIONS_INDEX_PATH, load_or_build
+
+INDEX_VERSION = 2
+
+# Neighbours kept per attraction. The app shows 5; a few spares cover
+# neighbours that are missing from the data the app actually loaded
+NEIGHBOURS_STORED = 8
+
+AIRPORT_RADIUS_MILES = 200
+ATTRACTION_RADIUS_MILES = 300
+# MapView.jsx uses 100 km for nearby attractions in Asian countries
+ASIAN_ATTRACTION_RADIUS_MILES = 62.1371
+ASIAN_COUNTRIES = {
+    'India', 'Nepal', 'Sri Lanka', 'China', 'Japan', 'South Korea', 'North Korea', 'Thailand',
+    'Vietnam', 'Indonesia', 'Malaysia', 'Philippines', 'Singapore', 'Bangladesh', 'Pakistan',
+    'Myanmar', 'Cambodia', 'Laos', 'Mongolia', 'Bhutan', 'Maldives', 'Afghanistan'
+}
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_sources(data_dir):
+    """Return {filename: (hash, points)} for every attraction CSV plus the airports CSV"""
+    points_by_file = {}
+    with load_packed_catalog(data_dir) as catalog:
+        for table in (catalog, load_airports(data_dir)):
+            for i in np.nonzero(table.has_coordinates)[0]:
+                filename = table.source[i]
+                points_by_file.setdefault(filename, []).append({
+                    'key': table.ids[i],
+                    'name': table.names[i],
+                    'lat': float(table.lat[i]),
+                    'lon': float(table.lon[i]),
+                    'country': table.country[i],
+                    'source': filename,
+                })
+    return {
+        filename: (file_hash(os.path.join(data_dir, filename)), points)
+        for filename, points in sorted(points_by_file.items())
+    }
+
+
+def load_previous(path):
+    """Load a previous index as hashes, id -> source file and neighbour lists keyed by id, or None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or index.get('k') != NEIGHBOURS_STORED:
+        return None
+
+    ids, airports = index['attractions'], index['airports']
+    source_of = {}
+    position = 0
+    for filename, count in index['counts'].items():
+        for attraction_id in ids[position:position + count]:
+            source_of[attraction_id] = filename
+        position += count
+
+    def decode(rows, targets):
+        return {
+            attraction_id: [(targets[row[i]], row[i + 1]) for i in range(0, len(row), 2)]
+            for attraction_id, row in zip(ids, rows)
+        }
+
+    return {
+        'hashes': index['sources'],
+        'source_of': source_of,
+        'parks': decode(index['nearby_parks'], ids),
+        'airports': decode(index['nearby_airports'], airports),
+    }
+
+
+def nearest(tree, point, radius, targets, skip_name=None):
+    """Top NEIGHBOURS_STORED (id, distance in tenths of a mile) pairs within radius"""
+    exclude = None
+    if skip_name is not None:
+        def exclude(index):
+            return targets[index]['name'] == skip_name
+    matches = tree.query(point['lat'], point['lon'], k=NEIGHBOURS_STORED, radius=radius, exclude=exclude)
+    return [(targets[index]['key'], int(round(distance * 10))) for index, distance in matches]
+
+
+def attraction_radius(country):
+    return ASIAN_ATTRACTION_RADIUS_MILES if country in ASIAN_COUNTRIES else ATTRACTION_RADIUS_MILES
+
+
+def build_nearby_index(data_dir, output_path, force=False):
+    """Build or incrementally update the nearby index. Returns (total rows, recomputed rows)"""
+    sources = load_sources(data_dir)
+    previous = None if force else load_previous(output_path)
+
+    hashes = {filename: digest for filename, (digest, _) in sources.items()}
+    attraction_files = [filename for filename in sources if filename != AIRPORTS_FILE]
+    attractions = [point for filename in attraction_files for point in sources[filename][1]]
+    airports = sources.get(AIRPORTS_FILE, (None, []))[1]
+
+    # Reuses the trees saved by an earlier run (or spatial_index.py) while the points are the same
+    attraction_tree = load_or_build(ATTRACTIONS_INDEX_PATH, [p['lat'] for p in attractions],
+                                    [p['lon'] for p in attractions], [p['key'] for p in attractions])
+    airport_tree = load_or_build(AIRPORTS_INDEX_PATH, [p['lat'] for p in airports],
+                                 [p['lon'] for p in airports], [p['key'] for p in airports])
+
+    # Work out which rows can be reused from the previous build
+    if previous is None:
+        stale_parks = set(range(len(attractions)))
+        stale_airports = set(range(len(attractions)))
+    else:
+        changed = {f for f in set(hashes) | set(previous['hashes']) if hashes.get(f) != previous['hashes'].get(f)}
+        changed_attractions = changed - {AIRPORTS_FILE}
+        changed_ids = {i for i, f in previous['source_of'].items() if f in changed_attractions}
+        stale_parks, stale_airports = set(), set()
+
+        for i, point in enumerate(attractions):
+            old_parks = previous['parks'].get(point['key'])
+            if point['source'] in changed or old_parks is None or any(neighbour in changed_ids for neighbour, _ in old_parks):
+                stale_parks.add(i)
+            if point['source'] in changed or point['key'] not in previous['airports'] or AIRPORTS_FILE in changed:
+                stale_airports.add(i)
+
+        # Rows close enough to a new or moved point may gain it as a neighbour
+        for filename in changed_attractions & set(sources):
+            for point in sources[filename][1]:
+                for index, _ in attraction_tree.query_radius(point['lat'], point['lon'], ATTRACTION_RADIUS_MILES):
+                    stale_parks.add(index)
+
+    nearby_parks, nearby_airports = [], []
+    for i, point in enumerate(attractions):
+        if i in stale_parks:
+            nearby_parks.append(nearest(attraction_tree, point, attraction_radius(point['country']), attractions, skip_name=point['name']))
+        else:
+            nearby_parks.append(previous['parks'][point['key']])
+        if i in stale_airports:
+            nearby_airports.append(nearest(airport_tree, point, AIRPORT_RADIUS_MILES, airports))
+        else:
+            nearby_airports.append(previous['airports'][point['key']])
+
+    # Neighbours are stored as flat [target_index, tenths_of_mile, ...] rows
+    attraction_ids = [p['key'] for p in attractions]
+    airport_ids = [p['key'] for p in airports]
+    attraction_position = {key: i for i, key in enumerate(attraction_ids)}
+    airport_position = {key: i for i, key in enumerate(airport_ids)}
+
+    def encode(rows, positions):
+        return [[value for key, tenths in row for value in (positions[key], tenths)] for row in rows]
+
+    index = {
+        'version': INDEX_VERSION,
+        'k': NEIGHBOURS_STORED,
+        'radius_miles': {
+            'attractions': ATTRACTION_RADIUS_MILES,
+            'attractions_asia': ASIAN_ATTRACTION_RADIUS_MILES,
+            'airports': AIRPORT_RADIUS_MILES,
+        },
+        'sources': hashes,
+        'counts': {filename: len(sources[filename][1]) for filename in attraction_files},
+        'attractions': attraction_ids,
+        'airports': airport_ids,
+        'nearby_parks': encode(nearby_parks, attraction_position),
+        'nearby_airports': encode(nearby_airports, airport_position),
+    }
+
+    # Leave the file (and its mtime) alone when nothing changed
+    write_if_changed(output_path, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+
+    return len(attractions), len(stale_parks | stale_airports)
+
+
+if __name__ == '__main__':
+    import sys
+
+    print("=" * 60)
+    print("Nearby Index Builder")
+    print("=" * 60)
+
+    output_path = os.path.join(PUBLIC_DATA_DIR, 'nearby_index.json')
+
+    total, recomputed = build_nearby_index(PUBLIC_DATA_DIR, output_path, force='--force' in sys.argv)
+    print(f"✅ {total} attractions indexed, {recomputed} rows recomputed")
+    print(f"📁 Saved to: {output_path}")
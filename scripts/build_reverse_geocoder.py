@@ -0,0 +1,372 @@
+"""
+Offline reverse geocoding index for custom pins
+Buckets the catalog's labelled places (airport cities, attraction States and
+Country) into a lat/lon grid, plus country/state boundary polygons when a
+GeoJSON file is given, and writes public/data/reverse_geocode.json so a pin's
+city, state and country are found with a grid lookup and point-in-polygon
+test instead of a network call
+
+Usage:
+    python3 scripts/build_reverse_geocoder.py [--countries countries.geojson] [--states admin1.geojson]
+    python3 scripts/build_reverse_geocoder.py --query LAT,LON [--query ...]
+    python3 scripts/build_reverse_geocoder.py --benchmark
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from build_cache import write_if_changed
+from catalog import load_airports
+from catalog_binary import load_packed_catalog
+from geo_distance import EARTH_RADIUS_MILES
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REVERSE_GEOCODE_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data', 'reverse_geocode.json'))
+# Natural Earth 1:110m admin-0 countries (public domain), bundled with the repo
+COUNTRY_BOUNDARIES_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'data', 'boundaries', 'ne_110m_countries.geojson'))
+
+REVERSE_GEOCODE_VERSION = 2
+
+CELL_DEGREES = 1.0
+# Boundary polygons are indexed on a coarser grid: a large country listed in
+# every 1° cell its rings cover would outweigh the polygons themselves
+REGION_CELL_DEGREES = 10.0
+# A pin takes its city from the nearest airport city within CITY_RADIUS_MILES
+# and its state/country from the nearest labelled place within REGION_RADIUS_MILES,
+# unless a boundary polygon contains it
+CITY_RADIUS_MILES = 50.0
+REGION_RADIUS_MILES = 150.0
+# Place coordinates are rounded to about 10 m, boundary vertices to about 1 km
+# (finer than the 1:110m Natural Earth polygons)
+COORDINATE_DECIMALS = 4
+BOUNDARY_DECIMALS = 2
+
+# GeoJSON properties tried, in order, for a boundary's name and (for states) its country
+NAME_PROPERTIES = ['name', 'NAME', 'name_en', 'NAME_EN', 'ADMIN', 'admin']
+COUNTRY_PROPERTIES = ['admin', 'ADMIN', 'country', 'COUNTRY', 'geonunit']
+# Natural Earth country names that the catalog spells differently, or abbreviates
+COUNTRY_ALIASES = {
+    'United States of America': 'United States',
+    'Timor-Leste': 'East Timor',
+    'United Arab Emirates': 'UAE',
+    'Bosnia and Herz.': 'Bosnia and Herzegovina',
+    'Central African Rep.': 'Central African Republic',
+    'Dem. Rep. Congo': 'Democratic Republic of the Congo',
+    'Dominican Rep.': 'Dominican Republic',
+    'Eq. Guinea': 'Equatorial Guinea',
+    'Falkland Is.': 'Falkland Islands',
+    'Fr. S. Antarctic Lands': 'French Southern and Antarctic Lands',
+    'N. Cyprus': 'Northern Cyprus',
+    'S. Sudan': 'South Sudan',
+    'Solomon Is.': 'Solomon Islands',
+    'W. Sahara': 'Western Sahara',
+    'eSwatini': 'Eswatini',
+}
+
+
+def cell_key(lat, lon, cell_degrees=CELL_DEGREES):
+    """Grid cell of a point as one integer (row * columns + column)"""
+    columns = int(round(360 / cell_degrees))
+    row = min(int((lat + 90.0) // cell_degrees), int(round(180 / cell_degrees)) - 1)
+    column = int((lon + 180.0) // cell_degrees) % columns
+    return row * columns + column
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Scalar great-circle distance in miles, the same formula as geo_distance"""
+    lat1, lat2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class _Strings:
+    """Each distinct label stored once; -1 for none"""
+
+    def __init__(self):
+        self.values = []
+        self.lookup = {}
+
+    def code(self, value):
+        if not value:
+            return -1
+        if value not in self.lookup:
+            self.lookup[value] = len(self.values)
+            self.values.append(value)
+        return self.lookup[value]
+
+
+def labelled_places(catalog, airports):
+    """(lat, lon, city, state, country) for every airport and mapped attraction"""
+    places = []
+    for i in np.flatnonzero(airports.has_coordinates):
+        extras = airports.extras[i]
+        places.append((float(airports.lat[i]), float(airports.lon[i]),
+                       extras.get('City', ''), extras.get('State', ''), airports.country[i]))
+    for i in np.flatnonzero(catalog.has_coordinates):
+        states = [s.strip() for s in catalog.states[i].split(',') if s.strip()]
+        # A park spanning several states does not say which one a point is in
+        places.append((float(catalog.lat[i]), float(catalog.lon[i]),
+                       '', states[0] if len(states) == 1 else '', catalog.country[i]))
+    return places
+
+
+def geojson_polygons(geometry):
+    """Rings of each polygon of a Polygon/MultiPolygon geometry"""
+    if not geometry:
+        return []
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def first_property(properties, names):
+    for name in names:
+        if properties.get(name):
+            return str(properties[name])
+    return ''
+
+
+def load_boundaries(path, level):
+    """[(level, name, country, rings)] from a GeoJSON FeatureCollection"""
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+    boundaries = []
+    for feature in collection.get('features', []):
+        properties = feature.get('properties') or {}
+        name = first_property(properties, NAME_PROPERTIES)
+        if level == 'country':
+            name = COUNTRY_ALIASES.get(name, name)
+        country = first_property(properties, COUNTRY_PROPERTIES) if level == 'state' else name
+        country = COUNTRY_ALIASES.get(country, country)
+        # Rings of all parts together: a point is inside when it is inside an
+        # odd number of them, which also handles holes
+        rings = [ring for polygon in geojson_polygons(feature.get('geometry')) for ring in polygon if len(ring) >= 4]
+        if name and rings:
+            boundaries.append((level, name, country, rings))
+    return boundaries
+
+
+def build_reverse_geocoder(places, boundaries=(), cell_degrees=CELL_DEGREES, region_cell_degrees=REGION_CELL_DEGREES):
+    strings = _Strings()
+    columns = {'lat': [], 'lon': [], 'city': [], 'state': [], 'country': []}
+    cells = defaultdict(list)
+    for index, (lat, lon, city, state, country) in enumerate(places):
+        columns['lat'].append(round(lat, COORDINATE_DECIMALS))
+        columns['lon'].append(round(lon, COORDINATE_DECIMALS))
+        columns['city'].append(strings.code(city))
+        columns['state'].append(strings.code(state))
+        columns['country'].append(strings.code(country))
+        cells[cell_key(lat, lon, cell_degrees)].append(index)
+
+    regions = []
+    region_cells = defaultdict(list)
+    for level, name, country, rings in boundaries:
+        flat = [[round(v, BOUNDARY_DECIMALS) for point in ring for v in point[:2]] for ring in rings]
+        lons = [v for ring in flat for v in ring[0::2]]
+        lats = [v for ring in flat for v in ring[1::2]]
+        bbox = [min(lons), min(lats), max(lons), max(lats)]
+        index = len(regions)
+        regions.append({'level': level, 'name': strings.code(name), 'country': strings.code(country),
+                        'bbox': bbox, 'rings': flat})
+        # Every cell each ring's bounding box touches; per ring, so islands on
+        # either side of the antimeridian do not cover the whole globe
+        region_columns = int(round(360 / region_cell_degrees))
+        region_rows = int(round(180 / region_cell_degrees))
+        keys = set()
+        for ring in flat:
+            # Clamped rather than wrapped, so a ring ending at 180° keeps its last column
+            first_row, last_row = (min(int((lat + 90.0) // region_cell_degrees), region_rows - 1)
+                                   for lat in (min(ring[1::2]), max(ring[1::2])))
+            first_column, last_column = (min(int((lon + 180.0) // region_cell_degrees), region_columns - 1)
+                                         for lon in (min(ring[0::2]), max(ring[0::2])))
+            keys.update(row * region_columns + column
+                        for row in range(first_row, last_row + 1) for column in range(first_column, last_column + 1))
+        for key in keys:
+            region_cells[key].append(index)
+
+    return {
+        'version': REVERSE_GEOCODE_VERSION,
+        'cell_degrees': cell_degrees,
+        'region_cell_degrees': region_cell_degrees,
+        'city_radius': CITY_RADIUS_MILES,
+        'region_radius': REGION_RADIUS_MILES,
+        'strings': strings.values,
+        'places': columns,
+        'cells': {str(key): indices for key, indices in sorted(cells.items())},
+        'regions': regions,
+        'region_cells': {str(key): indices for key, indices in sorted(region_cells.items())},
+    }
+
+
+def write_reverse_geocoder(index, output_path=REVERSE_GEOCODE_PATH):
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(output_path, data)
+
+
+def point_in_rings(lon, lat, rings):
+    """Even-odd ray casting over flat [lon, lat, lon, lat, ...] rings"""
+    inside = False
+    for ring in rings:
+        n = len(ring) // 2
+        j = n - 1
+        for i in range(n):
+            xi, yi, xj, yj = ring[2 * i], ring[2 * i + 1], ring[2 * j], ring[2 * j + 1]
+            if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
+
+
+class ReverseGeocoder:
+    """Lookups over a build_reverse_geocoder() index"""
+
+    def __init__(self, index):
+        self.index = index
+        self.places = index['places']
+        self.strings = index['strings']
+        self.cell_degrees = index['cell_degrees']
+        self.region_cell_degrees = index['region_cell_degrees']
+        self.cells = {int(key): value for key, value in index['cells'].items()}
+        self.region_cells = {int(key): value for key, value in index['region_cells'].items()}
+        # Countries with a boundary polygon; small ones missing from the boundary
+        # data fall inside a neighbour's polygon and keep their nearest place's label
+        self.bounded = {region['name'] for region in index['regions'] if region['level'] == 'country'}
+
+    @classmethod
+    def load(cls, path=REVERSE_GEOCODE_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def label(self, code):
+        return self.strings[code] if code >= 0 else None
+
+    def nearby_cells(self, lat, lon, radius):
+        """Keys of the cells within radius miles of the point (by bounding box)"""
+        lat_span = radius / 69.0
+        lon_span = radius / max(69.0 * math.cos(math.radians(min(abs(lat) + lat_span, 89.0))), 1e-6)
+        step = self.cell_degrees
+        columns = int(round(360 / step))
+        rows = int(round(180 / step))
+        first_row = max(0, int((lat - lat_span + 90.0) // step))
+        last_row = min(rows - 1, int((lat + lat_span + 90.0) // step))
+        if lon_span >= 180:
+            column_range = range(columns)
+        else:
+            column_range = [c % columns for c in range(int((lon - lon_span + 180.0) // step),
+                                                       int((lon + lon_span + 180.0) // step) + 1)]
+        return [row * columns + column for row in range(first_row, last_row + 1) for column in column_range]
+
+    def boundaries(self, lat, lon):
+        """{level: region} of the boundary polygons containing the point, first match per level"""
+        found = {}
+        for r in self.region_cells.get(cell_key(lat, lon, self.region_cell_degrees), ()):
+            region = self.index['regions'][r]
+            west, south, east, north = region['bbox']
+            if region['level'] not in found and west <= lon <= east and south <= lat <= north \
+                    and point_in_rings(lon, lat, region['rings']):
+                found[region['level']] = region
+        return found
+
+    def lookup(self, lat, lon):
+        """
+        {'city', 'state', 'country', 'distance'} for a point, or None when
+        nothing is known near it. distance is miles to the place the city
+        (or else the state/country) came from, 0 for a boundary match
+        """
+        places = self.places
+        city = region = None
+        city_distance = region_distance = math.inf
+        for key in self.nearby_cells(lat, lon, max(self.index['city_radius'], self.index['region_radius'])):
+            for place in self.cells.get(key, ()):
+                distance = haversine(lat, lon, places['lat'][place], places['lon'][place])
+                if places['city'][place] >= 0 and distance < city_distance and distance <= self.index['city_radius']:
+                    city, city_distance = place, distance
+                if distance < region_distance and distance <= self.index['region_radius']:
+                    region, region_distance = place, distance
+
+        state = country = None
+        if region is not None:
+            state, country = self.label(places['state'][region]), self.label(places['country'][region])
+        if city is not None and places['country'][city] == places['country'][region]:
+            state = self.label(places['state'][city]) or state
+
+        boundary = self.boundaries(lat, lon)
+        if region is not None and places['country'][region] not in self.bounded:
+            boundary.pop('country', None)
+        if 'country' in boundary:
+            name = self.label(boundary['country']['name'])
+            if name != country:
+                # The nearest place is across the border; its state is not this one
+                state = None
+            country = name
+        if 'state' in boundary:
+            state = self.label(boundary['state']['name'])
+            country = country or self.label(boundary['state']['country'])
+        if city is not None and self.label(places['country'][city]) != country:
+            city = None
+
+        if city is None and state is None and country is None:
+            return None
+        distance = city_distance if city is not None else (0.0 if boundary else region_distance)
+        return {
+            'city': self.label(places['city'][city]) if city is not None else None,
+            'state': state,
+            'country': country,
+            'distance': round(distance, 1),
+        }
+
+
+def benchmark(geocoder, count=20000, seed=0):
+    """Microseconds per lookup over random points on land-ish latitudes"""
+    rng = random.Random(seed)
+    points = [(rng.uniform(-50, 70), rng.uniform(-180, 180)) for _ in range(count)]
+    start = time.perf_counter()
+    for lat, lon in points:
+        geocoder.lookup(lat, lon)
+    return (time.perf_counter() - start) * 1e6 / count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the offline reverse geocoding index')
+    parser.add_argument('--countries', default=COUNTRY_BOUNDARIES_PATH,
+                        help='GeoJSON of country boundaries (default: the bundled Natural Earth countries)')
+    parser.add_argument('--states', help='GeoJSON of state/province boundaries (name and admin/country properties)')
+    parser.add_argument('--query', action='append', help='LAT,LON to look up in the built index')
+    parser.add_argument('--benchmark', action='store_true', help='time lookups against the built index')
+    args = parser.parse_args()
+
+    if args.query or args.benchmark:
+        geocoder = ReverseGeocoder.load()
+        for query in args.query or []:
+            lat, lon = (float(v) for v in query.split(','))
+            print(f"📍 {lat}, {lon}: {geocoder.lookup(lat, lon)}")
+        if args.benchmark:
+            print(f"⏱️  {benchmark(geocoder):.1f} µs per lookup")
+    else:
+        print("=" * 60)
+        print("Reverse Geocoder Builder")
+        print("=" * 60)
+
+        boundaries = []
+        for path, level in [(args.countries, 'country'), (args.states, 'state')]:
+            if path:
+                loaded = load_boundaries(path, level)
+                print(f"✅ {len(loaded)} {level} boundaries from {path}")
+                boundaries += loaded
+        with load_packed_catalog() as catalog:
+            places = labelled_places(catalog, load_airports())
+        index = build_reverse_geocoder(places, boundaries)
+        rewritten = write_reverse_geocoder(index)
+        print(f"✅ {len(index['places']['lat'])} places in {len(index['cells'])} cells, "
+              f"{len(index['regions'])} boundaries, {len(index['strings'])} labels")
+        print(f"📁 {'Saved' if rewritten else 'Unchanged'}: {REVERSE_GEOCODE_PATH} "
+              f"({os.path.getsize(REVERSE_GEOCODE_PATH) / 1024:.1f} KB)")
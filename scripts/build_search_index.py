@@ -0,0 +1,162 @@
+"""
+Prebuilt full-text search index for the attraction search box
+Tokenizes Name, Description, States and Country of the merged catalog into an
+inverted index with field-weighted scores and delta-encoded postings, written
+to public/data/search_index.json, so a query only reads the postings of the
+terms it matches instead of scanning every attraction
+
+Usage:
+    python3 scripts/build_search_index.py [--query TEXT]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import defaultdict
+
+from build_cache import write_if_changed
+from build_world_catalog import sort_order
+from catalog_binary import load_packed_catalog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH_INDEX_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data', 'search_index.json'))
+
+SEARCH_INDEX_VERSION = 1
+
+# Score added for each occurrence of a term in the field
+FIELD_WEIGHTS = {'Name': 8, 'States': 3, 'Country': 3, 'Description': 1}
+
+# Same normalization as tokenize() in dataService.js: accents stripped,
+# lowercased, split into ASCII letter/digit runs
+COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+TOKEN = re.compile('[a-z0-9]+')
+
+
+def tokenize(text):
+    text = COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text or '')).lower()
+    return TOKEN.findall(text)
+
+
+def document_fields(catalog, i):
+    return {
+        'Name': catalog.names[i],
+        'States': catalog.states[i],
+        'Country': catalog.country[i],
+        'Description': catalog.descriptions[i],
+    }
+
+
+def build_search_index(catalog):
+    """
+    Index over the catalog in world_catalog.json row order. postings[t] lists
+    the documents containing terms[t] as [document gap, score, ...]: each
+    document number is stored as the gap from the previous one
+    """
+    _, order = sort_order(catalog)
+    scores = defaultdict(dict)
+    for document, i in enumerate(order):
+        for field, text in document_fields(catalog, i).items():
+            for term in tokenize(text):
+                scores[term][document] = scores[term].get(document, 0) + FIELD_WEIGHTS[field]
+
+    terms = sorted(scores)
+    postings = []
+    for term in terms:
+        previous = 0
+        posting = []
+        for document in sorted(scores[term]):
+            posting += [document - previous, scores[term][document]]
+            previous = document
+        postings.append(posting)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'field_weights': FIELD_WEIGHTS,
+        'attractions': [catalog.ids[i] for i in order],
+        'terms': terms,
+        'postings': postings,
+    }
+
+
+def write_search_index(index, output_path=SEARCH_INDEX_PATH):
+    data = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(output_path, data)
+
+
+def load_search_index(path=SEARCH_INDEX_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def term_range(terms, prefix):
+    """[start, end) of the sorted terms that start with prefix"""
+    start = bisect.bisect_left(terms, prefix)
+    end = bisect.bisect_left(terms, prefix + '\uffff', start)
+    return start, end
+
+
+def search(index, query, limit=10):
+    """
+    Attractions matching every query token as a word prefix, best first, as
+    [(id, score)]. A document's score for a token is its best-scoring matching
+    term; ties keep catalog order. Returns None when the query has no tokens
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+
+    totals = None
+    for token in dict.fromkeys(tokens):
+        start, end = term_range(index['terms'], token)
+        matches = {}
+        for posting in index['postings'][start:end]:
+            document = 0
+            for k in range(0, len(posting), 2):
+                document += posting[k]
+                if posting[k + 1] > matches.get(document, 0):
+                    matches[document] = posting[k + 1]
+        if totals is None:
+            totals = matches
+        else:
+            totals = {document: score + matches[document] for document, score in totals.items() if document in matches}
+        if not totals:
+            return []
+
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [(index['attractions'][document], score) for document, score in ranked]
+
+
+def print_results(index, query):
+    start = time.perf_counter()
+    results = search(index, query, limit=None) or []
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔍 {len(results)} matches for {query!r} in {elapsed:.2f} ms")
+    for attraction_id, score in results[:10]:
+        print(f"   {score:4d}  {attraction_id}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the attraction full-text search index')
+    parser.add_argument('--query', help='search the built index instead of rebuilding it')
+    args = parser.parse_args()
+
+    if args.query is not None:
+        print_results(load_search_index(), args.query)
+    else:
+        print("=" * 60)
+        print("Search Index Builder")
+        print("=" * 60)
+
+        with load_packed_catalog() as catalog:
+            index = build_search_index(catalog)
+        rewritten = write_search_index(index)
+        entries = sum(len(posting) // 2 for posting in index['postings'])
+        print(f"✅ {len(index['attractions'])} attractions, {len(index['terms'])} terms, {entries} postings")
+        print(f"📁 {'Saved' if rewritten else 'Unchanged'}: {SEARCH_INDEX_PATH} "
+              f"({os.path.getsize(SEARCH_INDEX_PATH) / 1024:.1f} KB)")
@@ -0,0 +1,203 @@
+"""
+Static vector tile pyramid for the attraction catalog
+Cuts every mapped attraction into public/tiles/{z}/{x}/{y}.pbf Mapbox Vector
+Tiles (one "attractions" point layer tagged with id, category and name) and
+thins points at low zooms so the features per tile stay bounded
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from build_cache import write_if_changed
+from catalog_binary import load_packed_catalog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TILES_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'tiles'))
+TILE_URL = '/tiles/{z}/{x}/{y}.pbf'
+
+LAYER_NAME = 'attractions'
+EXTENT = 4096
+MIN_ZOOM = 0
+MAX_ZOOM = 10
+# Below MAX_ZOOM a tile keeps one point per THINNING_CELL x THINNING_CELL square
+# of its extent, i.e. at most (EXTENT / THINNING_CELL) ** 2 = 256 points
+THINNING_CELL = 256
+
+# Which point survives thinning: lower first, then catalog order
+CATEGORY_PRIORITY = ['UNESCO', 'Parks', 'MostPhotographed', 'Jyotirlinga', 'ShaktiPeetha', 'Temples',
+                     'DivyaDesam', 'OtherTemples', 'Forts', 'Matham', 'TrekkingFlights']
+
+MAX_LATITUDE = 85.0511287798
+
+# Protobuf wire types and MVT geometry/feature constants
+VARINT, LENGTH_DELIMITED = 0, 2
+MOVE_TO = 1
+POINT = 1
+MVT_VERSION = 2
+
+
+def mercator(lat, lon):
+    """Web Mercator position of each point as fractions of the world, (x, y) in [0, 1)"""
+    lat = np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE)
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0
+    sin = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    limit = np.nextafter(1.0, 0.0)
+    return np.clip(x, 0.0, limit), np.clip(y, 0.0, limit)
+
+
+def min_zooms(x, y, rank, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, cell=THINNING_CELL):
+    """
+    First zoom at which each point is drawn. At every zoom below max_zoom a
+    point is kept only if it has the best rank in its thinning cell. Cells nest
+    from one zoom to the next, so a point kept at zoom z is kept at every
+    higher zoom as well. Everything is drawn at max_zoom.
+    """
+    order = np.argsort(rank, kind='stable')
+    first = np.full(len(x), max_zoom, dtype=np.int16)
+    for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+        cells_per_side = (1 << zoom) * (EXTENT // cell)
+        cx = (x[order] * cells_per_side).astype(np.int64)
+        cy = (y[order] * cells_per_side).astype(np.int64)
+        _, best = np.unique(cx * cells_per_side + cy, return_index=True)
+        first[order[best]] = zoom
+    return first
+
+
+def thinning_rank(catalog, indices):
+    """Rank of each attraction for thinning: category priority, then catalog order"""
+    priority = {category: i for i, category in enumerate(CATEGORY_PRIORITY)}
+    rank = np.array([priority.get(catalog.category[i], len(priority)) for i in indices], dtype=np.int64)
+    return rank * len(indices) + np.arange(len(indices))
+
+
+def varint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def field(number, wire_type, payload):
+    """One protobuf field: payload is an int for VARINT, bytes for LENGTH_DELIMITED"""
+    key = varint((number << 3) | wire_type)
+    if wire_type == VARINT:
+        return key + varint(payload)
+    return key + varint(len(payload)) + payload
+
+
+def packed(number, values):
+    return field(number, LENGTH_DELIMITED, b''.join(varint(v) for v in values))
+
+
+def encode_tile(features, layer_name=LAYER_NAME, extent=EXTENT):
+    """
+    Encode [(x, y, {key: string value})] as a single-layer MVT tile, where x/y
+    are integer positions within the tile's extent. Keys and values are
+    deduplicated into the layer's tables as the spec requires.
+    """
+    keys, values = {}, {}
+    encoded = []
+    for x, y, properties in features:
+        tags = []
+        for key, value in properties.items():
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(value, len(values)))
+        geometry = [(MOVE_TO & 0x7) | (1 << 3), zigzag(int(x)), zigzag(int(y))]
+        encoded.append(field(2, LENGTH_DELIMITED, packed(2, tags) + field(3, VARINT, POINT) + packed(4, geometry)))
+
+    layer = field(15, VARINT, MVT_VERSION) + field(1, LENGTH_DELIMITED, layer_name.encode('utf-8'))
+    layer += b''.join(encoded)
+    layer += b''.join(field(3, LENGTH_DELIMITED, key.encode('utf-8')) for key in keys)
+    layer += b''.join(field(4, LENGTH_DELIMITED, field(1, LENGTH_DELIMITED, value.encode('utf-8'))) for value in values)
+    layer += field(5, VARINT, extent)
+    return field(3, LENGTH_DELIMITED, layer)
+
+
+def tile_path(output_dir, z, x, y):
+    return os.path.join(output_dir, str(z), str(x), f"{y}.pbf")
+
+
+def build_vector_tiles(catalog, output_dir=TILES_DIR, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+    """
+    Write the tile pyramid and metadata.json into output_dir and delete tiles
+    left over from an earlier build. Returns (tiles, tiles rewritten, largest tile in features).
+    """
+    indices = np.nonzero(catalog.has_coordinates)[0]
+    x, y = mercator(catalog.lat[indices], catalog.lon[indices])
+    rank = thinning_rank(catalog, indices)
+    first_zoom = min_zooms(x, y, rank, min_zoom, max_zoom)
+
+    properties = [
+        {'id': catalog.ids[i], 'category': catalog.category[i], 'name': catalog.names[i]}
+        for i in indices
+    ]
+
+    written_paths = set()
+    rewritten = 0
+    largest = 0
+    for zoom in range(min_zoom, max_zoom + 1):
+        visible = np.nonzero(first_zoom <= zoom)[0]
+        scale = 1 << zoom
+        px, py = x[visible] * scale, y[visible] * scale
+        tx, ty = px.astype(np.int64), py.astype(np.int64)
+        local_x = ((px - tx) * EXTENT).astype(np.int64)
+        local_y = ((py - ty) * EXTENT).astype(np.int64)
+
+        # Group by tile, best ranked first within each tile
+        order = np.lexsort((rank[visible], ty, tx))
+        tile_keys = tx[order] * scale + ty[order]
+        starts = np.r_[0, np.nonzero(np.diff(tile_keys))[0] + 1]
+        for start, end in zip(starts, np.r_[starts[1:], len(order)]):
+            members = order[start:end]
+            features = [(local_x[j], local_y[j], properties[visible[j]]) for j in members]
+            path = tile_path(output_dir, zoom, int(tx[members[0]]), int(ty[members[0]]))
+            rewritten += write_if_changed(path, encode_tile(features))
+            written_paths.add(os.path.normpath(path))
+            largest = max(largest, len(features))
+
+    # Tiles that no longer hold any point
+    for root, _, files in os.walk(output_dir):
+        for name in files:
+            path = os.path.normpath(os.path.join(root, name))
+            if name.endswith('.pbf') and path not in written_paths:
+                os.remove(path)
+
+    metadata = {
+        'tilejson': '3.0.0',
+        'name': 'World Attractions',
+        'tiles': [TILE_URL],
+        'minzoom': min_zoom,
+        'maxzoom': max_zoom,
+        'bounds': [-180, -MAX_LATITUDE, 180, MAX_LATITUDE],
+        'vector_layers': [{
+            'id': LAYER_NAME,
+            'minzoom': min_zoom,
+            'maxzoom': max_zoom,
+            'fields': {'id': 'String', 'category': 'String', 'name': 'String'},
+        }],
+        'attractions': len(indices),
+    }
+    write_if_changed(os.path.join(output_dir, 'metadata.json'),
+                     json.dumps(metadata, indent=2).encode('utf-8'))
+    return len(written_paths), rewritten, largest
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Vector Tile Builder")
+    print("=" * 60)
+
+    with load_packed_catalog() as catalog:
+        tiles, rewritten, largest = build_vector_tiles(catalog)
+    print(f"✅ {tiles} tiles for zooms {MIN_ZOOM}-{MAX_ZOOM} ({rewritten} rewritten), at most {largest} points per tile")
+    print(f"📁 Saved to: {TILES_DIR}")
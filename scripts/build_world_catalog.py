@@ -0,0 +1,97 @@
+"""
+Single merged catalog for the app
+Writes every attraction CSV as one normalized file, public/data/world_catalog.json,
+with country, category and region already resolved, so the app makes one
+request and one parse at startup instead of fetching each CSV
+"""
+
+import json
+import os
+
+import numpy as np
+
+from build_cache import write_if_changed
+from catalog_binary import load_packed_catalog
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WORLD_CATALOG_PATH = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data', 'world_catalog.json'))
+
+# Row layout. Country, Region and category_field are indexes into the lists of
+# the same name; extras (file-specific columns) is only present when non-empty
+WORLD_CATALOG_FIELDS = ['id', 'Park_Code', 'Name', 'Designation', 'States', 'Latitude', 'Longitude',
+                        'Description', 'URL', 'Country', 'Region', 'category_field', 'extras']
+
+
+def coordinate(value):
+    """JSON number for a coordinate, 0 when missing like Catalog.row"""
+    return float(value) if np.isfinite(value) else 0
+
+
+def sort_order(catalog):
+    """
+    Row order for the file: grouped by category, then country, region and
+    source file, keeping each file's own row order. Similar rows end up next
+    to each other, which is what makes the file compress well
+    """
+    categories = sorted(catalog.category.values)
+    rank = {category: i for i, category in enumerate(categories)}
+    return categories, sorted(range(len(catalog)), key=lambda i: (
+        rank[catalog.category[i]], catalog.country[i], catalog.region[i], catalog.source[i], i))
+
+
+def build_world_catalog(catalog):
+    categories, order = sort_order(catalog)
+    countries = sorted(set(catalog.country.values))
+    regions = sorted(set(catalog.region.values))
+    category_fields = [''] + sorted({field for field in catalog.category_fields.values() if field})
+    country_code = {country: i for i, country in enumerate(countries)}
+    region_code = {region: i for i, region in enumerate(regions)}
+    category_field_code = {field: i for i, field in enumerate(category_fields)}
+
+    rows = []
+    offsets = {}
+    for position, i in enumerate(order):
+        category = catalog.category[i]
+        start, count = offsets.get(category, (position, 0))
+        offsets[category] = (start, count + 1)
+        row = [
+            catalog.ids[i], catalog.park_codes[i], catalog.names[i], catalog.designations[i], catalog.states[i],
+            coordinate(catalog.lat[i]), coordinate(catalog.lon[i]), catalog.descriptions[i], catalog.urls[i],
+            country_code[catalog.country[i]], region_code[catalog.region[i]],
+            category_field_code[catalog.category_fields.get(catalog.source[i]) or ''],
+        ]
+        if catalog.extras[i]:
+            row.append(catalog.extras[i])
+        rows.append(row)
+
+    return {
+        'version': 1,
+        'count': len(rows),
+        'fields': WORLD_CATALOG_FIELDS,
+        'Country': countries,
+        'Region': regions,
+        'category_field': category_fields,
+        # category -> [first row, number of rows]; rows are contiguous per category
+        'categories': {category: list(offsets[category]) for category in categories},
+        'rows': rows,
+    }
+
+
+def write_world_catalog(world_catalog, output_path=WORLD_CATALOG_PATH):
+    data = json.dumps(world_catalog, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return write_if_changed(output_path, data)
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("World Catalog Builder")
+    print("=" * 60)
+
+    with load_packed_catalog() as catalog:
+        world_catalog = build_world_catalog(catalog)
+    rewritten = write_world_catalog(world_catalog)
+    print(f"✅ {world_catalog['count']} attractions from {len(world_catalog['Country'])} countries")
+    for category, (start, count) in world_catalog['categories'].items():
+        print(f"   {category}: {count} rows from {start}")
+    print(f"📁 {'Saved' if rewritten else 'Unchanged'}: {WORLD_CATALOG_PATH} "
+          f"({os.path.getsize(WORLD_CATALOG_PATH) / 1024:.1f} KB)")
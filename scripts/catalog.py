@@ -0,0 +1,434 @@
+"""
+Unified attraction catalog loader
+Reads every CSV in public/data once, normalizes the per-file schemas the same
+way loadParksData in src/services/dataService.js does, and returns a
+column-oriented catalog shared by the map builder and other generators
+"""
+
+import csv
+import glob
+import os
+from collections import namedtuple
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLIC_DATA_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'public', 'data'))
+BUILD_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'build'))
+
+AIRPORTS_FILE = 'Major_Airports.csv'
+
+STANDARD_FIELDS = ['Park_Code', 'Name', 'Designation', 'States', 'Latitude', 'Longitude', 'Description', 'URL', 'Country']
+
+# How each CSV is loaded by the app.
+#   prefix          id prefix, an attraction's id is f"{prefix}-{Park_Code}"
+#   country         fixed country, or None to keep the row's Country column
+#   category        attraction type used for filtering
+#   category_field  row field the app stores the category in (IndiaCategory, ...)
+#   designation     default Designation when the row has none
+#   description     default Description template when the row has none
+#   strict          drop rows with an empty name or missing coordinates
+Source = namedtuple('Source', 'prefix country category category_field designation description strict')
+
+UNESCO_DESIGNATION = 'UNESCO World Heritage Site'
+UNESCO_DESCRIPTION = 'UNESCO World Heritage Site in {States}'
+
+SOURCES = {
+    'US_National_Parks.csv': Source('us', 'United States', 'Parks', None, None, None, False),
+    'US_Most_Photographed_Places.csv': Source('us-mp', 'United States', 'MostPhotographed', None, None, None, False),
+    'Canadian_National_Parks.csv': Source('ca', 'Canada', 'Parks', None, 'National Park', 'Canadian National Park in {States}', False),
+    'Canada_Most_Photographed_Places.csv': Source('ca-mp', 'Canada', 'MostPhotographed', None, None, None, False),
+    'Asia_Most_Photographed_Places.csv': Source('asia-mp', None, 'MostPhotographed', None, None, None, False),
+    'Indian_National_Parks.csv': Source('in', 'India', 'Parks', 'IndiaCategory', 'National Park', 'Indian National Park in {States}', False),
+    'India_UNESCO_Sites.csv': Source('in-unesco', 'India', 'UNESCO', 'IndiaCategory', UNESCO_DESIGNATION, UNESCO_DESCRIPTION, False),
+    'India_Jyotirlinga_Temples.csv': Source('in-jyotirlinga', 'India', 'Jyotirlinga', 'IndiaCategory', 'Jyotirlinga Temple', 'Jyotirlinga Temple in {States}', True),
+    'India_Shakti_Peethas.csv': Source('in-shakti', None, 'ShaktiPeetha', 'IndiaCategory', 'Shakti Peetha', 'Shakti Peetha in {States}', True),
+    'India_Other_Temples.csv': Source('in-other-temple', 'India', 'OtherTemples', 'IndiaCategory', 'Temple', 'Temple in {States}', True),
+    'India_Matham.csv': Source('in-matham', 'India', 'Matham', 'IndiaCategory', 'Matham', 'Matham in {States}', True),
+    'India_Divya_Desams.csv': Source('in-divya', 'India', 'DivyaDesam', 'IndiaCategory', 'Divya Desam', 'Divya Desam in {States}', True),
+    'India_Forts.csv': Source('in-fort', 'India', 'Forts', 'IndiaCategory', 'Historic Fort', 'Historic Fort in {States}', True),
+    'Nepal_National_Parks.csv': Source('np', 'Nepal', 'Parks', None, 'National Park', 'Nepal National Park in {States}', False),
+    'Nepal_Temples.csv': Source('np-temple', 'Nepal', 'Temples', 'NepalCategory', 'Temple', 'Temple in {States}', True),
+    'Nepal_UNESCO_Sites.csv': Source('np-unesco', 'Nepal', 'UNESCO', 'NepalCategory', UNESCO_DESIGNATION, UNESCO_DESCRIPTION, False),
+    'Nepal_Trekking_Flights.csv': Source('np-trekking', 'Nepal', 'TrekkingFlights', 'NepalCategory', 'Himalayan Activity', 'Himalayan activity in {States}', False),
+    'Sri_Lanka_National_Parks.csv': Source('lk', 'Sri Lanka', 'Parks', None, 'National Park', 'Sri Lanka National Park in {States}', False),
+    'Sri_Lanka_Temples.csv': Source('lk-temple', 'Sri Lanka', 'Temples', 'SriLankaCategory', 'Temple', 'Temple in {States}', False),
+    'Sri_Lanka_UNESCO_Sites.csv': Source('lk-unesco', 'Sri Lanka', 'UNESCO', 'SriLankaCategory', UNESCO_DESIGNATION, UNESCO_DESCRIPTION, False),
+    'Costa_Rica_National_Parks.csv': Source('cr', 'Costa Rica', 'Parks', None, 'National Park', 'Costa Rica National Park in {States}', False),
+    'African_National_Parks.csv': Source('af', None, 'Parks', None, 'National Park', 'African National Park in {States}', False),
+}
+
+# Remaining <Country>_UNESCO_Sites.csv files go through processUnescoSites
+UNESCO_COUNTRY_CODES = {
+    'Costa_Rica': 'cr', 'China': 'cn', 'Japan': 'jp', 'South_Korea': 'kr', 'North_Korea': 'kp',
+    'Mongolia': 'mn', 'Thailand': 'th', 'Indonesia': 'id', 'Vietnam': 'vn', 'Cambodia': 'kh',
+    'Myanmar': 'mm', 'Philippines': 'ph', 'Malaysia': 'my', 'Singapore': 'sg', 'Laos': 'la',
+    'Brunei': 'bn', 'East_Timor': 'tl', 'Bangladesh': 'bd', 'Pakistan': 'pk', 'Afghanistan': 'af',
+    'Bhutan': 'bt', 'Maldives': 'mv', 'Kazakhstan': 'kz', 'Kyrgyzstan': 'kg', 'Tajikistan': 'tj',
+    'Turkmenistan': 'tm', 'Uzbekistan': 'uz', 'Iran': 'ir', 'Iraq': 'iq', 'Jordan': 'jo',
+    'Lebanon': 'lb', 'Saudi_Arabia': 'sa', 'Syria': 'sy', 'Turkey': 'tr', 'UAE': 'ae',
+    'Yemen': 'ye', 'Oman': 'om', 'Qatar': 'qa', 'Kuwait': 'kw', 'Bahrain': 'bh', 'Israel': 'il',
+    'Palestine': 'ps', 'Belize': 'bz', 'Guatemala': 'gt', 'Honduras': 'hn', 'El_Salvador': 'sv',
+    'Nicaragua': 'ni', 'Panama': 'pa', 'Mexico': 'mx', 'US': 'us', 'Canada': 'ca',
+}
+
+# Longer descriptions the app shows for the two most photographed Canadian parks
+CANADIAN_PARK_DESCRIPTIONS = {
+    'banff': "Banff National Park in {States}. Canada's first national park, featuring stunning mountain landscapes, turquoise lakes like Lake Louise and Moraine Lake, and world-class hiking. One of the most photographed places in Canada and the world.",
+    'jasper': "Jasper National Park in {States}. The largest national park in the Canadian Rockies, known for its pristine wilderness, glaciers, and abundant wildlife. With iconic locations like Maligne Lake and the Columbia Icefield, it's one of the most photographed national parks in Canada.",
+}
+
+# Region lists from categorizeParksByRegion
+WEST_STATES = ['CA', 'OR', 'WA', 'NV', 'ID', 'MT', 'WY', 'UT', 'CO', 'AZ', 'NM']
+MIDWEST_STATES = ['ND', 'SD', 'NE', 'KS', 'MN', 'IA', 'MO', 'WI', 'IL', 'MI', 'IN', 'OH']
+SOUTH_STATES = ['TX', 'OK', 'AR', 'LA', 'MS', 'AL', 'TN', 'KY', 'WV', 'VA', 'NC', 'SC', 'GA', 'FL']
+NORTHEAST_STATES = ['ME', 'NH', 'VT', 'MA', 'RI', 'CT', 'NY', 'NJ', 'PA', 'MD', 'DE']
+
+COUNTRY_REGIONS = {}
+for _region, _countries in [
+    ('Africa', ['South Africa', 'Kenya', 'Tanzania', 'Botswana', 'Namibia', 'Zambia', 'Zimbabwe', 'Uganda', 'Rwanda', 'Ethiopia', 'Morocco', 'Egypt', 'Madagascar', 'Gabon', 'Cameroon', 'Algeria', 'Angola', 'Benin', 'Burkina Faso', 'Burundi', 'Cabo Verde', 'Central African Republic', 'Chad', 'Comoros', 'Congo', "Côte d'Ivoire", 'Democratic Republic of the Congo', 'Djibouti', 'Equatorial Guinea', 'Eritrea', 'Eswatini', 'Gambia', 'Ghana', 'Guinea', 'Guinea-Bissau', 'Lesotho', 'Liberia', 'Libya', 'Malawi', 'Mali', 'Mauritania', 'Mauritius', 'Mozambique', 'Niger', 'Nigeria', 'São Tomé and Príncipe', 'Senegal', 'Seychelles', 'Sierra Leone', 'Somalia', 'South Sudan', 'Sudan', 'Togo', 'Tunisia']),
+    ('SouthEastAsia-UNESCO', ['Thailand', 'Indonesia', 'Vietnam', 'Cambodia', 'Myanmar', 'Philippines', 'Malaysia', 'Singapore', 'Laos', 'Brunei', 'East Timor']),
+    ('EastAsia-UNESCO', ['China', 'Japan', 'South Korea', 'North Korea', 'Mongolia']),
+    ('SouthAsia-UNESCO', ['Bangladesh', 'Pakistan', 'Afghanistan', 'Bhutan', 'Maldives']),
+    ('CentralAsia-UNESCO', ['Kazakhstan', 'Kyrgyzstan', 'Tajikistan', 'Turkmenistan', 'Uzbekistan']),
+    ('WestAsia-UNESCO', ['Iran', 'Iraq', 'Jordan', 'Lebanon', 'Saudi Arabia', 'Syria', 'Turkey', 'UAE', 'United Arab Emirates', 'Yemen', 'Oman', 'Qatar', 'Kuwait', 'Bahrain', 'Israel', 'Palestine']),
+    ('CentralAmerica-UNESCO', ['Belize', 'Guatemala', 'Honduras', 'El Salvador', 'Nicaragua', 'Panama', 'Mexico']),
+]:
+    for _country in _countries:
+        COUNTRY_REGIONS[_country] = _region
+
+
+def get_source(filename):
+    """Return the Source for a CSV file name, or None if the app does not load it"""
+    if filename in SOURCES:
+        return SOURCES[filename]
+    if filename.endswith('_UNESCO_Sites.csv'):
+        country_key = filename[:-len('_UNESCO_Sites.csv')]
+        if country_key in UNESCO_COUNTRY_CODES:
+            country = 'United States' if country_key == 'US' else country_key.replace('_', ' ')
+            return Source(f"{UNESCO_COUNTRY_CODES[country_key]}-unesco", country, 'UNESCO', None,
+                          UNESCO_DESIGNATION, UNESCO_DESCRIPTION, False)
+    return None
+
+
+def us_region(states):
+    """US region for a list of state codes, '' if none match"""
+    if 'AK' in states:
+        return 'Alaska'
+    if 'HI' in states:
+        return 'Hawaii'
+    for region, region_states in [('West', WEST_STATES), ('Midwest', MIDWEST_STATES),
+                                  ('South', SOUTH_STATES), ('Northeast', NORTHEAST_STATES)]:
+        if any(s in region_states for s in states):
+            return region
+    return ''
+
+
+def resolve_region(country, category, states):
+    """Region key as assigned by categorizeParksByRegion"""
+    if category == 'ShaktiPeetha':
+        return 'India-ShaktiPeetha'
+    if country == 'Canada':
+        return 'Canada'
+    if country in ('India', 'Nepal', 'Sri Lanka'):
+        known = {
+            'India': ['UNESCO', 'Jyotirlinga', 'OtherTemples', 'Matham', 'DivyaDesam', 'Forts'],
+            'Nepal': ['UNESCO', 'Temples', 'TrekkingFlights'],
+            'Sri Lanka': ['UNESCO', 'Temples'],
+        }[country]
+        return f"{country}-{category if category in known else 'Parks'}"
+    if country == 'Costa Rica':
+        return 'Costa Rica'
+    if country in COUNTRY_REGIONS:
+        return COUNTRY_REGIONS[country]
+    return us_region([s.strip() for s in states.split(',')])
+
+
+def parse_coordinate(value):
+    """Parse a Latitude/Longitude cell, NaN when missing or malformed"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+
+def repair_cells(header, cells):
+    """
+    Fix a row with more cells than the header. The extra cells come from an
+    unquoted comma inside a text column, so join them back into the first
+    column that leaves Latitude and Longitude parseable.
+    """
+    surplus = len(cells) - len(header)
+    if surplus <= 0 or 'Latitude' not in header or 'Longitude' not in header:
+        return cells
+    lat_column, lon_column = header.index('Latitude'), header.index('Longitude')
+    for column in range(1, len(header)):
+        merged = cells[:column] + [','.join(cells[column:column + surplus + 1])] + cells[column + surplus + 1:]
+        if column not in (lat_column, lon_column) and np.isfinite(parse_coordinate(merged[lat_column])) \
+                and np.isfinite(parse_coordinate(merged[lon_column])):
+            return merged
+    return cells
+
+
+def read_csv_rows(path):
+    """Read a CSV into dicts, repairing rows split by an unquoted comma"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [dict(zip(header, repair_cells(header, cells))) for cells in reader if cells]
+    return header, rows
+
+
+def as_float_array(values):
+    """Floating point arrays pass through untouched, anything else becomes float64"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return values
+    return np.asarray(values, dtype=np.float64)
+
+
+class CodedColumn:
+    """Dictionary-encoded string column: values holds each distinct string once"""
+
+    def __init__(self, strings=None, values=None, codes=None):
+        if strings is not None:
+            lookup = {}
+            codes = np.array([lookup.setdefault(s, len(lookup)) for s in strings], dtype=np.int32)
+            values = list(lookup)
+        self.values = list(values)
+        # Integer arrays are kept as-is so memory-mapped codes are not copied
+        self.codes = codes if isinstance(codes, np.ndarray) and codes.dtype.kind in 'iu' else np.asarray(codes, dtype=np.int32)
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def mask(self, values):
+        """Boolean mask of rows whose value is values (a string) or one of values"""
+        if isinstance(values, str):
+            values = [values]
+        wanted = [self._lookup[v] for v in values if v in self._lookup]
+        return np.isin(self.codes, wanted)
+
+    def take(self, indices):
+        return CodedColumn(values=self.values, codes=self.codes[indices])
+
+
+class Catalog:
+    """
+    Column-oriented attraction catalog.
+
+    lat/lon are float arrays (NaN when a row has no coordinates), country,
+    category, region and source are dictionary-encoded CodedColumns, the
+    remaining text fields are sequences (plain lists when loaded from CSV),
+    and file-specific columns such as UNESCO_Year or Temple_Category live in
+    extras. Float arrays are used without copying, so a catalog can wrap
+    memory-mapped columns (see catalog_binary.py).
+    """
+
+    TEXT_FIELDS = ['ids', 'park_codes', 'names', 'designations', 'states', 'descriptions', 'urls', 'extras']
+    CODED_FIELDS = ['country', 'category', 'region', 'source']
+
+    def __init__(self, ids, park_codes, names, designations, states, descriptions, urls, extras,
+                 lat, lon, country, category, region, source, category_fields=None):
+        self.ids = ids
+        self.park_codes = park_codes
+        self.names = names
+        self.designations = designations
+        self.states = states
+        self.descriptions = descriptions
+        self.urls = urls
+        self.extras = extras
+        self.lat = as_float_array(lat)
+        self.lon = as_float_array(lon)
+        self.country = country if isinstance(country, CodedColumn) else CodedColumn(country)
+        self.category = category if isinstance(category, CodedColumn) else CodedColumn(category)
+        self.region = region if isinstance(region, CodedColumn) else CodedColumn(region)
+        self.source = source if isinstance(source, CodedColumn) else CodedColumn(source)
+        # source file -> field name the app keeps the category in
+        self.category_fields = category_fields or {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def has_coordinates(self):
+        """Rows with usable coordinates (finite and not 0, matching the old scripts)"""
+        return np.isfinite(self.lat) & np.isfinite(self.lon) & (self.lat != 0) & (self.lon != 0)
+
+    def where(self, country=None, category=None, region=None, source=None):
+        """Boolean mask for rows matching every given filter (a value or list of values)"""
+        mask = np.ones(len(self), dtype=bool)
+        for column, wanted in [(self.country, country), (self.category, category),
+                               (self.region, region), (self.source, source)]:
+            if wanted is not None:
+                mask &= column.mask(wanted)
+        return mask
+
+    def subset(self, selector):
+        """New catalog with the rows picked by a boolean mask or index array"""
+        indices = np.arange(len(self))[selector]
+        return Catalog(
+            *[[getattr(self, field)[i] for i in indices] for field in self.TEXT_FIELDS],
+            self.lat[indices], self.lon[indices],
+            *[getattr(self, field).take(indices) for field in self.CODED_FIELDS],
+            category_fields=self.category_fields,
+        )
+
+    def row(self, i):
+        """Row i as a dict in the CSV schema the app uses (Country always set)"""
+        lat, lon = self.lat[i], self.lon[i]
+        row = {
+            'id': self.ids[i],
+            'Park_Code': self.park_codes[i],
+            'Name': self.names[i],
+            'Designation': self.designations[i],
+            'States': self.states[i],
+            # str() of a NumPy scalar is the shortest round-trip form for its own precision
+            'Latitude': str(lat) if np.isfinite(lat) else '0',
+            'Longitude': str(lon) if np.isfinite(lon) else '0',
+            'Description': self.descriptions[i],
+            'URL': self.urls[i],
+            'Country': self.country[i],
+        }
+        category_field = self.category_fields.get(self.source[i])
+        if category_field:
+            row[category_field] = self.category[i]
+        row.update(self.extras[i])
+        return row
+
+    def rows(self):
+        return [self.row(i) for i in range(len(self))]
+
+
+def normalize_rows(filename, source, rows):
+    """Apply the app's per-file defaults and filters, yielding normalized row dicts"""
+    for row_number, row in enumerate(rows):
+        if filename == 'Canadian_National_Parks.csv':
+            row = dict(row, States=row.get('Province', ''))
+            row.pop('Province', None)
+            template = CANADIAN_PARK_DESCRIPTIONS.get(row.get('Park_Code'), source.description)
+            row['Description'] = template.format(States=row['States'])
+
+        name = row.get('Name') or ''
+        lat = parse_coordinate(row.get('Latitude'))
+        lon = parse_coordinate(row.get('Longitude'))
+        if source.strict and (not name.strip() or not np.isfinite(lat) or not np.isfinite(lon) or lat == 0 or lon == 0):
+            continue
+
+        states = row.get('States') or ''
+        description = row.get('Description') or ''
+        if not description and source.description:
+            description = source.description.format(States=states)
+
+        yield {
+            'id': f"{source.prefix}-{row.get('Park_Code') or row_number}",
+            'Park_Code': row.get('Park_Code') or '',
+            'Name': name,
+            'Designation': row.get('Designation') or source.designation or '',
+            'States': states,
+            'Latitude': lat,
+            'Longitude': lon,
+            'Description': description,
+            'URL': row.get('URL') or '',
+            # Shakti Peethas keep their own country (one is in Sri Lanka), defaulting to India
+            'Country': source.country or row.get('Country') or ('India' if source.category_field == 'IndiaCategory' else ''),
+            'extras': {k: v for k, v in row.items() if k and k not in STANDARD_FIELDS},
+        }
+
+
+def drop_shared_pins(rows):
+    """Hide Guhyeshwari when Pashupatinath sits on the same coordinates, as the app does"""
+    def is_pashupatinath(row):
+        return row['Park_Code'] == 'PAS' or 'Pashupatinath' in row['Name']
+
+    pashupatinath = [(r['Latitude'], r['Longitude']) for r in rows if is_pashupatinath(r)]
+    kept = []
+    for row in rows:
+        is_guhyeshwari = row['Park_Code'] == 'GUH' or 'Guhyeshwari' in row['Name']
+        if is_guhyeshwari and not is_pashupatinath(row) and any(
+                abs(lat - row['Latitude']) < 0.0001 and abs(lon - row['Longitude']) < 0.0001
+                for lat, lon in pashupatinath):
+            continue
+        kept.append(row)
+    return kept
+
+
+def build_catalog(records, category_fields):
+    """Create a Catalog from normalized row dicts plus category/region/source labels"""
+    return Catalog(
+        [r['id'] for r in records],
+        [r['Park_Code'] for r in records],
+        [r['Name'] for r in records],
+        [r['Designation'] for r in records],
+        [r['States'] for r in records],
+        [r['Description'] for r in records],
+        [r['URL'] for r in records],
+        [r['extras'] for r in records],
+        [r['Latitude'] for r in records],
+        [r['Longitude'] for r in records],
+        [r['Country'] for r in records],
+        [r['category'] for r in records],
+        [r['region'] for r in records],
+        [r['source'] for r in records],
+        category_fields=category_fields,
+    )
+
+
+def load_catalog(data_dir=PUBLIC_DATA_DIR):
+    """Load every attraction CSV in data_dir into one Catalog (airports excluded)"""
+    records = []
+    category_fields = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        filename = os.path.basename(path)
+        source = get_source(filename)
+        if source is None:
+            continue
+        category_fields[filename] = source.category_field
+        _, rows = read_csv_rows(path)
+        normalized = list(normalize_rows(filename, source, rows))
+        if filename == 'Nepal_Temples.csv':
+            normalized = drop_shared_pins(normalized)
+        for record in normalized:
+            record['category'] = source.category
+            record['region'] = resolve_region(record['Country'], source.category, record['States'])
+            record['source'] = filename
+            records.append(record)
+    return build_catalog(records, category_fields)
+
+
+def load_airports(data_dir=PUBLIC_DATA_DIR):
+    """Load Major_Airports.csv as a Catalog; row() keeps the IATA and City columns"""
+    path = os.path.join(data_dir, AIRPORTS_FILE)
+    records = []
+    if os.path.exists(path):
+        _, rows = read_csv_rows(path)
+        for row in rows:
+            records.append({
+                'id': row.get('IATA', ''),
+                'Park_Code': row.get('IATA', ''),
+                'Name': row.get('Name', ''),
+                'Designation': 'Airport',
+                'States': row.get('State', ''),
+                'Latitude': parse_coordinate(row.get('Latitude')),
+                'Longitude': parse_coordinate(row.get('Longitude')),
+                'Description': '',
+                'URL': '',
+                'Country': row.get('Country', ''),
+                'extras': {'IATA': row.get('IATA', ''), 'City': row.get('City', ''), 'State': row.get('State', '')},
+                'category': 'Airport',
+                'region': '',
+                'source': AIRPORTS_FILE,
+            })
+    return build_catalog(records, {})
+
+
+if __name__ == '__main__':
+    catalog = load_catalog()
+    airports = load_airports()
+    print(f"Loaded {len(catalog)} attractions from {len(catalog.source.values)} files "
+          f"({int(catalog.has_coordinates.sum())} with coordinates) and {len(airports)} airports")
+    for category in catalog.category.values:
+        print(f"  {category}: {int(catalog.category.mask(category).sum())}")
@@ -0,0 +1,282 @@
+"""
+Packed columnar catalog file
+Writes the attraction catalog to build/catalog.bin and maps it back with mmap,
+so tools can read coordinate and code columns without parsing the CSVs.
+load_packed_catalog() is what the generators and the query service load
+
+Layout (little-endian, every section 8-byte aligned):
+    magic      8 bytes  b'WACATLG1'
+    header     uint32 length followed by a UTF-8 JSON header
+    sections   raw column data referenced by byte offset from the header
+
+Column kinds:
+    float64    one float64 per row (lat, lon), the values load_catalog() parses
+    heap       uint32 offsets (rows + 1) into a UTF-8 string heap
+    json       heap column whose strings are JSON objects (extras)
+    coded      integer codes per row, distinct values kept in the header
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from catalog import BUILD_DIR, PUBLIC_DATA_DIR, Catalog, CodedColumn, get_source, load_catalog
+
+MAGIC = b'WACATLG1'
+FORMAT_VERSION = 2
+CATALOG_BINARY_PATH = os.path.join(BUILD_DIR, 'catalog.bin')
+
+HEAP_COLUMNS = ['ids', 'park_codes', 'names', 'descriptions', 'urls']
+CODED_COLUMNS = ['designations', 'states', 'country', 'category', 'region', 'source']
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _code_dtype(count):
+    return '<u2' if count <= 0xFFFF else '<u4'
+
+
+class StringHeapColumn:
+    """Read-only string sequence over an offset array and a UTF-8 heap; decodes on access"""
+
+    def __init__(self, buffer, offsets, data_start):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._data_start = data_start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start = self._data_start + int(self._offsets[index])
+        end = self._data_start + int(self._offsets[index + 1])
+        return self._decode(self._buffer[start:end])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def _decode(self, raw):
+        return bytes(raw).decode('utf-8')
+
+
+class JsonHeapColumn(StringHeapColumn):
+    """Heap column of JSON objects, an empty string decodes to {}"""
+
+    def _decode(self, raw):
+        return json.loads(bytes(raw)) if len(raw) else {}
+
+
+def catalog_binary_path(data_dir=PUBLIC_DATA_DIR):
+    """build/catalog.bin for public/data, build/catalog-<dir hash>.bin for any other data_dir"""
+    data_dir = os.path.realpath(data_dir)
+    if data_dir == os.path.realpath(PUBLIC_DATA_DIR):
+        return CATALOG_BINARY_PATH
+    digest = hashlib.sha256(data_dir.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(BUILD_DIR, f'catalog-{digest}.bin')
+
+
+def source_stamps(data_dir=PUBLIC_DATA_DIR):
+    """{'data_dir': resolved path, 'files': {filename: [size, mtime_ns]}} for the CSVs load_catalog reads"""
+    stamps = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        filename = os.path.basename(path)
+        if get_source(filename) is not None:
+            stat = os.stat(path)
+            stamps[filename] = [stat.st_size, stat.st_mtime_ns]
+    return {'data_dir': os.path.realpath(data_dir), 'files': stamps}
+
+
+def write_catalog_binary(catalog, path=CATALOG_BINARY_PATH, inputs=None):
+    """Pack a Catalog into path. inputs is stored in the header for staleness checks"""
+    sections = []
+    columns = {}
+    offset = 0
+
+    def add_section(data):
+        nonlocal offset
+        start = _align(offset)
+        sections.append((start, data))
+        offset = start + len(data)
+        return start
+
+    def add_heap(strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+        offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        return {'offsets': add_section(offsets.tobytes()), 'data': add_section(b''.join(encoded))}
+
+    for name in ('lat', 'lon'):
+        columns[name] = {'kind': 'float64', 'data': add_section(getattr(catalog, name).astype('<f8').tobytes())}
+    for name in HEAP_COLUMNS:
+        columns[name] = dict(kind='heap', **add_heap(getattr(catalog, name)))
+    columns['extras'] = dict(kind='json', **add_heap(
+        json.dumps(extra, ensure_ascii=False, separators=(',', ':')) if extra else '' for extra in catalog.extras))
+    for name in CODED_COLUMNS:
+        column = getattr(catalog, name)
+        if not isinstance(column, CodedColumn):
+            column = CodedColumn(column)
+        dtype = _code_dtype(len(column.values))
+        columns[name] = {
+            'kind': 'coded',
+            'dtype': dtype,
+            'values': column.values,
+            'data': add_section(column.codes.astype(dtype).tobytes()),
+        }
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'rows': len(catalog),
+        'category_fields': catalog.category_fields,
+        'inputs': inputs or {},
+        'columns': columns,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # Section offsets in the header are relative to the start of the data area
+    data_start = _align(len(MAGIC) + 4 + len(header))
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Per-process temp name: parallel build steps may all find the file stale
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for start, data in sections:
+            f.seek(data_start + start)
+            f.write(data)
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_header(path):
+    """Return (header dict, data area offset) without mapping the file"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a packed catalog")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {header.get('version')}, expected {FORMAT_VERSION}")
+    return header, _align(len(MAGIC) + 4 + length)
+
+
+def _map_column(buffer, rows, data_start, spec, path):
+    kind = spec['kind']
+    if kind == 'float64':
+        return np.frombuffer(buffer, dtype='<f8', count=rows, offset=data_start + spec['data'])
+    if kind in ('heap', 'json'):
+        offsets = np.frombuffer(buffer, dtype='<u4', count=rows + 1, offset=data_start + spec['offsets'])
+        column_type = JsonHeapColumn if kind == 'json' else StringHeapColumn
+        return column_type(buffer, offsets, data_start + spec['data'])
+    if kind == 'coded':
+        codes = np.frombuffer(buffer, dtype=spec['dtype'], count=rows, offset=data_start + spec['data'])
+        return CodedColumn(values=spec['values'], codes=codes)
+    raise ValueError(f"Unknown column kind {kind!r} in {path}")
+
+
+class PackedCatalog(Catalog):
+    """
+    Catalog whose columns are views on a memory-mapped packed file.
+
+    close(), or leaving a with block, drops the columns and unmaps the file.
+    Rows copied out with subset() stay usable after that. Pickling (as for
+    worker processes) sends only the path, and each process maps the file
+    itself, sharing its pages
+    """
+
+    def __init__(self, path, buffer, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self._buffer = buffer
+
+    def __reduce__(self):
+        return load_catalog_binary, (self.path,)
+
+    @property
+    def closed(self):
+        return self._buffer is None
+
+    def close(self):
+        if self._buffer is None:
+            return
+        # The mapping cannot be closed while NumPy views on it are alive
+        for field in self.TEXT_FIELDS + ['lat', 'lon'] + self.CODED_FIELDS:
+            setattr(self, field, None)
+        buffer, self._buffer = self._buffer, None
+        buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_catalog_binary(path=CATALOG_BINARY_PATH):
+    """
+    Map a packed catalog into memory and wrap it as a PackedCatalog.
+
+    Coordinates and codes are NumPy views on the mapping and strings are
+    decoded only when accessed, so loading does not touch the row data.
+    """
+    header, data_start = read_header(path)
+    rows = header['rows']
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    columns = {}
+    try:
+        for name, spec in header['columns'].items():
+            columns[name] = _map_column(buffer, rows, data_start, spec, path)
+    except (ValueError, TypeError):
+        columns.clear()
+        buffer.close()
+        raise
+
+    return PackedCatalog(
+        path, buffer,
+        *[columns[field] for field in Catalog.TEXT_FIELDS],
+        columns['lat'], columns['lon'],
+        *[columns[field] for field in Catalog.CODED_FIELDS],
+        category_fields=header['category_fields'],
+    )
+
+
+def load_packed_catalog(data_dir=PUBLIC_DATA_DIR, path=None):
+    """
+    Load the packed catalog of data_dir (by default from catalog_binary_path(data_dir)),
+    rebuilding it from the CSVs when any of them changed
+    """
+    path = path or catalog_binary_path(data_dir)
+    stamps = source_stamps(data_dir)
+    if os.path.exists(path):
+        try:
+            header, _ = read_header(path)
+            if header['inputs'] == stamps:
+                return load_catalog_binary(path)
+        except (OSError, ValueError, KeyError):
+            pass
+    write_catalog_binary(load_catalog(data_dir), path, inputs=stamps)
+    return load_catalog_binary(path)
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Packed Catalog Builder")
+    print("=" * 60)
+
+    catalog = load_catalog()
+    write_catalog_binary(catalog, CATALOG_BINARY_PATH, inputs=source_stamps())
+    print(f"✅ Packed {len(catalog)} attractions -> {CATALOG_BINARY_PATH} "
+          f"({os.path.getsize(CATALOG_BINARY_PATH) / 1024:.1f} KB)")
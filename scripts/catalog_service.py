@@ -0,0 +1,346 @@
+"""
+Local HTTP query service for the attraction catalog
+Loads the merged catalog, its spatial index and the search index once and
+answers filtered, paginated queries as JSON over keep-alive connections,
+caching the responses to repeated queries
+
+Usage:
+    python3 scripts/catalog_service.py [--host 127.0.0.1] [--port 8765] [--cache-size 1024]
+
+    GET /attractions?bbox=west,south,east,north&category=Parks,UNESCO&country=India
+                    &region=West&q=temple&near=lat,lon&radius=50&page=1&page_size=50
+    GET /tiles/{z}/{x}/{y}.json?category=Parks,UNESCO&country=India&region=West
+    GET /stats
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from build_search_index import build_search_index, search
+from build_vector_tiles import mercator, min_zooms, thinning_rank
+from build_world_catalog import sort_order
+from catalog_binary import load_packed_catalog
+from spatial_index import load_attraction_tree
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_RADIUS_MILES = 50.0
+# Responses kept for repeated queries
+DEFAULT_CACHE_SIZE = 1024
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = 30
+
+QUERY_PARAMETERS = {'bbox', 'category', 'country', 'region', 'q', 'near', 'radius', 'page', 'page_size'}
+TILE_PARAMETERS = {'category', 'country', 'region'}
+
+# Web Mercator tiles, as used by Leaflet. Thinning matches the vector tile
+# pyramid up to its MAX_ZOOM, where every attraction is drawn; deeper tiles
+# are only subdivided
+MAX_TILE_ZOOM = 22
+TILE_PATH = re.compile(r'^/tiles/(\d+)/(\d+)/(\d+)\.json$')
+
+
+class QueryError(ValueError):
+    """A request parameter that cannot be used; answered with 400"""
+
+
+def parse_floats(value, count, name):
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except ValueError:
+        raise QueryError(f"{name} must be {count} comma-separated numbers") from None
+    if len(numbers) != count or not all(math.isfinite(n) for n in numbers):
+        raise QueryError(f"{name} must be {count} comma-separated numbers")
+    return numbers
+
+
+def parse_int(value, name, low, high):
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+    if not low <= number <= high:
+        raise QueryError(f"{name} must be between {low} and {high}")
+    return number
+
+
+def parse_query(query_string, allowed=QUERY_PARAMETERS):
+    """
+    Canonical, hashable form of a query string: a sorted tuple of (name, value)
+    pairs with values parsed, so equivalent URLs share one cache entry
+    """
+    raw = {name: values[-1] for name, values in parse_qs(query_string, keep_blank_values=True).items()}
+    unknown = sorted(set(raw) - allowed)
+    if unknown:
+        raise QueryError(f"unknown parameter: {', '.join(unknown)}")
+
+    query = {}
+    if 'page' in allowed:
+        query['page'] = parse_int(raw.get('page', '1'), 'page', 1, 10 ** 6)
+        query['page_size'] = parse_int(raw.get('page_size', str(DEFAULT_PAGE_SIZE)), 'page_size', 1, MAX_PAGE_SIZE)
+    if raw.get('bbox'):
+        west, south, east, north = parse_floats(raw['bbox'], 4, 'bbox')
+        if south > north:
+            raise QueryError("bbox south must not be above north")
+        query['bbox'] = (west, south, east, north)
+    for name in ('category', 'country', 'region'):
+        if raw.get(name):
+            query[name] = tuple(sorted({value.strip() for value in raw[name].split(',') if value.strip()}))
+    if raw.get('q', '').strip():
+        query['q'] = ' '.join(raw['q'].split())
+    if raw.get('near'):
+        query['near'] = tuple(parse_floats(raw['near'], 2, 'near'))
+        query['radius'] = parse_floats(raw.get('radius') or str(DEFAULT_RADIUS_MILES), 1, 'radius')[0]
+        if query['radius'] <= 0:
+            raise QueryError("radius must be positive")
+    elif raw.get('radius'):
+        raise QueryError("radius needs near=lat,lon")
+    return tuple(sorted(query.items()))
+
+
+def parse_tile(z, x, y):
+    z, x, y = int(z), int(x), int(y)
+    if z > MAX_TILE_ZOOM:
+        raise QueryError(f"zoom must be at most {MAX_TILE_ZOOM}")
+    if x >= 1 << z or y >= 1 << z:
+        raise QueryError(f"tile {x},{y} is outside zoom {z}")
+    return z, x, y
+
+
+class CatalogService:
+    """
+    Catalog queries without the HTTP layer. Results are in merged-catalog
+    order, by search score when q is given, or by distance when near is given
+    """
+
+    def __init__(self, catalog, cache_size=DEFAULT_CACHE_SIZE):
+        self.catalog = catalog
+        _, order = sort_order(catalog)
+        self.order = np.array(order, dtype=np.int64)
+        self.index_of = {attraction_id: i for i, attraction_id in enumerate(catalog.ids)}
+
+        self.mapped = np.flatnonzero(catalog.has_coordinates)
+        self.tree = load_attraction_tree(catalog)
+        self.search_index = build_search_index(catalog)
+
+        # Mapped attractions best ranked first, with their Web Mercator position
+        rank = thinning_rank(catalog, self.mapped)
+        self.tiled = self.mapped[np.argsort(rank, kind='stable')]
+        self.x, self.y = mercator(catalog.lat[self.tiled], catalog.lon[self.tiled])
+
+        self.respond = functools.lru_cache(maxsize=cache_size)(self._respond)
+        self.thinning = functools.lru_cache(maxsize=cache_size)(self._thinning)
+
+    def mask(self, query):
+        catalog = self.catalog
+        mask = catalog.where(country=query.get('country'), category=query.get('category'), region=query.get('region'))
+        if 'bbox' in query:
+            west, south, east, north = query['bbox']
+            with np.errstate(invalid='ignore'):
+                in_lat = (catalog.lat >= south) & (catalog.lat <= north)
+                if west <= east:
+                    in_lon = (catalog.lon >= west) & (catalog.lon <= east)
+                else:
+                    # Box across the antimeridian
+                    in_lon = (catalog.lon >= west) | (catalog.lon <= east)
+            mask &= catalog.has_coordinates & in_lat & in_lon
+        return mask
+
+    def matches(self, query):
+        """[(catalog index, extra fields)] matching query, in result order"""
+        mask = self.mask(query)
+        scores = None
+        if 'q' in query:
+            found = search(self.search_index, query['q'], limit=None) or []
+            scores = {self.index_of[attraction_id]: score for attraction_id, score in found}
+
+        if 'near' in query:
+            lat, lon = query['near']
+            pairs = self.tree.query_radius(lat, lon, query['radius'])
+            results = []
+            for node, distance in pairs:
+                i = int(self.mapped[node])
+                if mask[i] and (scores is None or i in scores):
+                    extra = {'distance': round(distance, 1)}
+                    if scores is not None:
+                        extra['score'] = scores[i]
+                    results.append((i, extra))
+            return results
+        if scores is not None:
+            return [(i, {'score': score}) for i, score in scores.items() if mask[i]]
+        return [(int(i), {}) for i in self.order[mask[self.order]]]
+
+    def row(self, i, extra):
+        row = self.catalog.row(i)
+        row['Category'] = self.catalog.category[i]
+        row['Region'] = self.catalog.region[i]
+        row.update(extra)
+        return row
+
+    def query(self, query):
+        """Response document for a parse_query() result"""
+        options = dict(query)
+        results = self.matches(options)
+        page, page_size = options['page'], options['page_size']
+        start = (page - 1) * page_size
+        return {
+            'total': len(results),
+            'page': page,
+            'page_size': page_size,
+            'pages': math.ceil(len(results) / page_size),
+            'results': [self.row(i, extra) for i, extra in results[start:start + page_size]],
+        }
+
+    def _thinning(self, country, category, region):
+        """
+        (selected, first zoom) over self.tiled for one set of filters: which
+        attractions match them, and the first zoom each is drawn at when only
+        the matching attractions compete for the thinning cells
+        """
+        selected = self.mask({'country': country, 'category': category, 'region': region})[self.tiled]
+        first_zoom = np.full(len(self.tiled), MAX_TILE_ZOOM + 1, dtype=np.int16)
+        # self.tiled is in rank order, so positions rank the selected attractions
+        first_zoom[selected] = min_zooms(self.x[selected], self.y[selected], np.flatnonzero(selected))
+        return selected, first_zoom
+
+    def tile(self, z, x, y, query):
+        """
+        Response document for one tile: the attractions in it that are drawn
+        at zoom z, best ranked first, plus how many more it holds that only
+        appear at deeper zooms. Thinning runs over the filtered attractions
+        """
+        options = dict(query)
+        selected, first_zoom = self.thinning(options.get('country'), options.get('category'), options.get('region'))
+        scale = 1 << z
+        inside = ((self.x * scale).astype(np.int64) == x) & ((self.y * scale).astype(np.int64) == y)
+        inside &= selected
+        drawn = inside & (first_zoom <= z)
+        return {
+            'z': z, 'x': x, 'y': y,
+            'total': int(inside.sum()),
+            'hidden': int(inside.sum() - drawn.sum()),
+            'results': [self.row(int(i), {}) for i in self.tiled[drawn]],
+        }
+
+    def _respond(self, query, tile=None):
+        """
+        (body, ETag) for a parse_query() result, or for a tile when tile is
+        (z, x, y); wrapped in an LRU cache
+        """
+        document = self.query(query) if tile is None else self.tile(*tile, query)
+        body = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests (every response has a Content-Length)
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body are separate writes; without TCP_NODELAY the body waits
+    # for the client's delayed ACK (~40 ms) on a reused connection
+    disable_nagle_algorithm = True
+    service = None
+    verbose = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        tile = TILE_PATH.match(url.path)
+        if url.path == '/attractions' or tile:
+            try:
+                if tile:
+                    response = self.service.respond(parse_query(url.query, TILE_PARAMETERS), parse_tile(*tile.groups()))
+                else:
+                    response = self.service.respond(parse_query(url.query))
+            except QueryError as error:
+                self.send_json(400, {'error': str(error)})
+                return
+            body, etag = response
+            if etag in (self.headers.get('If-None-Match') or ''):
+                self.send_body(304, b'', etag=etag)
+            else:
+                self.send_body(200, body, etag=etag)
+        elif url.path == '/stats':
+            info = self.service.respond.cache_info()
+            self.send_json(200, {
+                'attractions': len(self.service.catalog),
+                'cache': {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize},
+            })
+        else:
+            self.send_json(404, {'error': f"no such endpoint: {url.path}"})
+
+    def do_OPTIONS(self):
+        # CORS preflight for conditional requests from the app
+        self.send_body(204, b'')
+
+    def send_json(self, status, document):
+        self.send_body(status, json.dumps(document).encode('utf-8'))
+
+    def send_body(self, status, body, etag=None):
+        self.send_response(status)
+        if status not in (204, 304):
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Headers', 'If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    handler = type('Handler', (CatalogRequestHandler,), {'service': service, 'verbose': verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(service, host=DEFAULT_HOST, port=0):
+    """Serve in a background thread; returns the server (port 0 picks a free port)"""
+    server = make_server(service, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve catalog queries over HTTP')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='responses kept for repeated queries')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Catalog Query Service")
+    print("=" * 60)
+    start = time.perf_counter()
+    service = CatalogService(load_packed_catalog(), cache_size=args.cache_size)
+    print(f"✅ Loaded {len(service.catalog)} attractions in {time.perf_counter() - start:.2f}s")
+    server = make_server(service, args.host, args.port, args.verbose)
+    print(f"🌐 Listening on http://{args.host}:{server.server_port}/attractions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped")
+    finally:
+        server.server_close()
+        service.catalog.close()
@@ -197,19 +197,31 @@ major_airports = [
     {'IATA': 'SLV', 'Name': 'Shimla Airport', 'City': 'Shimla', 'State': 'Himachal Pradesh', 'Country': 'India', 'Latitude': '31.0819', 'Longitude': '77.0681'},
 ]
 
+def get_major_airports():
+    """
+    Return the major airports list
+    """
+    return major_airports
+
+def save_airports_csv(data, filename):
+    """
+    Save airports data to CSV file
+    """
+    fieldnames = ['IATA', 'Name', 'City', 'State', 'Country', 'Latitude', 'Longitude']
+    
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(data)
+
 if __name__ == "__main__":
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     output_path = os.path.join(project_root, 'public', 'data', 'Major_Airports.csv')
     
-    fieldnames = ['IATA', 'Name', 'City', 'State', 'Country', 'Latitude', 'Longitude']
+    airports = get_major_airports()
+    save_airports_csv(airports, output_path)
     
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(major_airports)
-    
-    print(f"Created CSV with {len(major_airports)} major airports")
+    print(f"Created CSV with {len(airports)} major airports")
     print(f"Saved to: {output_path}")
-
@@ -3,28 +3,31 @@ Download Costa Rica National Parks data from Wikipedia
 This script scrapes Wikipedia for Costa Rica National Parks information
 """
 
-import requests
 from bs4 import BeautifulSoup
 import csv
 import json
 import time
 
+from http_fetch import WIKIPEDIA_BASE_URL, Fetcher
+from wiki_coordinates import extract_coordinates, parse_geohack_params
+
 def get_costa_rica_parks_data():
     """
     Scrape Costa Rica National Parks from Wikipedia
     Returns a list of park dictionaries
     """
     parks = []
+    pending_pages = []
+    fetcher = Fetcher()
     
     # Wikipedia page for Costa Rica National Parks
-    url = "https://en.wikipedia.org/wiki/List_of_national_parks_of_Costa_Rica"
+    url = f"{WIKIPEDIA_BASE_URL}/wiki/List_of_national_parks_of_Costa_Rica"
     
     try:
         print("Fetching Costa Rica National Parks data from Wikipedia...")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        content = fetcher.get(url, timeout=30)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser')
         
         # Find the main table with park data
         tables = soup.find_all('table', {'class': 'wikitable'})
@@ -65,26 +68,14 @@ def get_costa_rica_parks_data():
                         if coord_links:
                             href = coord_links[0].get('href', '')
                             # Extract coordinates from geohack URL
-                            if 'params=' in href:
-                                params = href.split('params=')[1].split('&')[0]
-                                parts = params.split('_')
-                                if len(parts) >= 4:
-                                    try:
-                                        lat = float(parts[0])
-                                        if parts[1] == 'S':
-                                            lat = -lat
-                                        lon = float(parts[2])
-                                        if parts[3] == 'W':
-                                            lon = -lon
-                                    except:
-                                        pass
+                            lat, lon = parse_geohack_params(href)
                         
-                        # If no coordinates found, try to get from name link
+                        # If no coordinates found, look them up on the park's own page later
+                        park_url = None
                         if lat is None or lon is None:
                             name_link = cells[0].find('a')
                             if name_link:
-                                park_url = f"https://en.wikipedia.org{name_link.get('href', '')}"
-                                lat, lon = get_coordinates_from_page(park_url)
+                                park_url = f"{WIKIPEDIA_BASE_URL}{name_link.get('href', '')}"
                         
                         # Clean up name (remove references, notes, etc.)
                         name = name.split('[')[0].split('(')[0].strip()
@@ -102,61 +93,40 @@ def get_costa_rica_parks_data():
                                 'Country': 'Costa Rica'
                             }
                             parks.append(park)
+                            if park_url:
+                                pending_pages.append((park, park_url))
                             print(f"  Found: {name} ({province})")
                             
                     except Exception as e:
                         print(f"  Error processing row: {e}")
                         continue
         
+        # Fetch the park pages concurrently instead of one request per row
+        if pending_pages:
+            print(f"Looking up coordinates for {len(pending_pages)} parks...")
+            coordinates = fetcher.map(extract_coordinates, [park_url for _, park_url in pending_pages], default=(None, None))
+            for (park, _), (lat, lon) in zip(pending_pages, coordinates):
+                park['Latitude'] = str(lat) if lat else '0'
+                park['Longitude'] = str(lon) if lon else '0'
+        
         print(f"\nTotal Costa Rica National Parks found: {len(parks)}")
         return parks
         
     except Exception as e:
         print(f"Error fetching data: {e}")
         return []
+    finally:
+        fetcher.close()
 
-def get_coordinates_from_page(url):
+def get_coordinates_from_page(url, fetcher=None):
     """Try to get coordinates from a Wikipedia page"""
     try:
-        response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for coordinates in the infobox
-        coord_span = soup.find('span', {'class': 'geo'})
-        if coord_span:
-            text = coord_span.get_text()
-            if ';' in text:
-                parts = text.split(';')
-                if len(parts) == 2:
-                    try:
-                        lat = float(parts[0].strip())
-                        lon = float(parts[1].strip())
-                        return lat, lon
-                    except:
-                        pass
-        
-        # Look for geohack link
-        coord_link = soup.find('a', href=lambda x: x and 'geohack' in x)
-        if coord_link:
-            href = coord_link.get('href', '')
-            if 'params=' in href:
-                params = href.split('params=')[1].split('&')[0]
-                parts = params.split('_')
-                if len(parts) >= 4:
-                    try:
-                        lat = float(parts[0])
-                        if parts[1] == 'S':
-                            lat = -lat
-                        lon = float(parts[2])
-                        if parts[3] == 'W':
-                            lon = -lon
-                        return lat, lon
-                    except:
-                        pass
+        if fetcher is None:
+            with Fetcher() as fetcher:
+                return extract_coordinates(fetcher.get(url))
+        return extract_coordinates(fetcher.get(url))
     except:
-        pass
-    
-    return None, None
+        return None, None
 
 def save_to_csv(parks, filename='Costa_Rica_National_Parks.csv'):
     """Save parks data to CSV file"""
@@ -1,10 +1,11 @@
 import csv
 
-def get_india_other_temples():
+def get_india_other_temples(existing_names=None):
     """
     Create India Other Major Temples CSV data
     Includes: Char Dham, Pancha Bhoota Stalam, Navagraha temples, and other famous temples
     Excludes: Jyotirlinga temples and Shakti Peethas (already in separate files)
+    existing_names: optional extra names to exclude, e.g. the generated Jyotirlinga and Shakti Peetha lists
     """
     
     # List of existing temples to avoid duplicates
@@ -18,6 +19,8 @@ def get_india_other_temples():
         'Madhaveswari Temple', 'Jwalamukhi Temple', 'Sarvamangala Temple', 'Vishalakshi Temple',
         'Sharada Peeth', 'Shankari Temple', 'Rameswaram'  # Rameswaram is Ramanathaswamy
     ]
+    if existing_names:
+        existing_temples = existing_temples + [name for name in existing_names if name not in existing_temples]
     
     other_temples = [
         # Char Dham (4 major pilgrimage sites) - excluding Rameswaram (already in Jyotirlinga)
@@ -1,7 +1,8 @@
 import csv
-import requests
 import json
 
+from http_fetch import Fetcher
+
 def get_national_parks_data():
     """
     Download or create US National Parks CSV data
@@ -17,9 +18,9 @@ def get_national_parks_data():
             "api_key": api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
+        with Fetcher() as fetcher:
+            data = json.loads(fetcher.get(url, params=params))
+        if data:
             parks = data.get('data', [])
             
             # Filter for National Parks only
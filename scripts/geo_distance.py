@@ -0,0 +1,80 @@
+"""
+Vectorized great-circle distance helpers
+Computes park-to-airport and park-to-park distances with NumPy broadcasting
+instead of calling the scalar Haversine function once per pair
+"""
+
+import numpy as np
+
+# Radius of Earth in miles
+EARTH_RADIUS_MILES = 3958.8
+
+# Number of query rows handled per distance tile, keeps the
+# intermediate matrices small when the catalog grows
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def haversine_matrix(lat1, lon1, lat2, lon2):
+    """
+    Calculate the distance in miles between every point of the first set
+    and every point of the second set using the Haversine formula.
+    Returns an array of shape (len(lat1), len(lat2))
+    """
+    lat1_rad = np.radians(np.asarray(lat1, dtype=np.float64))[:, None]
+    lon1 = np.asarray(lon1, dtype=np.float64)[:, None]
+    lat2_rad = np.radians(np.asarray(lat2, dtype=np.float64))[None, :]
+    lon2 = np.asarray(lon2, dtype=np.float64)[None, :]
+
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lon2 - lon1)
+
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_MILES * c
+
+
+def nearest_within(query_lat, query_lon, target_lat, target_lon, radius, k=5,
+                   exclude=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Find up to k targets within radius miles of each query point.
+
+    The distance matrix is computed in tiles of block_size query rows so
+    memory stays bounded. exclude is an optional callable that takes an
+    array of query indices and returns a boolean matrix of shape
+    (rows, len(targets)) marking pairs to skip (e.g. a park matching itself).
+
+    Returns a list with one entry per query point, each a list of
+    (target_index, distance) tuples sorted by distance. Ties keep the
+    original target order, matching a stable sort over a linear scan.
+    """
+    query_lat = np.asarray(query_lat, dtype=np.float64)
+    query_lon = np.asarray(query_lon, dtype=np.float64)
+    target_lat = np.asarray(target_lat, dtype=np.float64)
+    target_lon = np.asarray(target_lon, dtype=np.float64)
+
+    results = []
+    if len(target_lat) == 0:
+        return [[] for _ in range(len(query_lat))]
+
+    for start in range(0, len(query_lat), block_size):
+        stop = min(start + block_size, len(query_lat))
+        distances = haversine_matrix(query_lat[start:stop], query_lon[start:stop], target_lat, target_lon)
+
+        candidates = distances <= radius
+        if exclude is not None:
+            candidates &= ~exclude(np.arange(start, stop))
+        distances = np.where(candidates, distances, np.inf)
+
+        # Everything up to the k-th smallest distance survives, so ties at
+        # the boundary are resolved by the stable sort below
+        if k < distances.shape[1]:
+            kth = np.partition(distances, k - 1, axis=1)[:, k - 1]
+        else:
+            kth = np.full(distances.shape[0], np.inf)
+
+        for row in range(distances.shape[0]):
+            columns = np.nonzero((distances[row] <= kth[row]) & np.isfinite(distances[row]))[0]
+            order = np.argsort(distances[row, columns], kind='stable')[:k]
+            results.append([(int(columns[i]), float(distances[row, columns[i]])) for i in order])
+
+    return results
@@ -0,0 +1,91 @@
+"""
+Aggregated heat map data for the generated HTML maps
+Bins attractions into weighted lat/lon grid cells at a few resolutions, so a
+heat map ships one [lat, lon, weight] per non-empty cell rather than every
+point, and the browser swaps resolutions as the map zooms
+"""
+
+import numpy as np
+from folium import plugins
+from folium.template import Template
+
+from map_layers import script_json
+
+# (first zoom the level is used at, cell size in degrees), coarsest first.
+# Each cell is a few screen pixels at its first zoom, well under the heat
+# radius; the finest level stays in use at every higher zoom, which is what
+# bounds the payload by grid size rather than point count
+HEAT_GRID_LEVELS = [(0, 2.0), (3, 0.5), (6, 0.1)]
+
+
+def bin_points(lat, lon, cell_degrees, weights=None):
+    """
+    Sum weights (1 per point by default) over a global cell_degrees grid and
+    return an (n, 3) array of [cell center lat, cell center lon, weight] for
+    the non-empty cells only. Cells are keyed sparsely, so memory follows the
+    number of points rather than the size of the grid.
+    """
+    rows = np.floor((lat + 90.0) / cell_degrees).astype(np.int64)
+    cols = np.floor((lon + 180.0) / cell_degrees).astype(np.int64)
+    cols_per_row = int(np.ceil(360.0 / cell_degrees)) + 1
+    keys, cell_of = np.unique(rows * cols_per_row + cols, return_inverse=True)
+    totals = np.bincount(cell_of.ravel(), weights=weights, minlength=len(keys))
+    rows, cols = np.divmod(keys, cols_per_row)
+    return np.column_stack([
+        (rows + 0.5) * cell_degrees - 90.0,
+        (cols + 0.5) * cell_degrees - 180.0,
+        totals,
+    ])
+
+
+def heat_grid(lat, lon, levels=HEAT_GRID_LEVELS, weights=None):
+    """
+    [[min_zoom, [[lat, lon, weight], ...]], ...] for each grid level, with
+    the weights scaled so the level's heaviest cell is 1
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    grid = []
+    for min_zoom, cell_degrees in levels:
+        cells = bin_points(lat, lon, cell_degrees, weights)
+        heaviest = cells[:, 2].max() if len(cells) else 1.0
+        grid.append([min_zoom, [[round(float(y), 4), round(float(x), 4), round(float(w / heaviest), 3)]
+                                for y, x, w in cells]])
+    return grid
+
+
+class GridHeatMap(plugins.HeatMap):
+    """
+    HeatMap over heat_grid() levels. The layer shows the finest level whose
+    min_zoom is at or below the map's zoom and switches level on zoomend, so
+    the page carries the grid cells instead of one entry per point. Weights
+    are normalized per level: upstream leaflet.heat's max defaults to 1.0
+    and would saturate every cell holding more than one point (folium's
+    bundled copy rescales to the heaviest cell itself). Takes the same
+    options as plugins.HeatMap.
+    """
+    # Written straight to the page by map_export.save_map
+    streamed_attributes = ('levels',)
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.heatLayer([], {{ this.options|tojavascript }});
+            (function(layer, levels) {
+                function update() {
+                    var zoom = layer._map.getZoom();
+                    var cells = levels[0][1];
+                    levels.forEach(function(level) { if (zoom >= level[0]) cells = level[1]; });
+                    if (cells !== layer._latlngs) layer.setLatLngs(cells);
+                }
+                layer.on('add', function() { layer._map.on('zoomend', update); update(); });
+                layer.on('remove', function() { layer._map.off('zoomend', update); });
+            })({{ this.get_name() }}, {{ this.levels }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, lat, lon, levels=HEAT_GRID_LEVELS, weights=None, **kwargs):
+        grid = heat_grid(lat, lon, levels, weights)
+        # The parent keeps the finest level for its bounds
+        super().__init__(grid[-1][1], **kwargs)
+        self.levels = script_json(grid)
+        self.cells = sum(len(cells) for _, cells in grid)
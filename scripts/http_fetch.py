@@ -0,0 +1,228 @@
+"""
+Concurrent HTTP fetching for the scraping generators
+Bounded thread pool with one keep-alive requests.Session per host and a
+per-host politeness limit (concurrent requests and minimum spacing).
+Responses are cached on disk with their ETag/Last-Modified validators and
+revalidated with conditional requests; in offline mode only the cache is used
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Point the scrapers at a local stand-in serving saved pages, e.g.
+# WIKIPEDIA_BASE_URL=http://127.0.0.1:8000 python3 scripts/download_indian_parks.py
+WIKIPEDIA_BASE_URL = os.environ.get('WIKIPEDIA_BASE_URL', 'https://en.wikipedia.org').rstrip('/')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HTTP_CACHE_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', 'build', 'http_cache'))
+
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_MIN_INTERVAL = 0.05
+DEFAULT_TIMEOUT = 10
+USER_AGENT = 'WorldAttractionsExplorer/1.0 (data generator; python-requests)'
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL has never been downloaded"""
+
+
+def offline_from_environment():
+    """HTTP_OFFLINE=1 makes every Fetcher serve from the cache only"""
+    return os.environ.get('HTTP_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+class HttpCache:
+    """
+    Response bodies keyed by URL, stored as <sha256>.body next to a
+    <sha256>.json holding the URL and its ETag/Last-Modified validators
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get('HTTP_CACHE_DIR') or HTTP_CACHE_DIR
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + '.json', base + '.body'
+
+    def load(self, url):
+        """Return (metadata, body) for url, or (None, None) when it is not cached"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def store(self, url, response, body=None):
+        """Store a response, or refresh only the metadata when body is None (a 304)"""
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'checked': time.time(),
+        }
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if body is not None:
+            with open(body_path + suffix, 'wb') as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+        else:
+            old_meta, _ = self.load(url)
+            # A 304 may omit validators, keep the ones we sent
+            for field in ('etag', 'last_modified', 'content_type'):
+                meta[field] = meta[field] or (old_meta or {}).get(field)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+
+class HostLimiter:
+    """At most `concurrency` requests in flight and one start per `min_interval` seconds"""
+
+    def __init__(self, concurrency, min_interval):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class Fetcher:
+    """
+    Fetch many URLs concurrently.
+
+    Connections are reused through one Session per host whose pool is sized
+    to the per-host limit, so each worker keeps its connection alive instead
+    of reconnecting for every page. cache=False disables the response cache;
+    offline=None follows the HTTP_OFFLINE environment variable.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST,
+                 min_interval=DEFAULT_MIN_INTERVAL, timeout=DEFAULT_TIMEOUT,
+                 cache=True, offline=None):
+        self.workers = workers
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.cache = HttpCache() if cache is True else (cache or None)
+        self.offline = offline_from_environment() if offline is None else offline
+        if self.offline and self.cache is None:
+            raise ValueError("Offline mode needs a response cache")
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.limiters = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+    def _host(self, host):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                session.headers['User-Agent'] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[host] = session
+                self.limiters[host] = HostLimiter(self.per_host, self.min_interval)
+            return self.sessions[host], self.limiters[host]
+
+    def get(self, url, params=None, timeout=None):
+        """
+        GET url and return the response body as bytes, raising on HTTP errors.
+        A cached copy is revalidated with If-None-Match/If-Modified-Since and
+        reused on 304 or when the network is unreachable; offline, the cached
+        copy is returned without any request.
+        """
+        if params:
+            url = requests.Request('GET', url, params=params).prepare().url
+
+        meta, body = self.cache.load(url) if self.cache else (None, None)
+        if self.offline:
+            if body is None:
+                raise CacheMiss(f"{url} is not in the HTTP cache")
+            return body
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        session, limiter = self._host(urlsplit(url).netloc)
+        try:
+            with limiter:
+                response = session.get(url, headers=headers, timeout=timeout or self.timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            # No network: fall back to the copy we already have
+            if body is not None:
+                return body
+            raise
+        if response.status_code == 304 and body is not None:
+            self.cache.store(url, response)
+            return body
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response, response.content)
+        return response.content
+
+    def map(self, parse, urls, default=None):
+        """
+        Fetch every url and return [parse(content) ...] in input order.
+        A url that fails to download or parse yields default.
+        """
+        def fetch_one(url):
+            try:
+                return parse(self.get(url))
+            except Exception:
+                return default
+
+        urls = list(urls)
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as pool:
+            return list(pool.map(fetch_one, urls))
+
+
+def fetch_all(urls, parse, default=None, **options):
+    """Convenience wrapper: fetch urls with a temporary Fetcher"""
+    with Fetcher(**options) as fetcher:
+        return fetcher.map(parse, urls, default=default)
@@ -0,0 +1,126 @@
+"""
+Load test for the catalog query service
+Runs concurrent clients against a local catalog_service.py, each reusing one
+keep-alive connection, over a mix of repeated and one-off queries, and
+reports throughput, latency percentiles and the service's cache hit rate
+
+Usage:
+    python3 scripts/load_test_service.py [--url http://127.0.0.1:8765] [--clients 8] [--requests 500]
+    python3 scripts/load_test_service.py --start    # serve in-process on a free port first
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from catalog_service import DEFAULT_HOST, DEFAULT_PORT, CatalogService, start_in_thread
+from catalog_binary import load_packed_catalog
+
+# Queries most requests are drawn from, like the map's common views
+HOT_QUERIES = [
+    '/attractions',
+    '/attractions?category=Parks',
+    '/attractions?category=UNESCO&page=2',
+    '/attractions?country=India&category=DivyaDesam,Temples',
+    '/attractions?bbox=-125,24,-66,50&category=Parks',
+    '/attractions?region=West',
+    '/attractions?q=temple',
+    '/attractions?q=national%20park&country=United%20States',
+    '/attractions?near=36.1,-112.1&radius=200',
+    '/attractions?near=27.7,85.3&radius=100&q=temple',
+]
+# Share of requests taken from HOT_QUERIES; the rest are random viewports
+HOT_SHARE = 0.8
+
+
+def random_query(rng):
+    lat = rng.uniform(-40, 60)
+    lon = rng.uniform(-130, 140)
+    if rng.random() < 0.5:
+        return f"/attractions?bbox={lon:.2f},{lat:.2f},{lon + 20:.2f},{lat + 15:.2f}"
+    return f"/attractions?near={quote(f'{lat:.2f},{lon:.2f}')}&radius={rng.choice([50, 100, 300])}"
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_client(host, port, requests, seed, latencies, errors):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        for _ in range(requests):
+            path = rng.choice(HOT_QUERIES) if rng.random() < HOT_SHARE else random_query(rng)
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(f"{response.status} {path}")
+            except (OSError, http.client.HTTPException) as error:
+                errors.append(f"{type(error).__name__} {path}")
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection.close()
+
+
+def load_test(host, port, clients, requests):
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=run_client, args=(host, port, requests, seed, latencies, errors))
+               for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def fetch_stats(host, port):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request('GET', '/stats')
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the catalog query service')
+    parser.add_argument('--url', default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help='service address')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent keep-alive connections')
+    parser.add_argument('--requests', type=int, default=500, help='requests per client')
+    parser.add_argument('--start', action='store_true', help='start the service in this process on a free port')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Catalog Service Load Test")
+    print("=" * 60)
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    if args.start:
+        server = start_in_thread(CatalogService(load_packed_catalog()), host)
+        port = server.server_port
+        print(f"🌐 Started service on http://{host}:{port}")
+
+    elapsed, latencies, errors = load_test(host, port, args.clients, args.requests)
+    total = len(latencies) + len(errors)
+    print(f"✅ {total} requests over {args.clients} connections in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    if latencies:
+        print(f"   latency ms: p50 {percentile(latencies, 0.5):.2f}, p95 {percentile(latencies, 0.95):.2f}, "
+              f"p99 {percentile(latencies, 0.99):.2f}, max {latencies[-1]:.2f}")
+    cache = fetch_stats(host, port)['cache']
+    lookups = cache['hits'] + cache['misses']
+    print(f"   cache: {cache['hits']} hits / {lookups} lookups, {cache['size']} entries")
+    if errors:
+        print(f"❌ {len(errors)} failed requests, e.g. {errors[0]}")
@@ -0,0 +1,110 @@
+"""
+Static JavaScript/CSS shared by the generated HTML maps
+Sources live in scripts/static/; each build minifies them and writes
+<name>.<content hash>.min.<ext> next to the maps, so browsers cache one copy
+across every map and the file name only changes when the script does
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from build_cache import write_if_changed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_SOURCE_DIR = os.path.join(SCRIPT_DIR, 'static')
+ASSET_DIR_NAME = 'map_assets'
+MANIFEST_NAME = 'manifest.json'
+
+# Load order: stylesheet first, then scripts
+MAP_ASSETS = ['map_popups.css', 'map_regions.js', 'map_popups.js']
+
+FINGERPRINT_LENGTH = 10
+
+
+def _strip_comments(source, line_comments=True):
+    """Drop /* */ (and // when line_comments) comments, leaving string literals untouched"""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        c = source[i]
+        if c in '"\'`':
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif line_comments and source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out)
+
+
+def minify_js(source):
+    """
+    Conservative JavaScript minifier: removes comments, indentation and blank
+    lines but keeps line breaks, so automatic semicolon insertion behaves as in
+    the source. Regex literals are not recognised; the map scripts have none.
+    """
+    lines = (line.strip() for line in _strip_comments(source).splitlines())
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+def minify_css(source):
+    text = ' '.join(_strip_comments(source, line_comments=False).split())
+    for token in '{};,>':
+        text = text.replace(f' {token}', token).replace(f'{token} ', token)
+    # A space before ':' may be a descendant combinator (".a :hover"), so keep it
+    text = text.replace(': ', ':')
+    return text.replace(';}', '}') + '\n'
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def build_assets(output_dir, names=MAP_ASSETS):
+    """
+    Minify and write the assets into output_dir/map_assets and return
+    {source name: path relative to output_dir}. Unchanged assets keep their
+    file (and hash); superseded fingerprints of a rebuilt asset are removed.
+    """
+    asset_dir = os.path.join(output_dir, ASSET_DIR_NAME)
+    os.makedirs(asset_dir, exist_ok=True)
+    assets = {}
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        with open(os.path.join(ASSET_SOURCE_DIR, name), 'r', encoding='utf-8') as f:
+            source = f.read()
+        minified = minify_css(source) if ext == '.css' else minify_js(source)
+        data = minified.encode('utf-8')
+        filename = f"{stem}.{fingerprint(data)}.min{ext}"
+        write_if_changed(os.path.join(asset_dir, filename), data)
+        for stale in glob.glob(os.path.join(asset_dir, f"{stem}.*.min{ext}")):
+            if os.path.basename(stale) != filename:
+                os.remove(stale)
+        assets[name] = f"{ASSET_DIR_NAME}/{filename}"
+
+    manifest = json.dumps(assets, indent=2, sort_keys=True).encode('utf-8')
+    write_if_changed(os.path.join(asset_dir, MANIFEST_NAME), manifest)
+    return assets
+
+
+if __name__ == '__main__':
+    import sys
+
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(SCRIPT_DIR)
+    print("=" * 60)
+    print(f"Building map assets into {os.path.join(output_dir, ASSET_DIR_NAME)}")
+    print("=" * 60)
+    for name, path in build_assets(output_dir).items():
+        size = os.path.getsize(os.path.join(output_dir, path))
+        print(f"✅ {name:<16} -> {path} ({size / 1024:.1f} KB)")
@@ -0,0 +1,221 @@
+"""
+Streaming export for the generated HTML maps
+Writes a folium map section by section instead of rendering the whole page
+into one string: <body> and <script> parts go to temporary files as each
+element renders and are then copied into the output in chunks, optionally
+gzip or brotli compressed on the way. Rendered parts are also not recompiled
+as Jinja templates, which is what folium's own save spends most memory on
+"""
+
+import gzip
+import os
+import tempfile
+
+from branca.element import Element, Figure, MacroElement
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Compression name -> suffix of the compressed copy
+COMPRESSIONS = {'gzip': '.gz', 'br': '.br'}
+CHUNK_SIZE = 1 << 16
+
+# Figure sections that are spooled; the header stays in memory because link
+# tags are deduplicated by name there, and it is small
+SPOOLED_SECTIONS = ['html', 'script']
+
+
+class SpooledSection(Element):
+    """
+    Stand-in for Figure.html / Figure.script. Each child is rendered and
+    written to a temporary file the moment it is added instead of being kept
+    until the page renders, and the section itself renders as a marker that
+    save_map replaces with the file's contents.
+    """
+
+    def __init__(self, name):
+        super().__init__()
+        self.marker = f"\0spooled-{name}\0"
+        self.file = tempfile.TemporaryFile()
+
+    def add_child(self, child, name=None, index=None):
+        child._parent = self
+        self.write(child)
+        return self
+
+    def write(self, child):
+        self.write_text(child.render())
+
+    def write_text(self, text, attributes=None):
+        """
+        Write one child's text. attributes maps placeholders in text to the
+        (possibly large) strings they stand for, which are copied in slices.
+        """
+        self.file.write(b'\n    ')
+        pieces = [text]
+        for placeholder, value in (attributes or {}).items():
+            head, tail = pieces.pop().split(placeholder, 1)
+            pieces += [head, value, tail]
+        for piece in pieces:
+            for start in range(0, len(piece), CHUNK_SIZE):
+                self.file.write(piece[start:start + CHUNK_SIZE].encode('utf-8'))
+
+    def render(self, **kwargs):
+        return self.marker
+
+
+def _element_text(text):
+    """
+    What Element(text).render() returns. Text without template syntax comes
+    back with newlines normalised and one trailing newline dropped, which is
+    worked out here instead of compiling the text as a template.
+    """
+    if '{{' in text or '{%' in text or '{#' in text:
+        return Element(text).render()
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text[:-1] if text.endswith('\n') else text
+
+
+def _render_macro(element, macro, kwargs):
+    """
+    Render a macro with each of the element's streamed_attributes swapped for
+    a placeholder, so the template only ever handles short strings. Returns
+    (text, {placeholder: attribute value}) in the order the placeholders appear.
+    """
+    originals = {attribute: getattr(element, attribute) for attribute in getattr(element, 'streamed_attributes', ())}
+    placeholders = {attribute: f"\0streamed-{attribute}\0" for attribute in originals}
+    try:
+        for attribute, placeholder in placeholders.items():
+            setattr(element, attribute, placeholder)
+        text = _element_text(macro(element, kwargs))
+    finally:
+        for attribute, value in originals.items():
+            setattr(element, attribute, value)
+
+    if any(text.count(placeholder) != 1 for placeholder in placeholders.values()):
+        # A template using an attribute twice (or not at all) is rendered as is
+        return _element_text(macro(element, kwargs)), {}
+    order = sorted(placeholders, key=lambda attribute: text.index(placeholders[attribute]))
+    return text, {placeholders[attribute]: originals[attribute] for attribute in order}
+
+
+def _spooling_render(self, **kwargs):
+    """MacroElement.render, writing html and script macros straight to spooled sections"""
+    figure = self.get_root()
+    assert isinstance(figure, Figure), "You cannot render this Element if it is not in a Figure."
+
+    macros = self._template.module.__dict__
+    header = macros.get('header')
+    if header is not None:
+        figure.header.add_child(Element(header(self, kwargs)), name=self.get_name())
+    for name in SPOOLED_SECTIONS:
+        macro = macros.get(name)
+        if macro is None:
+            continue
+        section = getattr(figure, name)
+        if isinstance(section, SpooledSection):
+            section.write_text(*_render_macro(self, macro, kwargs))
+        else:
+            # An element inside some other figure, e.g. an IFrame popup
+            section.add_child(Element(macro(self, kwargs)), name=self.get_name())
+
+    for element in self._children.values():
+        element.render(**kwargs)
+
+
+class _BrotliWriter:
+    def __init__(self, raw):
+        self.raw = raw
+        self.compressor = brotli.Compressor(quality=11)
+
+    def write(self, data):
+        self.raw.write(self.compressor.process(data))
+
+    def close(self):
+        self.raw.write(self.compressor.finish())
+
+
+class _TeeWriter:
+    """Writes every chunk to the plain file and each compressed copy"""
+
+    def __init__(self, path, compress):
+        self.paths = [path] + [path + COMPRESSIONS[name] for name in compress]
+        self.raw = [open(p + '.tmp', 'wb') for p in self.paths]
+        self.outputs = [self.raw[0]]
+        for name, raw in zip(compress, self.raw[1:]):
+            if name == 'gzip':
+                # Fixed mtime so an unchanged page compresses to identical bytes
+                self.outputs.append(gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0))
+            else:
+                self.outputs.append(_BrotliWriter(raw))
+
+    def write(self, data):
+        for output in self.outputs:
+            output.write(data)
+
+    def close(self, commit=True):
+        for output in self.outputs[1:]:
+            output.close()
+        for raw, path in zip(self.raw, self.paths):
+            raw.close()
+            if commit:
+                os.replace(path + '.tmp', path)
+            else:
+                os.remove(path + '.tmp')
+
+
+def save_map(m, output_path, compress=(), **kwargs):
+    """
+    Write m's page to output_path, the same bytes m.save would write, plus a
+    compressed copy (output_path + .gz / .br) for each name in compress. Only
+    the page header and one element's output are held in memory at a time.
+    Returns the paths written.
+    """
+    unknown = [name for name in compress if name not in COMPRESSIONS]
+    if unknown:
+        raise ValueError(f"unknown compression: {', '.join(unknown)} (expected {', '.join(COMPRESSIONS)})")
+    if 'br' in compress and brotli is None:
+        raise RuntimeError("brotli compression needs the brotli package (pip install brotli)")
+
+    figure = m.get_root()
+    sections = {name: SpooledSection(name) for name in SPOOLED_SECTIONS}
+    originals = {name: getattr(figure, name) for name in SPOOLED_SECTIONS}
+    macro_render = MacroElement.render
+    try:
+        MacroElement.render = _spooling_render
+        for name, section in sections.items():
+            # Children added before saving (legends, asset links) come first, as in Figure.render
+            for child in originals[name]._children.values():
+                section.write(child)
+            section._parent = figure
+            setattr(figure, name, section)
+        # What Figure.render does, with html/script parts landing in the spool files
+        for child in figure._children.values():
+            child.render(**kwargs)
+        page = figure._template.render(this=figure, kwargs=kwargs)
+
+        writer = _TeeWriter(output_path, compress)
+        try:
+            for section in sections.values():
+                before, page = page.split(section.marker, 1)
+                writer.write(before.encode('utf-8'))
+                section.file.seek(0)
+                while True:
+                    chunk = section.file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+            writer.write(page.encode('utf-8'))
+        except BaseException:
+            writer.close(commit=False)
+            raise
+        writer.close()
+        return writer.paths
+    finally:
+        MacroElement.render = macro_render
+        for name, original in originals.items():
+            setattr(figure, name, original)
+        for section in sections.values():
+            section.file.close()
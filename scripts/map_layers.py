@@ -0,0 +1,147 @@
+"""
+Client-side marker layer shared by the generated HTML maps
+Attractions are embedded once as a GeoJSON FeatureCollection plus a compact
+popup table, and markers, tooltips, icons and popups are created in the browser
+"""
+
+import json
+
+from branca.element import MacroElement
+from jinja2 import Template
+
+# Columns of park_table, in row order
+PARK_TABLE_FIELDS = ['designation', 'description', 'url', 'airports', 'nearby_parks', 'nearby_radius']
+
+
+def script_json(value):
+    """Compact JSON for embedding in a <script> block, where only "</" needs escaping"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+class ParkFeatureLayer(MacroElement):
+    """
+    All parks as one GeoJSON FeatureCollection, turned into markers by a single
+    loop in the browser. Produces the same L.marker/AwesomeMarkers icon/tooltip/
+    popup per park as folium.Marker, without folium's per-marker JavaScript.
+
+    Popup fields live in a separate compact table (one row per feature, columns
+    named by PARK_TABLE_FIELDS) and parkPopupHtml renders a park's popup from
+    its row only when the popup is opened. nearby_radius is the radius in miles
+    the row's nearby parks were searched within, which differs by country.
+
+    A feature's color and optional icon properties pick its AwesomeMarkers
+    glyph (default_icon otherwise). location_labels maps a country to the label
+    of its States line, e.g. {'United States': 'State(s)'}; other countries use
+    default_location_label. link_text is the caption of the URL link.
+    """
+    # Long JSON strings written straight to the page by map_export.save_map
+    streamed_attributes = ('table', 'data')
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var parkTable = {{ this.table }};
+        var parkLayerOptions = {{ this.options }};
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, function(c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+            });
+        }
+        function formatCoordinates(latlng) {
+            return Math.abs(latlng.lat).toFixed(4) + '°' + (latlng.lat < 0 ? 'S' : 'N') + ', ' +
+                Math.abs(latlng.lng).toFixed(4) + '°' + (latlng.lng < 0 ? 'W' : 'E');
+        }
+        function parkPopupHtml(p, latlng, row) {
+            var field = {};
+            parkTable.fields.forEach(function(name, i) { field[name] = row[i]; });
+            var html = '<div id="' + p.id + '_popup" class="draggable-popup" style="width: 350px; font-family: Arial, sans-serif; position: relative; background: white; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.3);">' +
+                '<div class="popup-header" style="background-color: #4CAF50; color: white; padding: 8px 12px; border-radius: 5px 5px 0 0; cursor: move; user-select: none;">' +
+                '<h3 style="margin: 0; font-size: 16px; display: inline-block;">' + escapeHtml(p.name) + '</h3>' +
+                '<span class="popup-close-btn" style="float: right; cursor: pointer; font-size: 18px; font-weight: bold; opacity: 0.8; padding: 0 5px;" title="Close">×</span>' +
+                '</div>' +
+                '<div class="popup-content" style="padding: 12px; max-height: 500px; overflow-y: auto;">' +
+                '<p style="margin: 5px 0; font-size: 12px;"><strong>🌍 Country:</strong> ' + escapeHtml(p.country) + '</p>' +
+                '<p style="margin: 5px 0; font-size: 12px;"><strong>📍 ' + (parkLayerOptions.locationLabels[p.country] || parkLayerOptions.defaultLocationLabel) + ':</strong> ' + escapeHtml(p.states) + '</p>' +
+                '<p style="margin: 5px 0; font-size: 12px;"><strong>🏞️ Designation:</strong> ' + escapeHtml(field.designation) + '</p>' +
+                '<p style="margin: 5px 0; font-size: 12px;"><strong>🗺️ Region:</strong> ' + escapeHtml(p.region) + '</p>' +
+                '<p style="margin: 8px 0; font-size: 11px; color: #555; line-height: 1.4;">' + escapeHtml(field.description) + '</p>';
+            if (field.url) {
+                html += '<p style="margin: 8px 0;"><a href="' + escapeHtml(field.url) + '" target="_blank" style="color: #0066cc; text-decoration: none; font-weight: bold;">🌐 ' + parkLayerOptions.linkText + ' →</a></p>';
+            }
+            if (field.airports.length) {
+                html += '<div style="margin: 10px 0 5px 0;"><strong>✈️ Nearby Airports:</strong></div><ul style="margin: 5px 0; padding-left: 20px; font-size: 11px;">';
+                field.airports.forEach(function(a) { html += '<li>' + escapeHtml(a[0]) + ' - ' + escapeHtml(a[1]) + ' (' + a[2].toFixed(1) + ' mi)</li>'; });
+                html += '</ul>';
+            } else {
+                html += '<p style="margin: 10px 0 5px 0; font-size: 11px; color: #666;"><strong>✈️ Nearby Airports:</strong> None within 200 miles</p>';
+            }
+            var radius = +field.nearby_radius.toFixed(1);
+            if (field.nearby_parks.length) {
+                html += '<div style="margin: 10px 0 5px 0;"><strong>🏞️ Nearby Parks (within ' + radius + ' mi):</strong></div><ul style="margin: 5px 0; padding-left: 20px; font-size: 11px;">';
+                field.nearby_parks.forEach(function(n) { html += '<li>' + escapeHtml(n[0]) + ' (' + n[1].toFixed(1) + ' mi)</li>'; });
+                html += '</ul>';
+            } else {
+                html += '<p style="margin: 10px 0 5px 0; font-size: 11px; color: #666;"><strong>🏞️ Nearby Parks:</strong> None within ' + radius + ' miles</p>';
+            }
+            return html + '<p style="margin: 5px 0; font-size: 10px; color: #888;">Coordinates: ' + formatCoordinates(latlng) + '</p>' +
+                '</div></div>';
+        }
+        (function() {
+            var groups = {
+                {%- for region, group in this.groups.items() %}
+                {{ region|tojson }}: {{ group.get_name() }}{{ "," if not loop.last }}
+                {%- endfor %}
+            };
+            var icons = {};
+            var parks = {{ this.data }};
+            // Park data with nearby park names for the click highlighting
+            window.parkData = parks.features.map(function(feature, i) {
+                var nearby = parkTable.rows[i][parkTable.fields.indexOf('nearby_parks')];
+                return {
+                    id: feature.properties.id,
+                    name: feature.properties.name,
+                    lat: feature.geometry.coordinates[1],
+                    lon: feature.geometry.coordinates[0],
+                    nearby_parks: nearby.map(function(n) { return {name: n[0], distance: n[1]}; })
+                };
+            });
+            parks.features.forEach(function(feature, i) {
+                var p = feature.properties;
+                var glyph = p.icon || parkLayerOptions.defaultIcon;
+                var iconKey = p.color + '/' + glyph;
+                if (!icons[iconKey]) {
+                    icons[iconKey] = L.AwesomeMarkers.icon({
+                        markerColor: p.color, iconColor: 'white', icon: glyph,
+                        prefix: 'glyphicon', extraClasses: 'fa-rotate-0', iconSize: [20, 30]
+                    });
+                }
+                var marker = L.marker([feature.geometry.coordinates[1], feature.geometry.coordinates[0]], {icon: icons[iconKey]});
+                marker.bindTooltip(
+                    '<div style="font-size: 12px; font-weight: bold;"><b>' + escapeHtml(p.name) + '</b><br>' + escapeHtml(p.country) +
+                    '<br>' + escapeHtml(p.states) + '<br>Region: ' + escapeHtml(p.region) + '</div>',
+                    {permanent: false, sticky: true}
+                );
+                // Leaflet calls the function each time the popup opens, so no popup HTML exists until then
+                marker.bindPopup(function(layer) {
+                    return parkPopupHtml(p, layer.getLatLng(), parkTable.rows[i]);
+                }, {maxWidth: 380, closeOnClick: false});
+                if (groups[p.region]) {
+                    marker.addTo(groups[p.region]);
+                }
+            });
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, features, table, groups, default_icon='tree-conifer', location_labels=None,
+                 default_location_label='Province(s)', link_text='Visit NPS Website'):
+        super().__init__()
+        self._name = 'ParkFeatureLayer'
+        self.data = script_json({'type': 'FeatureCollection', 'features': features})
+        self.table = script_json({'fields': PARK_TABLE_FIELDS, 'rows': table})
+        self.options = script_json({
+            'defaultIcon': default_icon,
+            'locationLabels': {'United States': 'State(s)'} if location_labels is None else location_labels,
+            'defaultLocationLabel': default_location_label,
+            'linkText': link_text,
+        })
+        self.groups = groups
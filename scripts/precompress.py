@@ -0,0 +1,150 @@
+"""
+Precompressed copies of the served data files and generated maps
+Writes <file>.gz (and <file>.br when the brotli package is installed) at
+maximum compression next to every public/data file and generated map page,
+in a process pool, skipping files whose contents have not changed
+
+Usage:
+    python3 scripts/precompress.py [file or glob ...] [--workers N] [--force]
+"""
+
+import argparse
+import glob
+import gzip
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import PROJECT_ROOT, BuildCache, write_if_changed
+
+# Optional: without it only .gz copies are written, with a warning
+try:
+    import brotli
+except ImportError:
+    brotli = None
+BROTLI_MISSING = "brotli package not installed, writing .gz only (pip install brotli)"
+
+# Relative to the project root
+PRECOMPRESS_PATTERNS = [
+    'public/data/*.csv',
+    'public/data/*.json',
+    'US_National_Parks_Interactive_Map.html',
+    'map_assets/*.min.*',
+    'build/maps/*.html',
+    'build/maps/map_assets/*.min.*',
+]
+COMPRESSED_SUFFIXES = ['.gz', '.br']
+
+
+def available_formats():
+    return ['.gz', '.br'] if brotli is not None else ['.gz']
+
+
+def compress(data, suffix):
+    if suffix == '.gz':
+        # Fixed mtime so the same input always gives the same bytes
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def compress_file(path, formats):
+    """
+    Write path + suffix for each format, or remove it when compressing does
+    not make the file smaller. Returns (original size, {suffix: size or None})
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {}
+    for suffix in formats:
+        compressed = compress(data, suffix)
+        if len(compressed) < len(data):
+            write_if_changed(path + suffix, compressed)
+            sizes[suffix] = len(compressed)
+        else:
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+            sizes[suffix] = None
+    return len(data), sizes
+
+
+def find_files(patterns=PRECOMPRESS_PATTERNS, root=PROJECT_ROOT):
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern)):
+            if os.path.isfile(path) and not path.endswith(tuple(COMPRESSED_SUFFIXES)):
+                files.add(os.path.normpath(path))
+    return sorted(files)
+
+
+def remove_orphans(patterns=PRECOMPRESS_PATTERNS, root=PROJECT_ROOT):
+    """Delete .gz/.br copies whose source file is gone. Returns the paths removed"""
+    removed = []
+    for pattern in patterns:
+        for suffix in COMPRESSED_SUFFIXES:
+            for path in glob.glob(os.path.join(root, pattern + suffix)):
+                if not os.path.exists(path[:-len(suffix)]):
+                    os.remove(path)
+                    removed.append(path)
+    return removed
+
+
+def precompress(files, cache=None, workers=None, force=False):
+    """
+    Compress every stale file in a process pool. A file is stale when its
+    contents, the formats or one of its compressed copies changed since the
+    last run recorded in cache. Returns ({path: (size, {suffix: size})}, skipped paths)
+    """
+    cache = cache or BuildCache()
+    formats = available_formats()
+    steps = {path: f"precompress:{os.path.relpath(path, cache.root)}" for path in files}
+    keys = {path: cache.key('precompress', formats, files=[path]) for path in files}
+    stale = [path for path in files if force or not cache.is_fresh(steps[path], keys[path])]
+
+    results = {}
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, result in zip(stale, pool.map(compress_file, stale, [formats] * len(stale))):
+                results[path] = result
+                outputs = [path + suffix for suffix, size in result[1].items() if size is not None]
+                cache.record(steps[path], keys[path], outputs)
+    return results, [path for path in files if path not in results]
+
+
+def describe(path, size, sizes, root=PROJECT_ROOT):
+    parts = [f"{suffix} {compressed / 1024:.1f} KB (-{size - compressed:,} B)"
+             for suffix, compressed in sizes.items() if compressed is not None]
+    return f"{os.path.relpath(path, root)}: {size / 1024:.1f} KB -> {', '.join(parts) or 'not smaller, skipped'}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write .gz/.br copies of the data files and generated maps')
+    parser.add_argument('patterns', nargs='*', help='files or globs relative to the project root '
+                                                    '(default: data files, asset files and map pages)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='recompress files even if they are unchanged')
+    args = parser.parse_args()
+
+    patterns = args.patterns or PRECOMPRESS_PATTERNS
+    files = find_files(patterns)
+    print("=" * 60)
+    print(f"Precompressing {len(files)} files ({', '.join(available_formats())})")
+    print("=" * 60)
+    if brotli is None:
+        print(f"⚠️  {BROTLI_MISSING}")
+
+    start = time.perf_counter()
+    cache = BuildCache()
+    results, skipped = precompress(files, cache, args.workers, args.force)
+    removed = remove_orphans(patterns)
+    cache.save()
+
+    saved = 0
+    for path, (size, sizes) in results.items():
+        print(f"✅ {describe(path, size, sizes)}")
+        best = min((s for s in sizes.values() if s is not None), default=size)
+        saved += size - best
+    print(f"\n✅ {len(results)} compressed in {time.perf_counter() - start:.2f}s, saving {saved / 1024:.1f} KB")
+    if skipped:
+        print(f"⏭️  {len(skipped)} unchanged")
+    if removed:
+        print(f"🗑️  Removed {len(removed)} orphaned copies")
@@ -0,0 +1,452 @@
+"""
+Run every scripts/download_*.py generator in one pass
+Imports each get_* function and runs them in a process pool, starting a
+generator as soon as the datasets it depends on are ready, then writes the
+CSV outputs the individual scripts would have written. A build cache skips
+generators and downstream steps (nearby index, packed catalog, map) whose
+sources and inputs are unchanged, and outputs are only replaced when their
+bytes differ
+"""
+
+import argparse
+import csv
+import glob
+import importlib
+import os
+import subprocess
+import sys
+import time
+import types
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from build_cache import BuildCache, replace_if_changed
+from precompress import BROTLI_MISSING, brotli, find_files, precompress, remove_orphans
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# One generator script.
+#   name        short name used on the command line and for dependencies
+#   module      script module in scripts/
+#   getter      function returning the list of row dicts
+#   saver       module function save(rows, path), or None to write every key of the first row
+#   outputs     paths relative to the project root
+#   depends_on  generators whose rows must exist before this one starts
+#   arguments   optional function results -> keyword arguments for getter
+#   keep        optional function rows -> reason to leave the existing outputs alone, or None
+Generator = namedtuple('Generator', 'name module getter saver outputs depends_on arguments keep')
+
+
+def other_temples_arguments(results):
+    """Deduplicate other temples against the generated Jyotirlinga and Shakti Peetha lists"""
+    names = [row['Name'] for dependency in ('jyotirlinga_temples', 'shakti_peethas') for row in results[dependency]]
+    return {'existing_names': names}
+
+
+def without_coordinates(rows):
+    """The NPS script's built-in fallback list has no coordinates or descriptions; never write it over the curated CSV"""
+    if any(not row.get('Latitude') or not row.get('Longitude') for row in rows):
+        return 'NPS API unavailable, fallback list has no coordinates'
+    return None
+
+
+def generator(name, module, getter, saver, outputs, depends_on=(), arguments=None, keep=None):
+    return Generator(name, module, getter, saver, tuple(outputs), tuple(depends_on), arguments, keep)
+
+
+# Same order as the old npm download-data chain
+GENERATORS = [
+    generator('national_parks', 'download_national_parks', 'get_national_parks_data', None,
+              ['public/data/US_National_Parks.csv'], keep=without_coordinates),
+    generator('canadian_parks', 'download_canadian_parks', 'get_canadian_parks_data', None,
+              ['public/data/Canadian_National_Parks.csv']),
+    generator('indian_parks', 'download_indian_parks', 'get_indian_parks_data', 'save_to_csv',
+              ['data/Indian_National_Parks.csv', 'public/data/Indian_National_Parks.csv']),
+    generator('india_unesco', 'download_india_unesco', 'get_india_unesco_sites', 'save_unesco_csv',
+              ['public/data/India_UNESCO_Sites.csv']),
+    generator('jyotirlinga_temples', 'download_jyotirlinga_temples', 'get_jyotirlinga_temples', 'save_jyotirlinga_csv',
+              ['public/data/India_Jyotirlinga_Temples.csv']),
+    generator('shakti_peethas', 'download_shakti_peethas', 'get_shakti_peethas', 'save_shakti_peethas_csv',
+              ['public/data/India_Shakti_Peethas.csv']),
+    generator('india_other_temples', 'download_india_other_temples', 'get_india_other_temples', 'save_india_other_temples_csv',
+              ['public/data/India_Other_Temples.csv'],
+              depends_on=['jyotirlinga_temples', 'shakti_peethas'], arguments=other_temples_arguments),
+    generator('india_mutts', 'download_india_mutts', 'get_india_mutts', 'save_india_mutts_csv',
+              ['public/data/India_Mutts.csv']),
+    generator('divya_desams', 'download_divya_desams', 'get_divya_desams', 'save_divya_desams_csv',
+              ['public/data/India_Divya_Desams.csv']),
+    generator('india_forts', 'download_india_forts', 'get_india_forts', 'save_india_forts_csv',
+              ['public/data/India_Forts.csv']),
+    generator('nepal_parks', 'download_nepal_parks', 'get_nepal_parks', 'save_nepal_csv',
+              ['public/data/Nepal_National_Parks.csv']),
+    generator('nepal_temples', 'download_nepal_temples', 'get_nepal_temples', 'save_nepal_temples_csv',
+              ['public/data/Nepal_Temples.csv']),
+    generator('nepal_unesco', 'download_nepal_unesco', 'get_nepal_unesco_sites', 'save_nepal_unesco_csv',
+              ['public/data/Nepal_UNESCO_Sites.csv']),
+    generator('nepal_trekking_flights', 'download_nepal_trekking_flights', 'get_nepal_trekking_flights', 'save_nepal_trekking_flights_csv',
+              ['public/data/Nepal_Trekking_Flights.csv']),
+    generator('sri_lanka_parks', 'download_sri_lanka_parks', 'get_sri_lanka_parks', 'save_sri_lanka_csv',
+              ['public/data/Sri_Lanka_National_Parks.csv']),
+    generator('sri_lanka_temples', 'download_sri_lanka_temples', 'get_sri_lanka_temples', 'save_sri_lanka_temples_csv',
+              ['public/data/Sri_Lanka_Temples.csv']),
+    generator('sri_lanka_unesco', 'download_sri_lanka_unesco', 'get_sri_lanka_unesco_sites', 'save_sri_lanka_unesco_csv',
+              ['public/data/Sri_Lanka_UNESCO_Sites.csv']),
+    generator('costa_rica_parks', 'download_costa_rica_parks', 'get_costa_rica_parks_data', 'save_to_csv',
+              ['data/Costa_Rica_National_Parks.csv', 'public/data/Costa_Rica_National_Parks.csv']),
+    generator('african_parks', 'download_african_parks', 'get_african_parks_data', 'save_to_csv',
+              ['public/data/African_National_Parks.csv', 'data/African_National_Parks.csv']),
+    generator('china_unesco', 'download_china_unesco', 'get_china_unesco_sites', 'save_china_unesco_csv',
+              ['public/data/China_UNESCO_Sites.csv']),
+    generator('japan_unesco', 'download_japan_unesco', 'get_japan_unesco_sites', 'save_japan_unesco_csv',
+              ['public/data/Japan_UNESCO_Sites.csv']),
+    generator('thailand_unesco', 'download_thailand_unesco', 'get_thailand_unesco_sites', 'save_thailand_unesco_csv',
+              ['public/data/Thailand_UNESCO_Sites.csv']),
+    generator('indonesia_unesco', 'download_indonesia_unesco', 'get_indonesia_unesco_sites', 'save_indonesia_unesco_csv',
+              ['public/data/Indonesia_UNESCO_Sites.csv']),
+    generator('vietnam_unesco', 'download_vietnam_unesco', 'get_vietnam_unesco_sites', 'save_vietnam_unesco_csv',
+              ['public/data/Vietnam_UNESCO_Sites.csv']),
+    generator('cambodia_unesco', 'download_cambodia_unesco', 'get_cambodia_unesco_sites', 'save_cambodia_unesco_csv',
+              ['public/data/Cambodia_UNESCO_Sites.csv']),
+    generator('myanmar_unesco', 'download_myanmar_unesco', 'get_myanmar_unesco_sites', 'save_myanmar_unesco_csv',
+              ['public/data/Myanmar_UNESCO_Sites.csv']),
+    generator('bangladesh_unesco', 'download_bangladesh_unesco', 'get_bangladesh_unesco_sites', 'save_bangladesh_unesco_csv',
+              ['public/data/Bangladesh_UNESCO_Sites.csv']),
+    generator('pakistan_unesco', 'download_pakistan_unesco', 'get_pakistan_unesco_sites', 'save_pakistan_unesco_csv',
+              ['public/data/Pakistan_UNESCO_Sites.csv']),
+    generator('airports', 'download_airports', 'get_major_airports', 'save_airports_csv',
+              ['public/data/Major_Airports.csv']),
+]
+
+GENERATORS_BY_NAME = {g.name: g for g in GENERATORS}
+
+# Steps run after the generators, each skipped while its inputs are unchanged.
+#   script     script in scripts/ run with the current interpreter
+#   inputs     glob patterns relative to the project root
+#   outputs    files the step writes, relative to the project root
+#   arguments  command-line arguments for the script
+Step = namedtuple('Step', 'name script inputs outputs arguments', defaults=((),))
+
+CATALOG_INPUTS = ['public/data/*.csv', 'scripts/catalog.py', 'scripts/catalog_binary.py']
+# Natural Earth country polygons for the reverse geocoder
+COUNTRY_BOUNDARIES = 'data/boundaries/ne_110m_countries.geojson'
+
+DOWNSTREAM_STEPS = [
+    Step('nearby_index', 'build_nearby_index.py',
+         CATALOG_INPUTS + ['scripts/build_nearby_index.py', 'scripts/build_cache.py', 'scripts/spatial_index.py', 'scripts/geo_distance.py'],
+         ['public/data/nearby_index.json']),
+    Step('vector_tiles', 'build_vector_tiles.py',
+         CATALOG_INPUTS + ['scripts/build_vector_tiles.py', 'scripts/build_cache.py'],
+         ['public/tiles/metadata.json']),
+    Step('clusters', 'build_clusters.py',
+         CATALOG_INPUTS + ['scripts/build_clusters.py', 'scripts/build_vector_tiles.py', 'scripts/build_cache.py'],
+         ['public/data/clusters.json']),
+    Step('world_catalog', 'build_world_catalog.py',
+         CATALOG_INPUTS + ['scripts/build_world_catalog.py', 'scripts/build_cache.py'],
+         ['public/data/world_catalog.json']),
+    Step('search_index', 'build_search_index.py',
+         CATALOG_INPUTS + ['scripts/build_search_index.py', 'scripts/build_world_catalog.py', 'scripts/build_cache.py'],
+         ['public/data/search_index.json']),
+    Step('autocomplete', 'build_autocomplete.py',
+         CATALOG_INPUTS + ['scripts/build_autocomplete.py', 'scripts/build_search_index.py',
+                           'scripts/build_world_catalog.py', 'scripts/build_cache.py'],
+         ['public/data/autocomplete.json']),
+    Step('reverse_geocoder', 'build_reverse_geocoder.py',
+         CATALOG_INPUTS + ['scripts/build_reverse_geocoder.py', 'scripts/geo_distance.py', 'scripts/build_cache.py',
+                           COUNTRY_BOUNDARIES],
+         ['public/data/reverse_geocode.json'],
+         ['--countries', COUNTRY_BOUNDARIES]),
+    Step('packed_catalog', 'catalog_binary.py',
+         CATALOG_INPUTS,
+         ['build/catalog.bin']),
+    Step('map', 'map_national_parks.py',
+         CATALOG_INPUTS + ['scripts/map_national_parks.py', 'scripts/spatial_index.py', 'scripts/geo_distance.py', 'scripts/map_layers.py',
+                          'scripts/heat_grid.py', 'scripts/map_export.py', 'scripts/map_assets.py', 'scripts/static/*'],
+         ['US_National_Parks_Interactive_Map.html', 'map_assets/manifest.json']),
+]
+
+RunReport = namedtuple('RunReport', 'results timings written kept skipped failures')
+
+
+def write_rows(rows, path):
+    """Write rows with the first row's keys as the header, as the NPS and Canadian scripts do"""
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_generator(generator, kwargs, project_root):
+    """
+    Worker: build one dataset and write any outputs that changed. Returns
+    (rows, seconds, written paths, reason the outputs were kept or None)
+    """
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    start = time.perf_counter()
+    module = importlib.import_module(generator.module)
+    rows = getattr(module, generator.getter)(**kwargs)
+    if not rows:
+        raise RuntimeError(f"{generator.getter} returned no rows")
+    kept = generator.keep(rows) if generator.keep else None
+    if kept:
+        return rows, time.perf_counter() - start, [], kept
+
+    save = getattr(module, generator.saver) if generator.saver else write_rows
+    written = []
+    for output in generator.outputs:
+        path = os.path.join(project_root, output)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Savers write whole files, so save next to the output and keep the old file when identical
+        save(rows, path + '.tmp')
+        if replace_if_changed(path + '.tmp', path):
+            written.append(output)
+    return rows, time.perf_counter() - start, written, None
+
+
+def with_dependencies(names):
+    """Selected generators plus everything they depend on, in GENERATORS order"""
+    unknown = [name for name in names if name not in GENERATORS_BY_NAME]
+    if unknown:
+        raise ValueError(f"Unknown generator(s): {', '.join(unknown)}")
+    wanted = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(GENERATORS_BY_NAME[name].depends_on)
+    return [g for g in GENERATORS if g.name in wanted]
+
+
+def is_local(module):
+    path = getattr(module, '__file__', None)
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == SCRIPT_DIR
+
+
+def local_modules(module_name):
+    """
+    Modules a generator runs: its script and the scripts/ modules it
+    imports, directly or through them (http_fetch, wiki_coordinates, ...),
+    found in sys.modules after importing it
+    """
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    found = []
+    stack = [importlib.import_module(module_name)]
+    while stack:
+        module = stack.pop()
+        if module in found:
+            continue
+        found.append(module)
+        for value in vars(module).values():
+            # "import x" binds the module, "from x import name" binds objects defined in x
+            name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, '__module__', None)
+            dependency = sys.modules.get(name) if isinstance(name, str) else None
+            if dependency is not None and is_local(dependency):
+                stack.append(dependency)
+    return found
+
+
+def local_sources(module_name):
+    """Source files of local_modules(module_name)"""
+    return sorted(os.path.abspath(module.__file__) for module in local_modules(module_name))
+
+
+def fetching_generators(generators):
+    """
+    Names of the generators that download (their script or a local import
+    uses requests, as http_fetch does) or depend on one that does. Their
+    sources say nothing about the remote data, so they always run; the
+    HTTP cache revalidates cheaply and unchanged outputs are left alone
+    """
+    fetching = {}
+
+    def fetches(g):
+        if g.name not in fetching:
+            fetching[g.name] = any(
+                isinstance(value, types.ModuleType) and value.__name__ == 'requests'
+                for module in local_modules(g.module) for value in vars(module).values()
+            ) or any(fetches(GENERATORS_BY_NAME[d]) for d in g.depends_on)
+        return fetching[g.name]
+
+    return {g.name for g in generators if fetches(g)}
+
+
+def generator_keys(generators, cache):
+    """Cache key per generator: its script and local imports, its table entry and its dependencies' keys"""
+    keys = {}
+
+    def key_of(g):
+        if g.name not in keys:
+            keys[g.name] = cache.key(
+                'generator', g.name, g.module, g.getter, g.saver, g.outputs,
+                [key_of(GENERATORS_BY_NAME[d]) for d in g.depends_on],
+                files=local_sources(g.module),
+            )
+        return keys[g.name]
+
+    for g in generators:
+        key_of(g)
+    return keys
+
+
+def run_generators(generators=GENERATORS, project_root=PROJECT_ROOT, workers=None, cache=None, force=False):
+    """
+    Run generators in a process pool, each one starting once its
+    dependencies have finished. With a cache, generators whose key and
+    outputs are unchanged are skipped unless a stale generator needs their
+    rows; generators that download always run. Returns a RunReport of rows, seconds and written outputs per
+    generator that ran, why outputs were kept (left as they were, and
+    retried on the next run), the skipped names and error messages per failure.
+    """
+    pending = {g.name: g for g in generators}
+    missing = {d for g in generators for d in g.depends_on if d not in pending}
+    if missing:
+        raise ValueError(f"Missing dependencies: {', '.join(sorted(missing))}")
+
+    keys = generator_keys(generators, cache) if cache is not None else {}
+    if cache is not None and not force:
+        fetching = fetching_generators(pending.values())
+        stale = {name for name in pending if name in fetching or not cache.is_fresh(name, keys[name])}
+        # A stale generator needs its dependencies' rows, so those run too
+        stack = list(stale)
+        while stack:
+            for dependency in pending[stack.pop()].depends_on:
+                if dependency not in stale:
+                    stale.add(dependency)
+                    stack.append(dependency)
+        skipped = [name for name in pending if name not in stale]
+        pending = {name: g for name, g in pending.items() if name in stale}
+    else:
+        skipped = []
+
+    results, timings, written, kept, failures = {}, {}, {}, {}, {}
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name, g in list(pending.items()):
+                failed = [d for d in g.depends_on if d in failures]
+                if failed:
+                    failures[name] = f"dependency {failed[0]} failed"
+                    del pending[name]
+                elif all(d in results for d in g.depends_on):
+                    kwargs = g.arguments(results) if g.arguments else {}
+                    running[pool.submit(run_generator, g, kwargs, project_root)] = name
+                    del pending[name]
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between: {', '.join(sorted(pending))}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], timings[name], written[name], reason = future.result()
+                    if reason:
+                        kept[name] = reason
+                except Exception as e:
+                    failures[name] = str(e) or type(e).__name__
+                if cache is not None:
+                    if name in results and name not in kept:
+                        cache.record(name, keys[name], [os.path.join(project_root, o) for o in GENERATORS_BY_NAME[name].outputs])
+                    else:
+                        cache.forget(name)
+    return RunReport(results, timings, written, kept, skipped, failures)
+
+
+def step_key(step, cache):
+    files = sorted({path for pattern in step.inputs for path in glob.glob(os.path.join(PROJECT_ROOT, pattern))})
+    return cache.key('step', step.name, step.script, step.outputs, step.arguments, files=files)
+
+
+def run_downstream_steps(cache, steps=DOWNSTREAM_STEPS, force=False):
+    """Run every stale step as its own process. Returns (ran, skipped, failures)"""
+    keys = {step.name: step_key(step, cache) for step in steps}
+    stale = [step for step in steps if force or not cache.is_fresh(step.name, keys[step.name])]
+    processes = [
+        (step, subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, step.script), *step.arguments], cwd=PROJECT_ROOT,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True))
+        for step in stale
+    ]
+    ran, failures = [], {}
+    for step, process in processes:
+        output, _ = process.communicate()
+        if process.returncode == 0:
+            ran.append(step.name)
+            cache.record(step.name, keys[step.name], [os.path.join(PROJECT_ROOT, o) for o in step.outputs])
+        else:
+            failures[step.name] = (output.strip().splitlines() or [f"exit code {process.returncode}"])[-1]
+            cache.forget(step.name)
+    skipped = [step.name for step in steps if step not in stale]
+    return ran, skipped, failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Regenerate the public/data CSVs in parallel')
+    parser.add_argument('names', nargs='*', help='generators to run (default: all), dependencies are added automatically')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='ignore the build cache and rerun everything')
+    parser.add_argument('--offline', action='store_true', help='scrapers use only the on-disk HTTP cache')
+    parser.add_argument('--no-downstream', action='store_true', help='skip the nearby index, packed catalog and map steps')
+    parser.add_argument('--no-precompress', action='store_true', help='skip writing .gz/.br copies of the outputs')
+    parser.add_argument('--list', action='store_true', help='list generator names and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for g in GENERATORS:
+            after = f" (after {', '.join(g.depends_on)})" if g.depends_on else ''
+            print(f"{g.name}{after}")
+        sys.exit(0)
+
+    selected = with_dependencies(args.names) if args.names else GENERATORS
+    if args.offline:
+        # Inherited by the worker processes, see http_fetch.offline_from_environment
+        os.environ['HTTP_OFFLINE'] = '1'
+
+    print("=" * 60)
+    print(f"Running {len(selected)} generators")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    cache = BuildCache()
+    report = run_generators(selected, workers=args.workers, cache=cache, force=args.force)
+    cache.save()
+
+    print("\n" + "=" * 60)
+    for g in selected:
+        if g.name in report.kept:
+            print(f"⏭️  {g.name}: {report.kept[g.name]}, kept {', '.join(g.outputs)}")
+        elif g.name in report.results:
+            changed = ', '.join(report.written[g.name]) or 'unchanged'
+            print(f"✅ {g.name}: {len(report.results[g.name])} rows in {report.timings[g.name]:.2f}s -> {changed}")
+        elif g.name in report.failures:
+            print(f"❌ {g.name}: {report.failures[g.name]}")
+    if report.skipped:
+        print(f"⏭️  {len(report.skipped)} generators up to date")
+
+    failures = dict(report.failures)
+    if not args.no_downstream:
+        ran, skipped, step_failures = run_downstream_steps(cache, force=args.force)
+        cache.save()
+        failures.update(step_failures)
+        for name in ran:
+            print(f"✅ {name}: rebuilt")
+        for name, message in step_failures.items():
+            print(f"❌ {name}: {message}")
+        if skipped:
+            print(f"⏭️  Up to date: {', '.join(skipped)}")
+
+    if not args.no_precompress:
+        if brotli is None:
+            print(f"⚠️  {BROTLI_MISSING}")
+        compressed, unchanged = precompress(find_files(), cache, workers=args.workers, force=args.force)
+        remove_orphans()
+        cache.save()
+        saved = sum(size - min((s for s in sizes.values() if s is not None), default=size)
+                    for size, sizes in compressed.values())
+        print(f"✅ precompress: {len(compressed)} files compressed ({saved / 1024:.1f} KB saved), {len(unchanged)} unchanged")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nFinished in {elapsed:.2f}s (sum of generator times {sum(report.timings.values()):.2f}s)")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,258 @@
+"""
+Spatial index for attraction and airport coordinates
+Ball tree over unit-sphere vectors answering "k nearest within R miles"
+queries with exact great-circle distances
+"""
+
+import heapq
+import math
+import os
+import zipfile
+
+import numpy as np
+
+from catalog import BUILD_DIR, load_airports
+from catalog_binary import load_packed_catalog
+from geo_distance import EARTH_RADIUS_MILES, haversine_matrix
+
+DEFAULT_LEAF_SIZE = 16
+
+# Saved trees over every mapped attraction and airport, in catalog order
+ATTRACTIONS_INDEX_PATH = os.path.join(BUILD_DIR, 'attractions_index.npz')
+AIRPORTS_INDEX_PATH = os.path.join(BUILD_DIR, 'airports_index.npz')
+
+# Slack subtracted from node lower bounds so floating point noise between the
+# chord bound and the Haversine distance never prunes a point on the boundary
+BOUND_SLACK_MILES = 1e-6
+
+
+def to_unit_vectors(lat, lon):
+    """Convert lat/lon in degrees to 3D unit vectors"""
+    lat_rad = np.radians(np.asarray(lat, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat_rad)
+    return np.stack([cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)], axis=-1)
+
+
+def chord_to_miles(chord):
+    """Convert a straight-line distance between unit vectors to great-circle miles"""
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+class SphereBallTree:
+    """
+    Ball tree over points on the sphere.
+
+    Nodes bound their points with a 3D ball around unit vectors. Because chord
+    length grows monotonically with great-circle distance, the ball gives a
+    lower bound on the distance in miles, and candidate points are then
+    checked with the same Haversine formula the map builder uses.
+    """
+
+    def __init__(self, lat, lon, ids=None, leaf_size=DEFAULT_LEAF_SIZE):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.ids = np.asarray(ids if ids is not None else np.arange(len(self.lat)).astype(str))
+        self.leaf_size = leaf_size
+        if len(self.lat):
+            self._build()
+        else:
+            self.order = np.zeros(0, dtype=np.int64)
+            self.node_start = self.node_end = self.node_left = self.node_right = np.zeros(0, dtype=np.int64)
+            self.node_center = np.zeros((0, 3))
+            self.node_radius = np.zeros(0)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _build(self):
+        points = to_unit_vectors(self.lat, self.lon)
+        order = np.arange(len(points))
+        starts, ends, lefts, rights, centers, radii = [], [], [], [], [], []
+
+        def add_node(start, end):
+            node = len(starts)
+            subset = points[order[start:end]]
+            center = subset.mean(axis=0)
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            centers.append(center)
+            radii.append(float(np.sqrt(((subset - center) ** 2).sum(axis=1)).max()))
+            return node
+
+        stack = [add_node(0, len(points))]
+        while stack:
+            node = stack.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= self.leaf_size:
+                continue
+            # Split at the median along the axis with the largest spread
+            subset = points[order[start:end]]
+            axis = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+            mid = (end - start) // 2
+            split = np.argpartition(subset[:, axis], mid)
+            order[start:end] = order[start:end][split]
+            lefts[node] = add_node(start, start + mid)
+            rights[node] = add_node(start + mid, end)
+            stack.extend([lefts[node], rights[node]])
+
+        self.order = order
+        self.node_start = np.array(starts, dtype=np.int64)
+        self.node_end = np.array(ends, dtype=np.int64)
+        self.node_left = np.array(lefts, dtype=np.int64)
+        self.node_right = np.array(rights, dtype=np.int64)
+        self.node_center = np.array(centers)
+        self.node_radius = np.array(radii)
+
+    def _lower_bound(self, node, vector):
+        """Smallest possible distance in miles from vector to any point in node"""
+        gap = np.sqrt(((self.node_center[node] - vector) ** 2).sum()) - self.node_radius[node]
+        return float(chord_to_miles(max(gap, 0.0))) - BOUND_SLACK_MILES
+
+    def query(self, lat, lon, k=5, radius=math.inf, exclude=None):
+        """
+        Return up to k (index, distance) pairs within radius miles, closest
+        first. Ties are ordered by index, matching a stable sort over a
+        linear scan. exclude is an optional callable index -> bool.
+        """
+        if not len(self.lat) or k <= 0:
+            return []
+        vector = to_unit_vectors(lat, lon)
+        best = []  # max-heap of (-distance, -index)
+        frontier = [(self._lower_bound(0, vector), 0)]
+
+        def bound():
+            return -best[0][0] if len(best) == k else radius
+
+        while frontier:
+            lower, node = heapq.heappop(frontier)
+            if lower > bound():
+                break
+            if self.node_left[node] == -1:
+                indices = self.order[self.node_start[node]:self.node_end[node]]
+                distances = haversine_matrix([lat], [lon], self.lat[indices], self.lon[indices])[0]
+                for index, distance in zip(indices.tolist(), distances.tolist()):
+                    if distance > radius or (exclude is not None and exclude(index)):
+                        continue
+                    item = (-distance, -index)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+            else:
+                for child in (self.node_left[node], self.node_right[node]):
+                    child_lower = self._lower_bound(child, vector)
+                    if child_lower <= bound():
+                        heapq.heappush(frontier, (child_lower, int(child)))
+
+        return sorted(((-index, -distance) for distance, index in best), key=lambda x: (x[1], x[0]))
+
+    def query_radius(self, lat, lon, radius):
+        """Return every (index, distance) pair within radius miles, closest first"""
+        if not len(self.lat):
+            return []
+        vector = to_unit_vectors(lat, lon)
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._lower_bound(node, vector) > radius:
+                continue
+            if self.node_left[node] == -1:
+                indices = self.order[self.node_start[node]:self.node_end[node]]
+                distances = haversine_matrix([lat], [lon], self.lat[indices], self.lon[indices])[0]
+                found.extend((index, distance) for index, distance in zip(indices.tolist(), distances.tolist()) if distance <= radius)
+            else:
+                stack.extend([int(self.node_left[node]), int(self.node_right[node])])
+        return sorted(found, key=lambda x: (x[1], x[0]))
+
+    def save(self, path):
+        """Write the tree to an .npz file so other tools can load it without rebuilding"""
+        # Written next to the target under a per-process name and renamed, so a
+        # concurrent load never sees half a file and concurrent saves never share one
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez(
+                f,
+                lat=self.lat, lon=self.lon, ids=self.ids.astype(str),
+                leaf_size=np.array(self.leaf_size),
+                order=self.order,
+                node_start=self.node_start, node_end=self.node_end,
+                node_left=self.node_left, node_right=self.node_right,
+                node_center=self.node_center, node_radius=self.node_radius,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a tree written by save()"""
+        with np.load(path) as data:
+            tree = cls.__new__(cls)
+            tree.lat = data['lat']
+            tree.lon = data['lon']
+            tree.ids = data['ids']
+            tree.leaf_size = int(data['leaf_size'])
+            tree.order = data['order']
+            tree.node_start = data['node_start']
+            tree.node_end = data['node_end']
+            tree.node_left = data['node_left']
+            tree.node_right = data['node_right']
+            tree.node_center = data['node_center']
+            tree.node_radius = data['node_radius']
+        return tree
+
+
+def load_or_build(path, lat, lon, ids, leaf_size=DEFAULT_LEAF_SIZE):
+    """
+    The tree saved at path if it was built over exactly these points (same
+    coordinates and ids, in the same order), otherwise a new tree, which is
+    saved to path for the next tool
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    ids = np.asarray(ids).astype(str)
+    try:
+        tree = SphereBallTree.load(path)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        tree = None  # Missing, truncated or from an older layout: rebuild
+    if (tree is not None and tree.leaf_size == leaf_size and np.array_equal(tree.lat, lat)
+            and np.array_equal(tree.lon, lon) and np.array_equal(tree.ids, ids)):
+        return tree
+
+    tree = SphereBallTree(lat, lon, ids=ids, leaf_size=leaf_size)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tree.save(path)
+    except OSError:
+        pass  # A read-only checkout still gets a working tree
+    return tree
+
+
+def load_attraction_tree(catalog):
+    """Tree over the catalog's mapped rows; tree index i is row np.flatnonzero(catalog.has_coordinates)[i]"""
+    mapped = np.flatnonzero(catalog.has_coordinates)
+    return load_or_build(ATTRACTIONS_INDEX_PATH, catalog.lat[mapped], catalog.lon[mapped],
+                         [catalog.ids[i] for i in mapped])
+
+
+def load_airport_tree(airports):
+    """Tree over the mapped airports, indexed like load_attraction_tree()"""
+    mapped = np.flatnonzero(airports.has_coordinates)
+    return load_or_build(AIRPORTS_INDEX_PATH, airports.lat[mapped], airports.lon[mapped],
+                         [airports.ids[i] for i in mapped])
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Spatial Index Builder")
+    print("=" * 60)
+
+    with load_packed_catalog() as catalog:
+        attraction_tree = load_attraction_tree(catalog)
+    for label, tree, output_path in [
+        ('attractions', attraction_tree, ATTRACTIONS_INDEX_PATH),
+        ('airports', load_airport_tree(load_airports()), AIRPORTS_INDEX_PATH),
+    ]:
+        print(f"✅ Indexed {len(tree)} {label} -> {output_path}")
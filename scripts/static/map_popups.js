@@ -0,0 +1,623 @@
+// Draggable, click-to-close park popups for the maps generated by map_national_parks.py
+
+// Make popups draggable
+function makePopupsDraggable() {
+    // Function to make a popup draggable
+    function makePopupDraggable(popup) {
+        var popupContent = popup.getContent();
+        if (!popupContent) {
+            console.log('makePopupDraggable: No popup content');
+            return;
+        }
+        
+        var popupElement = popup._container;
+        if (!popupElement) {
+            console.log('makePopupDraggable: No popup container');
+            return;
+        }
+        
+        // Check if already made draggable - but allow retry if elements aren't found
+        var alreadySetup = popupElement.hasAttribute('data-draggable-setup');
+        
+        var header = popupElement.querySelector('.popup-header');
+        if (!header) {
+            console.log('makePopupDraggable: Header not found, will retry');
+            // Don't mark as setup if header isn't found yet
+            if (!alreadySetup) {
+                // Retry after a short delay
+                setTimeout(function() {
+                    makePopupDraggable(popup);
+                }, 50);
+            }
+            return;
+        }
+        
+        // Check if close button and drag handlers are already set up
+        var closeBtn = popupElement.querySelector('.popup-close-btn');
+        var hasCloseHandler = closeBtn && closeBtn.hasAttribute('data-close-handler');
+        var hasDragHandler = header.hasAttribute('data-drag-handler');
+        
+        // Always proceed with setup - even if partially set up, ensure everything is working
+        // This is especially important for the first popup
+        if (alreadySetup && hasCloseHandler && hasDragHandler) {
+            console.log('makePopupDraggable: Popup appears set up, but re-checking handlers');
+            // Don't return - continue to ensure handlers are properly attached
+        }
+        
+        // Mark as setup
+        if (!alreadySetup) {
+            popupElement.setAttribute('data-draggable-setup', 'true');
+            console.log('makePopupDraggable: Setting up popup for the first time');
+        } else {
+            console.log('makePopupDraggable: Re-setting up popup elements (may be first popup)');
+        }
+        
+        var isDragging = false;
+        var hasBeenDragged = false;
+        var startX, startY, initialX, initialY;
+        
+        // Get popup pane position
+        var popupPane = popup._container.closest('.leaflet-popup-pane');
+        if (!popupPane) return;
+        
+        // Set high z-index immediately and ensure it stays high
+        popupElement.style.zIndex = '99999';
+        popupElement.style.setProperty('z-index', '99999', 'important');
+        if (popupPane) {
+            popupPane.style.zIndex = '99999';
+            popupPane.style.setProperty('z-index', '99999', 'important');
+        }
+        
+        // Prevent Leaflet from closing popup on map click
+        popup.options.closeOnClick = false;
+        popup.options.autoClose = false;
+        
+        // Override Leaflet's closePopup to prevent closing during drag
+        if (!popup._originalClosePopup) {
+            popup._originalClosePopup = popup.closePopup;
+        }
+        // Store reference to isDragging in popup for closePopup to access
+        popup._isDragging = false;
+        popup._allowClose = true; // Allow closing by default
+        popup._forceClose = false; // Flag for forced closes
+        popup.closePopup = function(forceClose) {
+            // Allow forced closes (from marker clicks)
+            if (forceClose === true) {
+                this._forceClose = true;
+                this._isDragging = false;
+                this._allowClose = true;
+            }
+            
+            // Don't close if we're currently dragging (unless forced)
+            if (this._isDragging && !this._forceClose) {
+                return;
+            }
+            
+            // Always allow closing - the X button and explicit close calls should work
+            if (this._originalClosePopup) {
+                this._originalClosePopup.call(this);
+            } else {
+                // Fallback: use map's closePopup
+                if (this._map) {
+                    this._map.closePopup(this);
+                } else {
+                    // Last resort: remove from DOM
+                    if (this._container && this._container.parentNode) {
+                        this._container.parentNode.removeChild(this._container);
+                    }
+                }
+            }
+            
+            // Reset force flag
+            this._forceClose = false;
+        };
+        
+        // Mark popup as draggable
+        popupElement.setAttribute('data-draggable', 'true');
+        
+        // Add close button handler - use multiple methods to ensure it works
+        var closeBtn = popupElement.querySelector('.popup-close-btn');
+        if (closeBtn) {
+            // Always set up handler - even if it appears set up, ensure it's working
+            // This is critical for the first popup
+            var needsSetup = !closeBtn.hasAttribute('data-close-handler');
+            if (needsSetup) {
+                // Remove any existing handlers by cloning
+                var newCloseBtn = closeBtn.cloneNode(true);
+                closeBtn.parentNode.replaceChild(newCloseBtn, closeBtn);
+                closeBtn = newCloseBtn;
+                
+                closeBtn.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    
+                    // Force close - try multiple methods
+                    popup._isDragging = false;
+                    popup._allowClose = true;
+                    
+                    // Method 1: Use map's closePopup
+                    if (popup._map && popup._map.closePopup) {
+                        try {
+                            popup._map.closePopup(popup);
+                            return;
+                        } catch(err) {}
+                    }
+                    
+                    // Method 2: Use original closePopup
+                    if (popup._originalClosePopup) {
+                        try {
+                            popup._originalClosePopup.call(popup);
+                            return;
+                        } catch(err) {}
+                    }
+                    
+                    // Method 3: Remove from DOM directly
+                    if (popupElement && popupElement.parentNode) {
+                        popupElement.parentNode.removeChild(popupElement);
+                    }
+                    
+                    // Method 4: Hide the popup
+                    if (popupElement) {
+                        popupElement.style.display = 'none';
+                    }
+                }, true);
+                
+                // Also add mouseup handler as backup
+                closeBtn.addEventListener('mouseup', function(e) {
+                    e.stopPropagation();
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                }, true);
+                
+                // Mark close button as having handler
+                closeBtn.setAttribute('data-close-handler', 'true');
+                console.log('Close button handler set up');
+            } else {
+                // Even if marked as set up, verify it's working by checking if it has event listeners
+                // For first popup, we want to ensure it's really working
+                console.log('Close button marked as set up, but ensuring it works');
+                // Re-setup to be safe (clone and re-add handler)
+                var newCloseBtn = closeBtn.cloneNode(true);
+                closeBtn.parentNode.replaceChild(newCloseBtn, closeBtn);
+                closeBtn = newCloseBtn;
+                
+                closeBtn.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    popup._isDragging = false;
+                    popup._allowClose = true;
+                    if (popup._map && popup._map.closePopup) {
+                        popup._map.closePopup(popup);
+                    } else if (popup._originalClosePopup) {
+                        popup._originalClosePopup.call(popup);
+                    }
+                }, true);
+                closeBtn.setAttribute('data-close-handler', 'true');
+            }
+        } else {
+            console.log('Close button not found!');
+        }
+        
+        // Store references on popup element for persistence
+        popupElement._dragHeader = header;
+        popupElement._dragPopup = popup;
+        popupElement._dragPopupElement = popupElement;
+        
+        // Create dragStart function that finds elements dynamically
+        function dragStart(e) {
+            // Get references dynamically
+            var currentHeader = popupElement.querySelector('.popup-header') || popupElement._dragHeader;
+            if (!currentHeader) {
+                console.log('dragStart: Header not found');
+                return;
+            }
+            // Don't drag if clicking close button or links
+            if (e.target.classList.contains('popup-close-btn') || 
+                e.target.closest('.popup-close-btn') ||
+                e.target.tagName === 'A' || 
+                e.target.closest('a')) {
+                return;
+            }
+            
+            // Check if clicking on header or its children
+            var clickedOnHeader = (e.target === currentHeader || currentHeader.contains(e.target));
+            if (!clickedOnHeader) {
+                return;
+            }
+            
+            console.log('dragStart: Starting drag on header');
+            
+            e.preventDefault();
+            e.stopPropagation();
+            e.stopImmediatePropagation();
+            
+            isDragging = true;
+            hasBeenDragged = false;
+            popup._isDragging = true; // Set flag to prevent closing
+            currentHeader.style.cursor = 'grabbing';
+            popupElement.style.cursor = 'grabbing';
+            
+            // Prevent Leaflet from closing the popup
+            if (popup._source) {
+                popup._source._popup = popup;
+            }
+            
+            // Disable Leaflet's popup positioning and prevent closing
+            popup._updatePosition = function() {};
+            popup.options.closeOnClick = false;
+            popup.options.autoClose = false;
+            
+            // Prevent popup from being removed during drag
+            if (!popup._originalRemove) {
+                popup._originalRemove = popup.remove;
+            }
+            popup.remove = function() {
+                if (!isDragging) {
+                    if (popup._originalRemove) {
+                        popup._originalRemove.call(this);
+                    }
+                }
+            };
+            
+            // Get initial mouse position
+            startX = e.clientX || e.pageX;
+            startY = e.clientY || e.pageY;
+            
+            // Get initial popup position
+            var rect = popupElement.getBoundingClientRect();
+            initialX = rect.left;
+            initialY = rect.top;
+            
+            // Remove any existing listeners first to avoid duplicates
+            document.removeEventListener('mousemove', drag, true);
+            document.removeEventListener('mouseup', dragEnd, true);
+            document.removeEventListener('click', preventClick, true);
+            
+            // Add global event listeners with capture to catch events first
+            document.addEventListener('mousemove', drag, true);
+            document.addEventListener('mouseup', dragEnd, true);
+            document.addEventListener('click', preventClick, true);
+            
+            // Prevent map click from closing popup during drag
+            if (popup._map) {
+                popup._map.dragging.disable();
+            }
+            
+            console.log('Drag started');
+        }
+        
+        // Now add the drag handlers to header - ensure they're added
+        // Remove any existing handlers first by checking if they exist
+        if (header._dragStartHandler) {
+            header.removeEventListener('mousedown', header._dragStartHandler, true);
+            header.removeEventListener('mousedown', header._dragStartHandler, false);
+        }
+        
+        header.addEventListener('mousedown', dragStart, true);
+        header.addEventListener('mousedown', dragStart, false);
+        header._dragStartHandler = dragStart; // Store reference
+        header.setAttribute('data-drag-handler', 'true');
+        console.log('Drag handler set up on header - header found:', !!header, 'header text:', header.textContent.substring(0, 50));
+        
+        // Also make the entire popup element draggable when clicking on header
+        var popupMousedownHandler = function(e) {
+            // Only start drag if clicking on header area
+            var currentHeader = popupElement.querySelector('.popup-header');
+            if (currentHeader && currentHeader.contains(e.target) && !e.target.classList.contains('popup-close-btn') && !e.target.closest('.popup-close-btn')) {
+                dragStart(e);
+            }
+        };
+        
+        // Remove old listener if it exists
+        if (popupElement._dragMousedownHandler) {
+            popupElement.removeEventListener('mousedown', popupElement._dragMousedownHandler, true);
+        }
+        popupElement.addEventListener('mousedown', popupMousedownHandler, true);
+        popupElement._dragMousedownHandler = popupMousedownHandler; // Store reference
+        
+        function preventClick(e) {
+            if (isDragging) {
+                e.preventDefault();
+                e.stopPropagation();
+                e.stopImmediatePropagation();
+                return false;
+            }
+        }
+        
+        function drag(e) {
+            if (!isDragging) return;
+            
+            e.preventDefault();
+            e.stopPropagation();
+            e.stopImmediatePropagation();
+            
+            // Calculate new position
+            var deltaX = e.clientX - startX;
+            var deltaY = e.clientY - startY;
+            
+            // Only move if there's significant movement (prevents accidental drags)
+            if (Math.abs(deltaX) > 2 || Math.abs(deltaY) > 2) {
+                hasBeenDragged = true;
+                popupElement.setAttribute('data-has-been-dragged', 'true');
+            }
+            
+            var newX = initialX + deltaX;
+            var newY = initialY + deltaY;
+            
+            // Completely override Leaflet's positioning
+            popup._updatePosition = function() {}; // Disable Leaflet's position updates
+            
+            // Update popup position using fixed positioning
+            popupElement.style.left = newX + 'px';
+            popupElement.style.top = newY + 'px';
+            popupElement.style.transform = 'none';
+            popupElement.style.position = 'fixed';
+            popupElement.style.margin = '0';
+            popupElement.style.zIndex = '99999';
+            popupElement.style.setProperty('z-index', '99999', 'important');
+            
+            // Hide popup tip
+            var tip = popupElement.querySelector('.leaflet-popup-tip');
+            if (tip) {
+                tip.style.display = 'none';
+            }
+            
+            // Prevent Leaflet from closing popup - override all close methods
+            popup.options.closeOnClick = false;
+            popup.options.autoClose = false;
+            
+            // Prevent map from processing this event
+            if (popup._map) {
+                popup._map.dragging.disable();
+            }
+        }
+        
+        function dragEnd(e) {
+            if (!isDragging) return;
+            
+            e.preventDefault();
+            e.stopPropagation();
+            e.stopImmediatePropagation();
+            
+            isDragging = false;
+            popup._isDragging = false; // Clear flag to allow closing
+            
+            // Find header dynamically
+            var currentHeader = popupElement.querySelector('.popup-header') || popupElement._dragHeader;
+            if (currentHeader) {
+                currentHeader.style.cursor = 'move';
+            }
+            popupElement.style.cursor = 'default';
+            
+            // Restore remove function
+            if (popup._originalRemove) {
+                popup.remove = popup._originalRemove;
+                delete popup._originalRemove;
+            }
+            
+            // Re-enable map dragging
+            if (popup._map) {
+                popup._map.dragging.enable();
+                
+                // If popup was dragged, prevent map clicks from closing it
+                if (hasBeenDragged) {
+                    popup.options.closeOnClick = false;
+                    popup.options.autoClose = false;
+                    
+                    // Prevent map click from closing this popup
+                    var mapClickHandler = function(clickEvent) {
+                        // Check if click is outside the popup
+                        if (!popupElement.contains(clickEvent.originalEvent.target)) {
+                            clickEvent.originalEvent.stopPropagation();
+                            clickEvent.originalEvent.preventDefault();
+                        }
+                    };
+                    
+                    // Store handler for cleanup
+                    popupElement._mapClickHandler = mapClickHandler;
+                    popup._map.on('click', mapClickHandler, popup);
+                }
+            }
+            
+            // Remove global event listeners
+            document.removeEventListener('mousemove', drag, true);
+            document.removeEventListener('mouseup', dragEnd, true);
+            document.removeEventListener('click', preventClick, true);
+            
+            // Small delay to prevent immediate click event
+            setTimeout(function() {
+                // Restore update position function but make it no-op
+                if (popup._updatePosition) {
+                    popup._updatePosition = function() {};
+                }
+            }, 100);
+        }
+    }
+    
+    // Make existing popups draggable
+    setTimeout(function() {
+        // Try to get map using the getMap function if available
+        var map = null;
+        if (typeof getMap === 'function') {
+            map = getMap();
+        }
+        
+        // If not available, try other methods
+        if (!map) {
+            var container = document.querySelector('.leaflet-container');
+            if (container && container._leaflet_id) {
+                var id = container._leaflet_id;
+                if (window[id]) {
+                    map = window[id];
+                }
+            }
+        }
+        
+        if (!map) {
+            var container = document.querySelector('.leaflet-container');
+            for (var key in window) {
+                try {
+                    var obj = window[key];
+                    if (obj && obj._container === container && obj.eachLayer) {
+                        map = obj;
+                        break;
+                    }
+                } catch(e) {}
+            }
+        }
+        
+        if (map) {
+            // Intercept map clicks to prevent closing popups that shouldn't be closed
+            map.on('click', function(e) {
+                // Check if click is on a popup - if so, don't close it
+                var clickedElement = e.originalEvent.target;
+                if (clickedElement && clickedElement.closest('.leaflet-popup')) {
+                    e.originalEvent.stopPropagation();
+                    return;
+                }
+                
+                // Check all open popups and prevent closing if closeOnClick is false
+                map.eachLayer(function(layer) {
+                    if (layer instanceof L.Marker) {
+                        var popup = layer.getPopup();
+                        if (popup && popup.isOpen() && !popup.options.closeOnClick) {
+                            // Prevent this popup from closing
+                            e.originalEvent.stopPropagation();
+                        }
+                    }
+                });
+            }, true); // Use capture phase
+            
+            // Listen for popup opens - set up immediately
+            map.on('popupopen', function(e) {
+                console.log('Popup opened, setting up draggable functionality');
+                
+                // Prevent closing on map click - set this immediately and keep it false
+                e.popup.options.closeOnClick = false;
+                e.popup.options.autoClose = false;
+                
+                // Set high z-index immediately to bring above other panels
+                function setZIndex() {
+                    if (e.popup._container) {
+                        e.popup._container.style.zIndex = '99999';
+                        e.popup._container.style.setProperty('z-index', '99999', 'important');
+                        // Force z-index on popup pane as well
+                        var popupPane = e.popup._container.closest('.leaflet-popup-pane');
+                        if (popupPane) {
+                            popupPane.style.zIndex = '99999';
+                            popupPane.style.setProperty('z-index', '99999', 'important');
+                        }
+                    }
+                }
+                
+                // Set z-index immediately and repeatedly
+                setZIndex();
+                setTimeout(setZIndex, 1);
+                setTimeout(setZIndex, 5);
+                setTimeout(setZIndex, 10);
+                setTimeout(setZIndex, 50);
+                setTimeout(setZIndex, 100);
+                
+                // Disable Leaflet's position updates
+                if (e.popup._updatePosition) {
+                    e.popup._updatePosition = function() {};
+                }
+                
+                // Use requestAnimationFrame for immediate setup (catches first frame)
+                requestAnimationFrame(function() {
+                    console.log('Setting up draggable popup - requestAnimationFrame');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                });
+                
+                // Set up draggable immediately - try multiple times aggressively
+                // Try immediately (0ms)
+                console.log('Setting up draggable popup - attempt 1 (immediate)');
+                makePopupDraggable(e.popup);
+                
+                // Try with very short delays to ensure DOM is ready
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 2 (1ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 1);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 3 (5ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 5);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 4 (10ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 10);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 5 (25ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 25);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 6 (50ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 50);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 7 (100ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 100);
+                
+                setTimeout(function() {
+                    console.log('Setting up draggable popup - attempt 8 (200ms)');
+                    makePopupDraggable(e.popup);
+                    setZIndex();
+                }, 200);
+                
+                // Also use MutationObserver to catch when DOM is ready
+                if (e.popup._container) {
+                    var observer = new MutationObserver(function(mutations) {
+                        console.log('MutationObserver: DOM changed, setting up popup');
+                        makePopupDraggable(e.popup);
+                        setZIndex();
+                        observer.disconnect(); // Stop observing after first change
+                    });
+                    observer.observe(e.popup._container, { childList: true, subtree: true });
+                    // Disconnect after 500ms to avoid memory leaks
+                    setTimeout(function() {
+                        observer.disconnect();
+                    }, 500);
+                }
+            });
+            
+            // Make any existing popups draggable
+            var popups = document.querySelectorAll('.leaflet-popup');
+            popups.forEach(function(popupEl) {
+                // Try to find popup object from the element
+                var popup = popupEl._leaflet_popup;
+                if (popup) {
+                    makePopupDraggable(popup);
+                    setTimeout(function() {
+                        makePopupDraggable(popup);
+                    }, 10);
+                }
+            });
+        }
+    }, 1000);
+}
+
+// Initialize draggable popups when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    setTimeout(makePopupsDraggable, 2000);
+});
+
+// Also try after map is fully loaded
+window.addEventListener('load', function() {
+    setTimeout(makePopupsDraggable, 3000);
+});
@@ -0,0 +1,735 @@
+// Region layer toggling (filter panel <-> layer control) and nearby-park highlighting
+// for the maps generated by map_national_parks.py
+
+// Store map reference
+var leafletMap = null;
+
+// Function to get the Leaflet map object
+function getMap() {
+    if (leafletMap) return leafletMap;
+    
+    // Try to find map in various ways
+    var container = document.querySelector('.leaflet-container');
+    if (!container) return null;
+    
+    // Look for map in window objects
+    for (var key in window) {
+        try {
+            var obj = window[key];
+            if (obj && obj._container === container && obj.eachLayer) {
+                leafletMap = obj;
+                return leafletMap;
+            }
+        } catch(e) {}
+    }
+    
+    // Try to get from container
+    if (container._leaflet_id) {
+        var id = container._leaflet_id;
+        if (window[id]) {
+            leafletMap = window[id];
+            return leafletMap;
+        }
+    }
+    
+    return null;
+}
+
+// Function to toggle region layers on the map
+function toggleRegionLayer(region, show) {
+    var map = getMap();
+    if (!map) {
+        setTimeout(function() { toggleRegionLayer(region, show); }, 300);
+        return;
+    }
+    
+    // Try stored references first
+    if (regionGroupLayers[region]) {
+        var layer = regionGroupLayers[region];
+        try {
+            if (show) {
+                if (!map.hasLayer(layer)) {
+                    map.addLayer(layer);
+                }
+            } else {
+                if (map.hasLayer(layer)) {
+                    map.removeLayer(layer);
+                }
+            }
+            updateLayerControlCheckbox(region, show);
+            updateFilterPanelCheckbox(region, show);
+            return;
+        } catch(e) {
+            console.log('Error with stored reference:', e);
+        }
+    }
+    
+    // Simple approach: Find the checkbox in layer control and click it
+    // This will trigger Leaflet's built-in toggle mechanism
+    var layerControl = document.querySelector('.leaflet-control-layers');
+    if (!layerControl) {
+        console.log('Layer control not found in DOM');
+        return;
+    }
+    
+    var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+    if (!overlaySection) {
+        console.log('Overlay section not found');
+        return;
+    }
+    
+    var labels = overlaySection.querySelectorAll('label');
+    console.log('Found', labels.length, 'labels in overlay section');
+    
+    // Debug: List all labels
+    for (var d = 0; d < labels.length; d++) {
+        var labelText = labels[d].textContent || labels[d].innerText || '';
+        console.log('Label', d, ':', labelText);
+    }
+    
+    // Try to find matching label
+    var foundLabel = null;
+    for (var i = 0; i < labels.length; i++) {
+        var label = labels[i];
+        var text = label.textContent || label.innerText || '';
+        var textLower = text.toLowerCase();
+        var regionLower = region.toLowerCase();
+        
+        // Try different matching strategies
+        // Match at start, or match anywhere for Canada (since it might be "Canada (43 parks)")
+        var matches = false;
+        if (text.indexOf(region) === 0 || 
+            text.indexOf(region + ' ') === 0 ||
+            textLower.indexOf(regionLower) === 0) {
+            matches = true;
+        } else if (region === 'Canada') {
+            // Special handling for Canada - check for "canada" anywhere or flag emoji
+            if (textLower.indexOf('canada') >= 0 || text.indexOf('🇨🇦') >= 0 || text.indexOf('Canada') >= 0) {
+                matches = true;
+            }
+        }
+        
+        if (matches) {
+            foundLabel = label;
+            console.log('Found matching label:', text, 'for region:', region);
+            break;
+        }
+    }
+    
+    if (foundLabel) {
+        var input = foundLabel.querySelector('input');
+        if (input) {
+            console.log('Found input, current checked state:', input.checked, 'desired:', show);
+            // Set the checkbox state
+            if (input.type === 'radio') {
+                input.type = 'checkbox';
+            }
+            
+            // If state needs to change, directly manipulate the layer first, then sync checkbox
+            if (input.checked !== show) {
+                console.log('Setting checkbox to:', show);
+                
+                // Set flag to prevent event listener from processing this change
+                isProgrammaticChange = true;
+                
+                // First, try to find and toggle the layer directly
+                var layerToggled = false;
+                var allFeatureGroups = [];
+                map.eachLayer(function(layer) {
+                    if (layer instanceof L.FeatureGroup) {
+                        allFeatureGroups.push(layer);
+                    }
+                });
+                
+                var inputIndex = Array.from(overlaySection.querySelectorAll('input')).indexOf(input);
+                if (inputIndex >= 0 && inputIndex < allFeatureGroups.length) {
+                    var targetLayer = allFeatureGroups[inputIndex];
+                    try {
+                        if (show) {
+                            if (!map.hasLayer(targetLayer)) {
+                                map.addLayer(targetLayer);
+                            }
+                        } else {
+                            if (map.hasLayer(targetLayer)) {
+                                map.removeLayer(targetLayer);
+                            }
+                        }
+                        regionGroupLayers[region] = targetLayer;
+                        layerToggled = true;
+                        console.log('Directly toggled layer for:', region);
+                    } catch(e) {
+                        console.log('Error toggling layer directly:', e);
+                    }
+                }
+                
+                // If direct toggle didn't work, use checkbox events as fallback
+                if (!layerToggled) {
+                    // Set checkbox state and trigger events
+                    input.checked = show;
+                    
+                    // Trigger click event which Leaflet listens to
+                    var clickEvent = new MouseEvent('click', {
+                        bubbles: true,
+                        cancelable: true,
+                        view: window
+                    });
+                    input.dispatchEvent(clickEvent);
+                    
+                    // Also try change event
+                    var changeEvent = new Event('change', {
+                        bubbles: true,
+                        cancelable: true
+                    });
+                    input.dispatchEvent(changeEvent);
+                } else {
+                    // If we toggled directly, just update the checkbox state to match
+                    input.checked = show;
+                }
+                
+                // Clear flag after a short delay to allow events to process
+                setTimeout(function() {
+                    isProgrammaticChange = false;
+                }, 100);
+                
+                // Store the layer reference for future use (if not already stored)
+                if (!regionGroupLayers[region]) {
+                    var inputIndex = Array.from(overlaySection.querySelectorAll('input')).indexOf(input);
+                    console.log('Input index:', inputIndex, 'FeatureGroups:', allFeatureGroups.length, 'for region:', region);
+                    if (inputIndex >= 0 && inputIndex < allFeatureGroups.length) {
+                        regionGroupLayers[region] = allFeatureGroups[inputIndex];
+                        console.log('Stored layer reference for:', region);
+                    } else {
+                        // Try to find the layer by matching the label text with layer control
+                        console.log('Could not match by index, trying to find layer by name for:', region);
+                        // The layer should already be toggled by the click event, so just store reference if we can find it
+                        var layerControlObj = null;
+                        if (map._controls && map._controls.length > 0) {
+                            for (var c = 0; c < map._controls.length; c++) {
+                                var control = map._controls[c];
+                                if (control instanceof L.Control.Layers) {
+                                    layerControlObj = control;
+                                    break;
+                                }
+                            }
+                        }
+                        if (layerControlObj && layerControlObj._layers) {
+                            for (var l = 0; l < layerControlObj._layers.length; l++) {
+                                var layerInfo = layerControlObj._layers[l];
+                                if (layerInfo.overlay && layerInfo.name) {
+                                    var layerName = layerInfo.name.trim();
+                                    if (layerName.indexOf(region) === 0 || 
+                                        (region === 'Canada' && (layerName.toLowerCase().indexOf('canada') >= 0 || layerName.indexOf('🇨🇦') >= 0))) {
+                                        regionGroupLayers[region] = layerInfo.layer;
+                                        console.log('Stored layer reference for', region, 'by name matching');
+                                        break;
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+                // Update filter panel to sync
+                updateFilterPanelCheckbox(region, show);
+            } else {
+                console.log('Checkbox already in desired state');
+                // Still update filter panel to ensure sync
+                updateFilterPanelCheckbox(region, show);
+            }
+            return;
+        } else {
+            console.log('No input found in label');
+        }
+    } else {
+        console.log('Could not find checkbox for region:', region);
+        console.log('Available labels:', Array.from(labels).map(function(l) { return l.textContent || l.innerText; }));
+        
+        // Fallback: Match FeatureGroups by checking if they contain markers with expected coordinates
+        if (window.regionCoordinates && window.regionCoordinates[region]) {
+            var expectedCoord = window.regionCoordinates[region];
+            var expectedLat = expectedCoord[0];
+            var expectedLon = expectedCoord[1];
+            console.log('Trying coordinate matching for region:', region, 'expected:', expectedLat, expectedLon);
+            
+            var allFeatureGroups = [];
+            map.eachLayer(function(layer) {
+                if (layer instanceof L.FeatureGroup) {
+                    allFeatureGroups.push(layer);
+                }
+            });
+            
+            // Check each FeatureGroup to see if it contains a marker at the expected coordinates
+            for (var i = 0; i < allFeatureGroups.length; i++) {
+                var fg = allFeatureGroups[i];
+                var foundMarker = false;
+                fg.eachLayer(function(marker) {
+                    if (marker instanceof L.Marker) {
+                        var markerLat = marker.getLatLng().lat;
+                        var markerLon = marker.getLatLng().lng;
+                        // Check if coordinates match (within small tolerance)
+                        if (Math.abs(markerLat - expectedLat) < 0.1 && Math.abs(markerLon - expectedLon) < 0.1) {
+                            foundMarker = true;
+                        }
+                    }
+                });
+                
+                if (foundMarker) {
+                    console.log('Matched FeatureGroup by coordinates for region:', region);
+                    try {
+                        if (show) {
+                            if (!map.hasLayer(fg)) {
+                                map.addLayer(fg);
+                            }
+                        } else {
+                            if (map.hasLayer(fg)) {
+                                map.removeLayer(fg);
+                            }
+                        }
+                        regionGroupLayers[region] = fg;
+                        updateLayerControlCheckbox(region, show);
+                        updateFilterPanelCheckbox(region, show);
+                        return;
+                    } catch(e) {
+                        console.log('Error toggling matched layer:', e);
+                    }
+                }
+            }
+        }
+    }
+}
+
+// Helper function to update layer control checkbox
+function updateLayerControlCheckbox(region, show) {
+    var layerControl = document.querySelector('.leaflet-control-layers');
+    if (layerControl) {
+        var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+        if (overlaySection) {
+            var labels = overlaySection.querySelectorAll('label');
+            labels.forEach(function(label) {
+                var text = label.textContent || label.innerText || '';
+                var textLower = text.toLowerCase();
+                var regionLower = region.toLowerCase();
+                
+                // Match region name at the start of the label text, or special handling for Canada
+                var matches = false;
+                if (text.indexOf(region) === 0 || 
+                    text.indexOf(region + ' ') === 0 ||
+                    textLower.indexOf(regionLower) === 0) {
+                    matches = true;
+                } else if (region === 'Canada') {
+                    // Special handling for Canada
+                    if (textLower.indexOf('canada') >= 0 || text.indexOf('🇨🇦') >= 0 || text.indexOf('Canada') >= 0) {
+                        matches = true;
+                    }
+                }
+                
+                if (matches) {
+                    var input = label.querySelector('input');
+                    if (input) {
+                        if (input.type === 'radio') {
+                            input.type = 'checkbox';
+                        }
+                        input.checked = show;
+                    }
+                }
+            });
+        }
+    }
+}
+
+// Helper function to update filter panel checkbox
+function updateFilterPanelCheckbox(region, show) {
+    var filterCheckbox = document.getElementById('filter_' + region);
+    if (filterCheckbox) {
+        filterCheckbox.checked = show;
+    } else {
+        console.log('Filter panel checkbox not found for region:', region);
+    }
+}
+
+// Store region group references for direct access (use window object for cross-script access)
+if (!window.regionGroupLayers) {
+    window.regionGroupLayers = {};
+}
+var regionGroupLayers = window.regionGroupLayers;
+
+// Flag to prevent event listener from processing programmatic changes
+var isProgrammaticChange = false;
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    setTimeout(function() {
+        var map = getMap();
+        if (!map) {
+            setTimeout(arguments.callee, 500);
+            return;
+        }
+        
+        // Convert radio buttons to checkboxes in overlay section and add event listeners
+        var layerControl = document.querySelector('.leaflet-control-layers');
+        if (layerControl) {
+            var overlaySection = layerControl.querySelector('.leaflet-control-layers-overlays');
+            if (overlaySection) {
+                var inputs = overlaySection.querySelectorAll('input[type="radio"]');
+                inputs.forEach(function(input) {
+                    input.type = 'checkbox';
+                });
+                
+                // Add event listeners to all overlay checkboxes to sync with filter panel
+                var allOverlayInputs = overlaySection.querySelectorAll('input[type="checkbox"]');
+                allOverlayInputs.forEach(function(input) {
+                    input.addEventListener('change', function() {
+                        // Skip if this is a programmatic change
+                        if (isProgrammaticChange) {
+                            return;
+                        }
+                        
+                        var label = this.closest('label');
+                        if (label) {
+                            var labelText = label.textContent || label.innerText || '';
+                            var labelTextLower = labelText.toLowerCase();
+                            
+                            // Try to match region name
+                            var regions = ['West', 'South', 'Midwest', 'Northeast', 'Alaska', 'Hawaii', 'Canada'];
+                            for (var r = 0; r < regions.length; r++) {
+                                var region = regions[r];
+                                var regionLower = region.toLowerCase();
+                                
+                                // Match if label starts with region name, or contains it for Canada
+                                if (labelText.indexOf(region) === 0 || 
+                                    labelText.indexOf(region + ' ') === 0 ||
+                                    labelTextLower.indexOf(regionLower) === 0 ||
+                                    (region === 'Canada' && (labelTextLower.indexOf('canada') >= 0 || labelText.indexOf('🇨🇦') >= 0))) {
+                                    console.log('Layer control checkbox changed for region:', region, 'checked:', this.checked);
+                                    updateFilterPanelCheckbox(region, this.checked);
+                                    break;
+                                }
+                            }
+                        }
+                    });
+                });
+            }
+        }
+        
+        // Store region group references by checking layer control first
+        var layerControlObj = null;
+        if (map._controls && map._controls.length > 0) {
+            for (var i = 0; i < map._controls.length; i++) {
+                var control = map._controls[i];
+                if (control instanceof L.Control.Layers) {
+                    layerControlObj = control;
+                    break;
+                }
+            }
+        }
+        
+        console.log('Initializing region groups...');
+        var regions = ['West', 'South', 'Midwest', 'Northeast', 'Alaska', 'Hawaii', 'Canada'];
+        
+        // Debug: Check what controls exist
+        console.log('Map controls:', map._controls ? map._controls.length : 'null');
+        if (map._controls) {
+            for (var c = 0; c < map._controls.length; c++) {
+                console.log('  Control', c, ':', map._controls[c].constructor.name);
+            }
+        }
+        
+        // Get layers from layer control
+        if (layerControlObj) {
+            console.log('Layer control object found');
+            console.log('Layer control _layers:', layerControlObj._layers ? layerControlObj._layers.length : 'null');
+            
+            if (layerControlObj._layers && layerControlObj._layers.length > 0) {
+                console.log('Found layer control with', layerControlObj._layers.length, 'layers');
+                for (var i = 0; i < layerControlObj._layers.length; i++) {
+                    var layerInfo = layerControlObj._layers[i];
+                    console.log('Layer', i, ':', {
+                        overlay: layerInfo.overlay,
+                        name: layerInfo.name,
+                        hasLayer: !!layerInfo.layer
+                    });
+                    if (layerInfo.overlay && layerInfo.name) {
+                        var layerName = layerInfo.name.trim();
+                        console.log('Processing layer:', layerName);
+                        for (var j = 0; j < regions.length; j++) {
+                            if (layerName.indexOf(regions[j]) === 0) {
+                                if (!regionGroupLayers[regions[j]]) {
+                                    regionGroupLayers[regions[j]] = layerInfo.layer;
+                                    console.log('✓ Stored', regions[j], 'from layer control');
+                                } else {
+                                    console.log('  (Already stored:', regions[j], ')');
+                                }
+                                break;
+                            }
+                        }
+                    }
+                }
+            } else {
+                console.log('Layer control has no _layers array or it is empty');
+            }
+        } else {
+            console.log('Layer control object not found in map._controls');
+        }
+        
+        // Use coordinate matching to store region groups
+        if (window.regionCoordinates) {
+            console.log('Using coordinate matching to store region groups...');
+            var mapLayerCount = 0;
+            var allFeatureGroups = [];
+            
+            map.eachLayer(function(layer) {
+                if (layer instanceof L.FeatureGroup) {
+                    mapLayerCount++;
+                    allFeatureGroups.push(layer);
+                }
+            });
+            
+            console.log('Found', mapLayerCount, 'FeatureGroups on map');
+            
+            // Match each region by checking coordinates
+            for (var r = 0; r < regions.length; r++) {
+                var region = regions[r];
+                if (window.regionCoordinates[region]) {
+                    var expectedCoord = window.regionCoordinates[region];
+                    var expectedLat = expectedCoord[0];
+                    var expectedLon = expectedCoord[1];
+                    
+                    // Find FeatureGroup containing marker at these coordinates
+                    for (var i = 0; i < allFeatureGroups.length; i++) {
+                        var fg = allFeatureGroups[i];
+                        var foundMarker = false;
+                        
+                        fg.eachLayer(function(marker) {
+                            if (marker instanceof L.Marker) {
+                                var markerLat = marker.getLatLng().lat;
+                                var markerLon = marker.getLatLng().lng;
+                                if (Math.abs(markerLat - expectedLat) < 0.1 && Math.abs(markerLon - expectedLon) < 0.1) {
+                                    foundMarker = true;
+                                }
+                            }
+                        });
+                        
+                        if (foundMarker && !regionGroupLayers[region]) {
+                            regionGroupLayers[region] = fg;
+                            console.log('✓ Stored', region, 'by coordinate matching');
+                            break;
+                        }
+                    }
+                }
+            }
+        }
+        
+        console.log('Region groups stored:', Object.keys(regionGroupLayers));
+        console.log('Total groups found:', Object.keys(regionGroupLayers).length);
+        
+        if (Object.keys(regionGroupLayers).length > 0) {
+            console.log('✓ Region groups initialized successfully!');
+        } else {
+            console.log('Note: Region groups will be stored on first toggle');
+        }
+        
+        // Add click handlers for park highlighting
+        setupParkHighlighting(map);
+    }, 2000);
+});
+
+// Function to setup park highlighting on click
+function setupParkHighlighting(map) {
+    if (!window.parkData || !map) return;
+    
+    var highlightedMarkers = [];
+    var originalIcons = {};
+    var clickedMarker = null;
+    var currentPopup = null; // Track current open popup
+    
+    // Function to reset all highlights
+    function resetHighlights() {
+        // Reset clicked marker icon first (before clearing originalIcons)
+        if (clickedMarker && originalIcons[clickedMarker._leaflet_id]) {
+            clickedMarker.setIcon(originalIcons[clickedMarker._leaflet_id]);
+        }
+        
+        highlightedMarkers.forEach(function(item) {
+            // Remove circles or reset marker icons
+            if (item instanceof L.CircleMarker) {
+                map.removeLayer(item);
+            } else if (item instanceof L.Marker && originalIcons[item._leaflet_id]) {
+                item.setIcon(originalIcons[item._leaflet_id]);
+            }
+        });
+        highlightedMarkers = [];
+        originalIcons = {};
+        clickedMarker = null;
+        currentPopup = null;
+    }
+    
+    // Function to highlight nearby parks and the clicked park
+    function highlightNearbyParks(clickedPark, clickedLayer) {
+        // Reset previous highlights
+        resetHighlights();
+        
+        // Store the clicked marker
+        clickedMarker = clickedLayer;
+        
+        // Highlight the clicked park with orange icon
+        if (clickedLayer) {
+            // Store original icon
+            if (!originalIcons[clickedLayer._leaflet_id]) {
+                originalIcons[clickedLayer._leaflet_id] = clickedLayer.options.icon;
+            }
+            
+            // Create orange highlight icon for clicked park
+            var orangeIcon = L.icon({
+                iconUrl: 'https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/marker-icon-orange.png',
+                shadowUrl: 'https://cdnjs.cloudflare.com/ajax/libs/leaflet/0.7.7/images/marker-shadow.png',
+                iconSize: [25, 41],
+                iconAnchor: [12, 41],
+                popupAnchor: [1, -34],
+                shadowSize: [41, 41]
+            });
+            
+            clickedLayer.setIcon(orangeIcon);
+        }
+        
+        if (!clickedPark.nearby_parks || clickedPark.nearby_parks.length === 0) {
+            return;
+        }
+        
+        // Find and highlight nearby parks
+        var nearbyParkNames = clickedPark.nearby_parks.map(function(p) { return p.name; });
+        
+        map.eachLayer(function(layer) {
+            if (layer instanceof L.Marker) {
+                var markerLat = layer.getLatLng().lat;
+                var markerLon = layer.getLatLng().lng;
+                
+                // Check if this marker is a nearby park
+                for (var i = 0; i < window.parkData.length; i++) {
+                    var park = window.parkData[i];
+                    if (Math.abs(park.lat - markerLat) < 0.01 && Math.abs(park.lon - markerLon) < 0.01) {
+                        if (nearbyParkNames.indexOf(park.name) >= 0) {
+                            // Store original icon
+                            if (!originalIcons[layer._leaflet_id]) {
+                                originalIcons[layer._leaflet_id] = layer.options.icon;
+                            }
+                            
+                            // Create highlight using a blue circle marker overlay
+                            // Add a blue circle around the marker to highlight it
+                            var circle = L.circleMarker([markerLat, markerLon], {
+                                radius: 25,
+                                fillColor: '#3388ff',
+                                color: '#0066cc',
+                                weight: 3,
+                                opacity: 0.8,
+                                fillOpacity: 0.3
+                            });
+                            circle.addTo(map);
+                            highlightedMarkers.push(circle);
+                            break;
+                        }
+                    }
+                }
+            }
+        });
+        
+        console.log('Highlighted clicked park and', highlightedMarkers.length, 'nearby parks');
+    }
+    
+    // Add click event to all markers
+    setTimeout(function() {
+        map.eachLayer(function(layer) {
+            if (layer instanceof L.Marker) {
+                layer.on('click', function(e) {
+                    var markerLat = e.latlng.lat;
+                    var markerLon = e.latlng.lng;
+                    var clickedLayer = e.target; // The marker layer that was clicked
+                    
+                    // Close any existing popup - but do it AFTER Leaflet processes the click
+                    // This ensures the new popup can open first
+                    setTimeout(function() {
+                        // Close current popup if it's not the one being opened
+                        if (currentPopup && currentPopup.isOpen()) {
+                            var newPopup = clickedLayer.getPopup();
+                            if (!newPopup || !newPopup.isOpen() || currentPopup !== newPopup) {
+                                try {
+                                    currentPopup.closePopup(true); // Force close
+                                } catch(err) {
+                                    console.log('Error closing currentPopup:', err);
+                                }
+                            }
+                        }
+                        
+                        // Close any other open popups on the map (not the one being opened)
+                        var newPopup = clickedLayer.getPopup();
+                        map.eachLayer(function(layer) {
+                            if (layer instanceof L.Marker) {
+                                var popup = layer.getPopup();
+                                if (popup && popup.isOpen() && popup !== newPopup) {
+                                    try {
+                                        popup.closePopup(true); // Force close
+                                    } catch(err) {}
+                                }
+                            }
+                        });
+                        
+                        // Also close any popup that's currently open via map (if not the new one)
+                        var newPopup = clickedLayer.getPopup();
+                        if (map._popup && map._popup.isOpen() && map._popup !== newPopup) {
+                            try {
+                                map._popup.closePopup(true); // Force close
+                            } catch(err) {}
+                        }
+                    }, 50); // Delay to let Leaflet open the new popup first
+                    
+                    // Find the park data for this marker
+                    for (var i = 0; i < window.parkData.length; i++) {
+                        var park = window.parkData[i];
+                        if (Math.abs(park.lat - markerLat) < 0.01 && Math.abs(park.lon - markerLon) < 0.01) {
+                            highlightNearbyParks(park, clickedLayer);
+                            
+                            // Track the popup when it opens - wait a bit for popup to be created
+                            setTimeout(function() {
+                                var popup = clickedLayer.getPopup();
+                                if (popup && popup.isOpen()) {
+                                    currentPopup = popup;
+                                    console.log('Tracking popup for highlights');
+                                }
+                            }, 100);
+                            break;
+                        }
+                    }
+                });
+            }
+        });
+        
+        // Listen for popup open/close events
+        map.on('popupopen', function(e) {
+            currentPopup = e.popup;
+            console.log('Popup opened, setting z-index and keeping highlights');
+            // Set high z-index to bring popup above other panels
+            setTimeout(function() {
+                if (e.popup._container) {
+                    e.popup._container.style.zIndex = '99999';
+                    e.popup._container.style.setProperty('z-index', '99999', 'important');
+                    // Also set on the popup pane
+                    var popupPane = e.popup._container.closest('.leaflet-popup-pane');
+                    if (popupPane) {
+                        popupPane.style.zIndex = '99999';
+                        popupPane.style.setProperty('z-index', '99999', 'important');
+                    }
+                }
+            }, 10);
+        });
+        
+        map.on('popupclose', function(e) {
+            console.log('Popup closed, resetting highlights');
+            if (currentPopup === e.popup || !currentPopup || !currentPopup.isOpen()) {
+                resetHighlights();
+            }
+        });
+        
+        // Don't reset highlights on map click - only reset when popup closes
+        // Removed the map click handler that was resetting highlights
+        
+        console.log('Park highlighting setup complete');
+    }, 3000);
+}
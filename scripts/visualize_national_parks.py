@@ -1,17 +1,14 @@
-import csv
+import os
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from collections import Counter
 import re
+from catalog_binary import load_packed_catalog
 
-# Read the CSV file
-csv_path = '/Users/srivaranasi/Library/CloudStorage/GoogleDrive-pvsvnc04@gmail.com/My Drive/PVSVNC_Documents/Sri/Sri_Gigs/US  Light houses/US_National_Parks.csv'
-
-parks_data = []
-with open(csv_path, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        parks_data.append(row)
+# Load US National Parks from the shared catalog
+with load_packed_catalog() as catalog:
+    parks = catalog.subset(catalog.where(source='US_National_Parks.csv'))
+parks_data = parks.rows()
 
 print(f"Loaded {len(parks_data)} National Parks")
 
@@ -26,19 +23,10 @@ for park in parks_data:
             state_counts[state] += 1
 
 # Extract coordinates
-latitudes = []
-longitudes = []
-names = []
-for park in parks_data:
-    try:
-        lat = float(park.get('Latitude', 0))
-        lon = float(park.get('Longitude', 0))
-        if lat != 0 and lon != 0:
-            latitudes.append(lat)
-            longitudes.append(lon)
-            names.append(park.get('Name', 'Unknown'))
-    except (ValueError, TypeError):
-        continue
+with_coordinates = parks.has_coordinates
+latitudes = parks.lat[with_coordinates].tolist()
+longitudes = parks.lon[with_coordinates].tolist()
+names = [name for name, valid in zip(parks.names, with_coordinates) if valid]
 
 # Create figure with multiple subplots
 fig = plt.figure(figsize=(16, 12))
@@ -120,7 +108,7 @@ ax4.legend(fontsize=8)
 plt.tight_layout()
 
 # Save the figure
-output_path = '/Users/srivaranasi/Library/CloudStorage/GoogleDrive-pvsvnc04@gmail.com/My Drive/PVSVNC_Documents/Sri/Sri_Gigs/US  Light houses/national_parks_visualization.png'
+output_path = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'national_parks_visualization.png'))
 plt.savefig(output_path, dpi=300, bbox_inches='tight')
 print(f"\nVisualization saved to: {output_path}")
 
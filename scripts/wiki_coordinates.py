@@ -0,0 +1,109 @@
+"""
+Coordinate extraction from Wikipedia article HTML without building a DOM
+Finds the first span.geo (else the first geohack link) outside HTML comments
+with byte regexes and only decodes the few hundred bytes around the match, returning the same
+(lat, lon) as the BeautifulSoup lookup the scrapers used before
+"""
+
+import html
+import re
+
+# Any <span ...geo...> tag; the class list is checked separately for the exact "geo" token
+SPAN_WITH_GEO = re.compile(rb'<span\b[^>]*geo[^>]*>', re.IGNORECASE)
+# Any <a ...geohack...> tag; the href is checked separately after entity decoding
+LINK_WITH_GEOHACK = re.compile(rb'<a\b[^>]*geohack[^>]*>', re.IGNORECASE)
+
+CLASS_ATTRIBUTE = re.compile(rb'\sclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', re.IGNORECASE)
+HREF_ATTRIBUTE = re.compile(rb'\shref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', re.IGNORECASE)
+SPAN_TAG = re.compile(rb'<(/?)span\b[^>]*>', re.IGNORECASE)
+ANY_TAG = re.compile(rb'<!--.*?-->|<[^>]*>', re.DOTALL)
+COMMENT = re.compile(rb'<!--.*?-->', re.DOTALL)
+
+
+def _attribute(pattern, tag):
+    match = pattern.search(tag)
+    if match is None:
+        return None
+    value = next(group for group in match.groups() if group is not None)
+    return html.unescape(value.decode('utf-8', 'replace'))
+
+
+def _span_text(content, start):
+    """Text inside the span whose opening tag ends at start, like Tag.get_text()"""
+    depth = 1
+    position = start
+    while depth:
+        match = SPAN_TAG.search(content, position)
+        if match is None:
+            end = len(content)
+            break
+        depth += -1 if match.group(1) else 1
+        position = match.end()
+        end = match.start()
+    inner = ANY_TAG.sub(b'', content[start:end])
+    return html.unescape(inner.decode('utf-8', 'replace'))
+
+
+def parse_geohack_params(href):
+    """(lat, lon) from a geohack URL such as ...&params=28.5931_N_83.6250_E, or (None, None)"""
+    if 'params=' in href:
+        params = href.split('params=')[1].split('&')[0]
+        parts = params.split('_')
+        if len(parts) >= 4:
+            try:
+                lat = float(parts[0])
+                if parts[1] == 'S':
+                    lat = -lat
+                lon = float(parts[2])
+                if parts[3] == 'W':
+                    lon = -lon
+                return lat, lon
+            except ValueError:
+                pass
+    return None, None
+
+
+def first_geo_span_text(content):
+    """Text of the first <span class="... geo ...">, or None"""
+    for match in SPAN_WITH_GEO.finditer(content):
+        classes = _attribute(CLASS_ATTRIBUTE, match.group(0))
+        if classes is not None and 'geo' in classes.split():
+            return _span_text(content, match.end())
+    return None
+
+
+def first_geohack_href(content):
+    """href of the first link pointing at geohack, or None"""
+    for match in LINK_WITH_GEOHACK.finditer(content):
+        href = _attribute(HREF_ATTRIBUTE, match.group(0))
+        if href and 'geohack' in href:
+            return href
+    return None
+
+
+def extract_coordinates(content):
+    """
+    (lat, lon) from a Wikipedia page, or (None, None).
+
+    The infobox span.geo ("27.5; 84.4") wins; otherwise the first geohack
+    link's params are used, with S and W turning the value negative.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    # A span.geo or geohack link inside an HTML comment is not part of the page
+    if b'<!--' in content:
+        content = COMMENT.sub(b'', content)
+
+    text = first_geo_span_text(content)
+    if text is not None and ';' in text:
+        parts = text.split(';')
+        if len(parts) == 2:
+            try:
+                return float(parts[0].strip()), float(parts[1].strip())
+            except ValueError:
+                pass
+
+    href = first_geohack_href(content)
+    if href:
+        return parse_geohack_params(href)
+    return None, None
@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react'
 import './AttractionSearch.css'
 
-function AttractionSearch({ parks, onSearch, onSelectAttraction }) {
+function AttractionSearch({ parks, search, autocomplete, onSearch, onSelectAttraction }) {
   const [searchQuery, setSearchQuery] = useState('')
   const [isOpen, setIsOpen] = useState(false)
   const [filteredResults, setFilteredResults] = useState([])
@@ -15,6 +15,18 @@ function AttractionSearch({ parks, onSearch, onSelectAttraction }) {
       return
     }
 
+    // Name completions first, then ranked full-text matches, when the
+    // prebuilt indexes are loaded and find something
+    const completions = autocomplete ? autocomplete(searchQuery, 10) : []
+    const indexed = search ? search(searchQuery, 10) : null
+    if (completions.length > 0 || (indexed && indexed.length > 0)) {
+      const ids = new Set(completions.map(park => park.id))
+      const extra = (indexed || []).filter(park => !ids.has(park.id))
+      setFilteredResults([...completions, ...extra].slice(0, 10))
+      onSearch(searchQuery)
+      return
+    }
+
     const query = searchQuery.toLowerCase().trim()
     const results = parks
       .filter(park => {
@@ -32,7 +44,7 @@ function AttractionSearch({ parks, onSearch, onSelectAttraction }) {
     
     setFilteredResults(results)
     onSearch(searchQuery)
-  }, [searchQuery, parks, onSearch])
+  }, [searchQuery, parks, search, autocomplete, onSearch])
 
   const handleSelect = (park) => {
     setSearchQuery(park.Name || '')
@@ -3,6 +3,7 @@ import { createPortal } from 'react-dom'
 import { findNearbyParks, findNearbyAirports, calculateDistance } from '../services/dataService'
 // Note: Nominatim API calls removed due to CORS restrictions
 // Using location extraction from nearby attractions and airports instead
+import { reverseGeocodeOffline } from '../services/geocodingService'
 import { isPlaceVisited } from '../services/visitedPlacesService'
 import { formatCoordinates } from '../utils/coordinateFormatter'
 import './CustomPinModal.css'
@@ -56,8 +57,43 @@ const CustomPinModal = ({
         'Shirdi', 'Tirumala', 'Tiruchirappalli', 'Thanjavur', 'Chidambaram', 'Kumbakonam'
       ]
       
-      // Reverse geocoding function using BigDataCloud API (free, no API key, no CORS issues)
+      // Suggestion for a reverse geocoded city, labelled "City, State"
+      const cityLocation = (finalCity, state, country, distance) => {
+        let cityName = finalCity.trim()
+        
+        // Add state if available and different from city
+        if (state && !cityName.toLowerCase().includes(state.toLowerCase())) {
+          // For India, use full state name
+          if (country === 'India' || country === 'IN') {
+            cityName = `${cityName}, ${state}`
+          } else if (country === 'United States' && state.length > 3) {
+            // For US, try to abbreviate
+            const stateAbbr = state.split(' ').map(w => w[0]).join('').toUpperCase()
+            cityName = `${cityName}, ${stateAbbr}`
+          } else {
+            cityName = `${cityName}, ${state}`
+          }
+        }
+        
+        return {
+          name: cityName,
+          fullName: cityName,
+          source: 'reverseGeocode',
+          distance: distance,
+          city: finalCity,
+          state: state,
+          country: country
+        }
+      }
+      
+      // Reverse geocoding function: the bundled offline index first, then
+      // BigDataCloud API (free, no API key, no CORS issues) when it has no city nearby
       const reverseGeocodeCity = async (lat, lon) => {
+        const offline = await reverseGeocodeOffline(lat, lon)
+        if (offline && offline.city) {
+          return cityLocation(offline.city, offline.state, offline.country, offline.distance)
+        }
+        
         try {
           const response = await fetch(
             `https://api.bigdatacloud.net/data/reverse-geocode-client?latitude=${lat}&longitude=${lon}&localityLanguage=en`,
@@ -154,31 +190,7 @@ const CustomPinModal = ({
           }
           
           if (finalCity) {
-            let cityName = finalCity.trim()
-            
-            // Add state if available and different from city
-            if (state && !cityName.toLowerCase().includes(state.toLowerCase())) {
-              // For India, use full state name
-              if (isIndia) {
-                cityName = `${cityName}, ${state}`
-              } else if (country === 'United States' && state.length > 3) {
-                // For US, try to abbreviate
-                const stateAbbr = state.split(' ').map(w => w[0]).join('').toUpperCase()
-                cityName = `${cityName}, ${stateAbbr}`
-              } else {
-                cityName = `${cityName}, ${state}`
-              }
-            }
-            
-            return {
-              name: cityName,
-              fullName: cityName,
-              source: 'reverseGeocode',
-              distance: 0, // Exact location
-              city: finalCity,
-              state: state,
-              country: country
-            }
+            return cityLocation(finalCity, state, country, 0) // Exact location
           }
           
           return null
@@ -1,30 +1,36 @@
 import { useEffect, useState } from 'react'
 import { useMap, useMapEvents } from 'react-leaflet'
 
-// Component to track current map view (center and zoom)
+// Current view of the map: center, zoom and bounds ({ west, south, east, north })
+const viewOf = (map) => {
+  const bounds = map.getBounds()
+  return {
+    center: map.getCenter(),
+    zoom: map.getZoom(),
+    bounds: {
+      west: bounds.getWest(),
+      south: bounds.getSouth(),
+      east: bounds.getEast(),
+      north: bounds.getNorth()
+    }
+  }
+}
+
+// Component to track current map view (center, zoom and bounds)
 function MapViewTracker({ onViewChange }) {
   const map = useMap()
-  const [currentView, setCurrentView] = useState({
-    center: map.getCenter(),
-    zoom: map.getZoom()
-  })
+  const [currentView, setCurrentView] = useState(() => viewOf(map))
 
   useMapEvents({
     moveend: () => {
-      const newView = {
-        center: map.getCenter(),
-        zoom: map.getZoom()
-      }
+      const newView = viewOf(map)
       setCurrentView(newView)
       if (onViewChange) {
         onViewChange(newView)
       }
     },
     zoomend: () => {
-      const newView = {
-        center: map.getCenter(),
-        zoom: map.getZoom()
-      }
+      const newView = viewOf(map)
       setCurrentView(newView)
       if (onViewChange) {
         onViewChange(newView)
@@ -34,10 +40,7 @@ function MapViewTracker({ onViewChange }) {
 
   useEffect(() => {
     // Initial view
-    const initialView = {
-      center: map.getCenter(),
-      zoom: map.getZoom()
-    }
+    const initialView = viewOf(map)
     setCurrentView(initialView)
     if (onViewChange) {
       onViewChange(initialView)
@@ -48,4 +51,3 @@ function MapViewTracker({ onViewChange }) {
 }
 
 export default MapViewTracker
-
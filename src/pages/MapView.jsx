@@ -3,7 +3,7 @@ import { MapContainer, TileLayer, Marker, Popup, FeatureGroup, LayerGroup, useMa
 import L from 'leaflet'
 import 'leaflet/dist/leaflet.css'
 import 'leaflet.heat'
-import { loadParksData, loadAirportsData, findNearbyAirports, findNearbyParks, categorizeParksByRegion, calculateDistance } from '../services/dataService'
+import { loadParksData, loadAirportsData, loadNearbyIndex, createNearbyLookup, loadSearchIndex, createAttractionSearch, loadAutocomplete, createAutocomplete, loadClusters, createClusterLookup, thinParks, findNearbyAirports, findNearbyParks, categorizeParksByRegion, calculateDistance } from '../services/dataService'
 import { loadVisitedPlaces, markAsVisited, markAsNotVisited, isPlaceVisited, getVisitedCount, loadUserProfile, saveUserProfile, syncVisitedPlaces } from '../services/visitedPlacesService'
 import { loadCustomPins, addCustomPin, deleteCustomPin, syncCustomPins } from '../services/customPinsService'
 import { onAuthStateChange, getCurrentUser } from '../services/authService'
@@ -177,6 +177,10 @@ function LakesLayer({ data }) {
 function MapView() {
   const [parks, setParks] = useState([])
   const [airports, setAirports] = useState([])
+  const [nearbyIndex, setNearbyIndex] = useState(null)
+  const [searchIndex, setSearchIndex] = useState(null)
+  const [autocompleteIndex, setAutocompleteIndex] = useState(null)
+  const [clusterIndex, setClusterIndex] = useState(null)
   const [loading, setLoading] = useState(true)
   const [selectedRegion, setSelectedRegion] = useState(null)
   const [countryBoundaries, setCountryBoundaries] = useState(null)
@@ -316,12 +320,20 @@ function MapView() {
   useEffect(() => {
     const loadData = async () => {
       try {
-        const [parksData, airportsData] = await Promise.all([
+        const [parksData, airportsData, nearbyIndexData, searchIndexData, autocompleteData, clusterData] = await Promise.all([
           loadParksData(),
-          loadAirportsData()
+          loadAirportsData(),
+          loadNearbyIndex(),
+          loadSearchIndex(),
+          loadAutocomplete(),
+          loadClusters()
         ])
         setParks(parksData)
         setAirports(airportsData)
+        setNearbyIndex(nearbyIndexData)
+        setSearchIndex(searchIndexData)
+        setAutocompleteIndex(autocompleteData)
+        setClusterIndex(clusterData)
         setLoading(false)
       } catch (error) {
         console.error('Error loading data:', error)
@@ -372,6 +384,30 @@ function MapView() {
     return categorizeParksByRegion(parks)
   }, [parks])
 
+  const nearbyLookup = useMemo(() => {
+    return createNearbyLookup(nearbyIndex, parks, airports)
+  }, [nearbyIndex, parks, airports])
+
+  const attractionSearch = useMemo(() => {
+    return createAttractionSearch(searchIndex, parks)
+  }, [searchIndex, parks])
+
+  const autocomplete = useMemo(() => {
+    return createAutocomplete(autocompleteIndex, parks)
+  }, [autocompleteIndex, parks])
+
+  const clusterLookup = useMemo(() => {
+    return createClusterLookup(clusterIndex)
+  }, [clusterIndex])
+
+  // Ids matching the search box, or null to fall back to substring matching
+  // when the index is not loaded or finds nothing
+  const searchMatches = useMemo(() => {
+    if (!attractionSearch || !searchQuery || searchQuery.trim() === '') return null
+    const matches = attractionSearch(searchQuery, null)
+    return matches && matches.length > 0 ? new Set(matches.map(park => park.id)) : null
+  }, [attractionSearch, searchQuery])
+
   // Determine which attraction types are available in the currently visible regions
   const availableAttractionTypes = useMemo(() => {
     const availableTypes = new Set()
@@ -1021,6 +1057,9 @@ function MapView() {
       if (!searchQuery || searchQuery.trim() === '') {
         return true
       }
+      if (searchMatches) {
+        return searchMatches.has(park.id)
+      }
       
       const query = searchQuery.toLowerCase().trim()
       const name = (park.Name || '').toLowerCase()
@@ -1033,7 +1072,28 @@ function MapView() {
              country.includes(query) ||
              states.includes(query)
     })
-  }, [parks, visibleRegions, visibleAttractionTypes, searchQuery, currentMapView, visitedPlaces, showVisitedOnly, showUnvisitedOnly])
+  }, [parks, visibleRegions, visibleAttractionTypes, searchQuery, searchMatches, currentMapView, visitedPlaces, showVisitedOnly, showUnvisitedOnly])
+
+  // At zooms 2-5 the filtered parks are grouped into the precomputed clusters,
+  // so the map draws one marker per cluster; null at higher zooms
+  const mapZoom = currentMapView ? currentMapView.zoom : null
+  const clusteredParks = useMemo(() => {
+    if (!clusterLookup || mapZoom === null || mapZoom === undefined) return null
+    return clusterLookup(filteredParks, mapZoom)
+  }, [clusterLookup, filteredParks, mapZoom])
+
+  // Past the cluster zooms, the filtered parks around the view, thinned for the
+  // zoom, so the markers stay bounded by the viewport. Search results and the
+  // attraction being opened are drawn even where thinning would hide them
+  const markerParks = useMemo(() => {
+    if (clusteredParks) return clusteredParks.markers
+    if (!currentMapView || !currentMapView.bounds || (searchQuery && searchQuery.trim() !== '')) return filteredParks
+    const shown = thinParks(filteredParks, currentMapView.bounds, currentMapView.zoom)
+    if (selectedParkForPopup && !shown.includes(selectedParkForPopup) && filteredParks.includes(selectedParkForPopup)) {
+      shown.push(selectedParkForPopup)
+    }
+    return shown
+  }, [clusteredParks, currentMapView, filteredParks, searchQuery, selectedParkForPopup])
   
   // Debug logging
   useEffect(() => {
@@ -1333,6 +1393,17 @@ function MapView() {
     </div>`
   }
 
+  const getClusterIcon = (count) => {
+    // Sized by how many attractions the cluster holds
+    const size = count < 10 ? 30 : count < 100 ? 36 : 44
+    return L.divIcon({
+      className: 'cluster-marker',
+      html: `<div class="cluster-marker-icon" style="width: ${size}px; height: ${size}px;">${count}</div>`,
+      iconSize: [size, size],
+      iconAnchor: [size / 2, size / 2]
+    })
+  }
+
   const getParkIcon = (park) => {
     // Check if place is visited
     const visited = isPlaceVisited(park, visitedPlaces)
@@ -2039,6 +2110,8 @@ function MapView() {
     <div className="map-view">
       <AttractionSearch
         parks={parks}
+        search={attractionSearch}
+        autocomplete={autocomplete}
         onSearch={handleSearch}
         onSelectAttraction={handleSelectAttraction}
       />
@@ -2109,8 +2182,19 @@ function MapView() {
         <TooltipZIndexFix />
         <PopupPositionRestore />
         
+        {/* Cluster Markers - clicking one zooms to the parks inside it */}
+        {clusteredParks && clusteredParks.clusters.map(cluster => (
+          <Marker
+            key={cluster.id}
+            position={[cluster.lat, cluster.lon]}
+            icon={getClusterIcon(cluster.count)}
+            title={`${cluster.count} attractions`}
+            eventHandlers={{ click: () => setMapFocus({ bounds: cluster.bounds }) }}
+          />
+        ))}
+
         {/* Park Markers */}
-        {filteredParks.map((park, index) => {
+        {markerParks.map((park, index) => {
           // Skip invalid park objects
           if (!park || typeof park !== 'object') {
             return null
@@ -2187,14 +2271,16 @@ function MapView() {
             }
           }
 
-          const nearbyAirports = findNearbyAirports(lat, lon, airports, 200)
+          // Use the precomputed nearby index when available, otherwise scan
+          const precomputedNearby = nearbyLookup ? nearbyLookup(park.id) : null
+          const nearbyAirports = precomputedNearby ? precomputedNearby.airports : findNearbyAirports(lat, lon, airports, 200)
           
           // Determine nearby parks radius based on country
           // Asian countries: 100 km, others: 300 miles
           const asianCountries = ['India', 'Nepal', 'Sri Lanka', 'China', 'Japan', 'South Korea', 'North Korea', 'Thailand', 'Vietnam', 'Indonesia', 'Malaysia', 'Philippines', 'Singapore', 'Bangladesh', 'Pakistan', 'Myanmar', 'Cambodia', 'Laos', 'Mongolia', 'Bhutan', 'Maldives', 'Afghanistan']
           const isAsianCountry = asianCountries.includes(country)
           const nearbyParksRadius = isAsianCountry ? 62.1371 : 300 // 100 km = 62.1371 miles
-          const nearbyParks = findNearbyParks(lat, lon, park.Name, parks, nearbyParksRadius)
+          const nearbyParks = precomputedNearby ? precomputedNearby.parks : findNearbyParks(lat, lon, park.Name, parks, nearbyParksRadius)
           
           // (country already declared above)
           let locationLabel = 'State(s)'
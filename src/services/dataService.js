@@ -30,9 +30,69 @@ export const loadCSVData = async (filename) => {
 }
 
 /**
- * Load all parks data (US, Canadian, and Indian)
+ * Load the merged catalog written by scripts/build_world_catalog.py
+ * Returns null if the file is missing so loadParksData falls back to the CSVs
+ */
+export const loadWorldCatalog = async () => {
+  try {
+    const response = await fetch('/data/world_catalog.json')
+    if (!response.ok) return null
+    return await response.json()
+  } catch (error) {
+    console.error('Error loading world catalog:', error)
+    return null
+  }
+}
+
+/**
+ * Park objects for the rows of the merged catalog, in the same shape the CSV
+ * loaders produce plus the precomputed Region and Category. Pass categories to expand only
+ * those, using the catalog's per-category offsets
+ */
+export const expandWorldCatalog = (worldCatalog, categories = null) => {
+  const column = Object.fromEntries(worldCatalog.fields.map((field, i) => [field, i]))
+  const parks = []
+  Object.entries(worldCatalog.categories).forEach(([category, [start, count]]) => {
+    if (categories && !categories.includes(category)) return
+    for (let i = start; i < start + count; i++) {
+      const row = worldCatalog.rows[i]
+      const park = {
+        id: row[column.id],
+        Park_Code: row[column.Park_Code],
+        Name: row[column.Name],
+        Designation: row[column.Designation],
+        States: row[column.States],
+        Latitude: String(row[column.Latitude]),
+        Longitude: String(row[column.Longitude]),
+        Description: row[column.Description],
+        URL: row[column.URL],
+        Country: worldCatalog.Country[row[column.Country]],
+        Region: worldCatalog.Region[row[column.Region]],
+        Category: category
+      }
+      const categoryField = worldCatalog.category_field[row[column.category_field]]
+      if (categoryField) park[categoryField] = category
+      if (row[column.extras]) Object.assign(park, row[column.extras])
+      parks.push(park)
+    }
+  })
+  return parks
+}
+
+/**
+ * Load all parks data, from the merged catalog when it has been built and
+ * from the individual CSV files otherwise
  */
 export const loadParksData = async () => {
+  const worldCatalog = await loadWorldCatalog()
+  if (worldCatalog) return expandWorldCatalog(worldCatalog)
+  return loadParksDataFromCSV()
+}
+
+/**
+ * Load all parks data (US, Canadian, and Indian) from the individual CSV files
+ */
+const loadParksDataFromCSV = async () => {
   try {
     const [usParks, usMostPhotographed, canadianParks, canadianMostPhotographed, indianParks, indianUnescoSites, indianJyotirlinga, indianShaktiPeethas, indianOtherTemples, indianMatham, indianDivyaDesams, indianForts, nepalParks, nepalTemples, nepalUnescoSites, nepalTrekkingFlights, sriLankaParks, sriLankaTemples, sriLankaUnescoSites, costaRicaParks, costaRicaUnescoSites, africanParks, chinaUnescoSites, japanUnescoSites, southKoreaUnescoSites, northKoreaUnescoSites, mongoliaUnescoSites, thailandUnescoSites, indonesiaUnescoSites, vietnamUnescoSites, cambodiaUnescoSites, myanmarUnescoSites, philippinesUnescoSites, malaysiaUnescoSites, singaporeUnescoSites, laosUnescoSites, bruneiUnescoSites, eastTimorUnescoSites, bangladeshUnescoSites, pakistanUnescoSites, afghanistanUnescoSites, bhutanUnescoSites, maldivesUnescoSites, kazakhstanUnescoSites, kyrgyzstanUnescoSites, tajikistanUnescoSites, turkmenistanUnescoSites, uzbekistanUnescoSites, iranUnescoSites, iraqUnescoSites, jordanUnescoSites, lebanonUnescoSites, saudiArabiaUnescoSites, syriaUnescoSites, turkeyUnescoSites, uaeUnescoSites, yemenUnescoSites, omanUnescoSites, qatarUnescoSites, kuwaitUnescoSites, bahrainUnescoSites, israelUnescoSites, palestineUnescoSites, belizeUnescoSites, guatemalaUnescoSites, hondurasUnescoSites, elSalvadorUnescoSites, nicaraguaUnescoSites, panamaUnescoSites, mexicoUnescoSites, usUnescoSites, canadaUnescoSites, asiaMostPhotographed] = await Promise.all([
       loadCSVData('US_National_Parks.csv'),
@@ -863,6 +923,603 @@ export const findNearbyParks = (parkLat, parkLon, parkName, allParks, radius = 3
     .slice(0, 5) // Top 5 closest
 }
 
+/**
+ * Load the precomputed nearby index written by scripts/build_nearby_index.py
+ * Returns null if the file is missing so callers fall back to findNearby*
+ */
+export const loadNearbyIndex = async () => {
+  try {
+    const response = await fetch('/data/nearby_index.json')
+    if (!response.ok) return null
+    return await response.json()
+  } catch (error) {
+    console.error('Error loading nearby index:', error)
+    return null
+  }
+}
+
+/**
+ * Build a lookup from park id to precomputed nearby airports and parks
+ * Results have the same shape as findNearbyAirports/findNearbyParks
+ */
+export const createNearbyLookup = (nearbyIndex, allParks, airports) => {
+  if (!nearbyIndex) return null
+
+  const parksById = new Map(allParks.map(park => [park.id, park]))
+  const airportsByIata = new Map(airports.map(airport => [airport.IATA, airport]))
+  const rowById = new Map(nearbyIndex.attractions.map((id, row) => [id, row]))
+
+  return (parkId) => {
+    const row = rowById.get(parkId)
+    if (row === undefined) return null
+
+    const nearbyAirports = []
+    const airportRow = nearbyIndex.nearby_airports[row]
+    for (let i = 0; i < airportRow.length && nearbyAirports.length < 5; i += 2) {
+      const airport = airportsByIata.get(nearbyIndex.airports[airportRow[i]])
+      if (!airport) continue
+      nearbyAirports.push({
+        name: airport.Name || '',
+        iata: airport.IATA || '',
+        city: airport.City || '',
+        distance: airportRow[i + 1] / 10
+      })
+    }
+
+    const nearbyParks = []
+    const parkRow = nearbyIndex.nearby_parks[row]
+    for (let i = 0; i < parkRow.length && nearbyParks.length < 5; i += 2) {
+      const park = parksById.get(nearbyIndex.attractions[parkRow[i]])
+      if (!park) continue
+      nearbyParks.push({
+        name: park.Name,
+        distance: parkRow[i + 1] / 10,
+        lat: parseFloat(park.Latitude),
+        lon: parseFloat(park.Longitude)
+      })
+    }
+
+    return { airports: nearbyAirports, parks: nearbyParks }
+  }
+}
+
+/**
+ * Load the precomputed low-zoom clusters written by scripts/build_clusters.py
+ * Returns null if the file is missing so callers draw individual markers
+ */
+export const loadClusters = async () => {
+  try {
+    const response = await fetch('/data/clusters.json')
+    if (!response.ok) return null
+    return await response.json()
+  } catch (error) {
+    console.error('Error loading clusters:', error)
+    return null
+  }
+}
+
+/**
+ * Build a function grouping the parks being shown into the precomputed
+ * clusters of a zoom level. cluster(parks, zoom) returns null above the
+ * precomputed range, so every park is drawn as its own marker; otherwise
+ * { clusters, markers }: the clusters holding two or more of the given parks,
+ * with their precomputed centroid, the count of those parks and their
+ * bounds, and the parks still drawn as markers (alone in their cluster or
+ * missing from the index). Counts follow whatever filters produced parks
+ */
+export const createClusterLookup = (clusterIndex) => {
+  if (!clusterIndex) return null
+
+  const { min_zoom: minZoom, max_zoom: maxZoom, zooms, attractions } = clusterIndex
+  const attractionIndex = new Map(attractions.map((id, i) => [id, i]))
+
+  // Cluster of every attraction at each zoom. Clusters at max_zoom list their
+  // attractions; clusters above list their child clusters one zoom deeper
+  const clusterOf = {}
+  clusterOf[maxZoom] = new Int32Array(attractions.length)
+  zooms[String(maxZoom)].forEach((row, cluster) => {
+    row[4].forEach(attraction => { clusterOf[maxZoom][attraction] = cluster })
+  })
+  for (let zoom = maxZoom - 1; zoom >= minZoom; zoom--) {
+    const parentOf = new Int32Array(zooms[String(zoom + 1)].length)
+    zooms[String(zoom)].forEach((row, cluster) => {
+      row[4].forEach(child => { parentOf[child] = cluster })
+    })
+    clusterOf[zoom] = clusterOf[zoom + 1].map(child => parentOf[child])
+  }
+
+  return (parks, zoom) => {
+    const level = Math.max(Math.floor(zoom), minZoom)
+    if (level > maxZoom) return null
+
+    const members = new Map()
+    const markers = []
+    parks.forEach(park => {
+      const attraction = attractionIndex.get(park.id)
+      if (attraction === undefined) {
+        markers.push(park)
+        return
+      }
+      const cluster = clusterOf[level][attraction]
+      if (!members.has(cluster)) members.set(cluster, [])
+      members.get(cluster).push(park)
+    })
+
+    const clusters = []
+    members.forEach((clusterParks, cluster) => {
+      if (clusterParks.length === 1) {
+        markers.push(clusterParks[0])
+        return
+      }
+      const lats = clusterParks.map(park => parseFloat(park.Latitude))
+      const lons = clusterParks.map(park => parseFloat(park.Longitude))
+      const [lat, lon] = zooms[String(level)][cluster]
+      clusters.push({
+        id: `${level}-${cluster}`,
+        lat,
+        lon,
+        count: clusterParks.length,
+        bounds: [[Math.min(...lats), Math.min(...lons)], [Math.max(...lats), Math.max(...lons)]]
+      })
+    })
+    return { clusters, markers }
+  }
+}
+
+/**
+ * Split text into search terms the same way scripts/build_search_index.py does:
+ * accents stripped, lowercased, runs of ASCII letters and digits
+ */
+export const tokenize = (text) => {
+  return (text || '').normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase().match(/[a-z0-9]+/g) || []
+}
+
+/**
+ * Load the full-text search index written by scripts/build_search_index.py
+ * Returns null if the file is missing so callers fall back to scanning
+ */
+export const loadSearchIndex = async () => {
+  try {
+    const response = await fetch('/data/search_index.json')
+    if (!response.ok) return null
+    return await response.json()
+  } catch (error) {
+    console.error('Error loading search index:', error)
+    return null
+  }
+}
+
+/**
+ * Build a search function over the full-text index. search(query, limit)
+ * returns the parks matching every query word as a word prefix, best first,
+ * reading only the postings of the matching terms. It returns null when the
+ * query has no words
+ */
+export const createAttractionSearch = (searchIndex, allParks) => {
+  if (!searchIndex) return null
+
+  const parksById = new Map(allParks.map(park => [park.id, park]))
+  const { terms, postings, attractions } = searchIndex
+  const lowerBound = (value, start) => {
+    let low = start
+    let high = terms.length
+    while (low < high) {
+      const middle = (low + high) >> 1
+      if (terms[middle] < value) low = middle + 1
+      else high = middle
+    }
+    return low
+  }
+
+  return (query, limit = 10) => {
+    const tokens = [...new Set(tokenize(query))]
+    if (tokens.length === 0) return null
+
+    let totals = null
+    for (const token of tokens) {
+      const start = lowerBound(token, 0)
+      const end = lowerBound(token + '\uffff', start)
+      // Best score per document over the terms this token is a prefix of
+      const matches = new Map()
+      for (let t = start; t < end; t++) {
+        const posting = postings[t]
+        let document = 0
+        for (let i = 0; i < posting.length; i += 2) {
+          document += posting[i]
+          if (posting[i + 1] > (matches.get(document) || 0)) matches.set(document, posting[i + 1])
+        }
+      }
+      if (totals === null) {
+        totals = matches
+      } else {
+        const combined = new Map()
+        totals.forEach((score, document) => {
+          if (matches.has(document)) combined.set(document, score + matches.get(document))
+        })
+        totals = combined
+      }
+      if (totals.size === 0) return []
+    }
+
+    const results = []
+    const ranked = [...totals].sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    for (const [document] of ranked) {
+      const park = parksById.get(attractions[document])
+      if (!park) continue
+      results.push(park)
+      if (limit !== null && results.length >= limit) break
+    }
+    return results
+  }
+}
+
+/**
+ * Load the name autocomplete index written by scripts/build_autocomplete.py
+ * Returns null if the file is missing
+ */
+export const loadAutocomplete = async () => {
+  try {
+    const response = await fetch('/data/autocomplete.json')
+    if (!response.ok) return null
+    return await response.json()
+  } catch (error) {
+    console.error('Error loading autocomplete index:', error)
+    return null
+  }
+}
+
+/**
+ * Build a name completion function over the autocomplete index, the same
+ * lookup as complete() in scripts/build_autocomplete.py. complete(query, limit)
+ * returns parks whose name or alias starts with query, then, if there are
+ * fewer than limit, parks matching with one query word off by a single typo
+ */
+export const createAutocomplete = (autocompleteIndex, allParks) => {
+  if (!autocompleteIndex) return null
+
+  const parksById = new Map(allParks.map(park => [park.id, park]))
+  const { nodes, words, trigrams, attractions } = autocompleteIndex
+  const FUZZY_MIN_LENGTH = 4
+  const FUZZY_CANDIDATES = 10
+
+  // Completions stored at the trie node the prefix ends in
+  const lookup = (prefix) => {
+    let node = 0
+    let position = 0
+    while (position < prefix.length) {
+      const child = nodes[node][1].find(c => nodes[c][0][0] === prefix[position])
+      if (child === undefined) return []
+      const label = nodes[child][0]
+      if (!label.startsWith(prefix.slice(position, position + label.length))) return []
+      node = child
+      position += label.length
+    }
+    return nodes[node][2]
+  }
+
+  const editDistance = (a, b, prefix) => {
+    let previous = Array.from({ length: b.length + 1 }, (_, j) => j)
+    for (let i = 1; i <= a.length; i++) {
+      const current = [i]
+      for (let j = 1; j <= b.length; j++) {
+        current.push(Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1)))
+      }
+      previous = current
+    }
+    return prefix ? Math.min(...previous) : previous[b.length]
+  }
+
+  // Vocabulary words one edit away, found through shared start-padded trigrams
+  const corrections = (word, prefix) => {
+    const padded = '$$' + word
+    const grams = new Set()
+    for (let i = 0; i < word.length; i++) grams.add(padded.slice(i, i + 3))
+    const needed = grams.size - 3
+    if (word.length < FUZZY_MIN_LENGTH || needed < 1) return []
+    const shared = new Map()
+    grams.forEach(gram => {
+      let candidate = 0
+      for (const gap of trigrams[gram] || []) {
+        candidate += gap
+        shared.set(candidate, (shared.get(candidate) || 0) + 1)
+      }
+    })
+    const found = []
+    const candidates = [...shared].filter(([, count]) => count >= needed).map(([candidate]) => candidate).sort((a, b) => a - b)
+    for (const candidate of candidates) {
+      const other = words[candidate]
+      if (other !== word && editDistance(word, other, prefix) <= 1) {
+        found.push(other)
+        if (found.length >= FUZZY_CANDIDATES) break
+      }
+    }
+    return found
+  }
+
+  return (query, limit = 10) => {
+    const queryWords = tokenize(query)
+    if (queryWords.length === 0) return []
+    const documents = [...lookup(queryWords.join(' '))]
+    queryWords.forEach((word, position) => {
+      if (documents.length >= limit) return
+      corrections(word, position === queryWords.length - 1).forEach(correction => {
+        const corrected = [...queryWords]
+        corrected[position] = correction
+        lookup(corrected.join(' ')).forEach(document => {
+          if (!documents.includes(document)) documents.push(document)
+        })
+      })
+    })
+    return documents.map(document => parksById.get(attractions[document])).filter(Boolean).slice(0, limit)
+  }
+}
+
+// Deepest zoom the viewport tiles thin at (MAX_ZOOM in scripts/build_vector_tiles.py);
+// deeper views reuse these tiles, which already hold every attraction
+const VIEWPORT_TILE_MAX_ZOOM = 10
+
+/**
+ * Web Mercator tiles covering bounds ({ west, south, east, north } in degrees,
+ * as from Leaflet's map.getBounds()) at zoom, as [{ z, x, y }]
+ */
+export const tilesForBounds = (bounds, zoom) => {
+  const z = Math.max(0, Math.floor(zoom))
+  const scale = 2 ** z
+  const tileY = (lat) => {
+    const sin = Math.sin((Math.max(-85.0511287798, Math.min(85.0511287798, lat)) * Math.PI) / 180)
+    const y = 0.5 - Math.log((1 + sin) / (1 - sin)) / (4 * Math.PI)
+    return Math.min(scale - 1, Math.max(0, Math.floor(y * scale)))
+  }
+  const west = Math.floor(((bounds.west + 180) / 360) * scale)
+  const east = Math.floor(((bounds.east + 180) / 360) * scale)
+  // Leaflet bounds can run past +-180; columns wrap around the world
+  const columns = new Set()
+  for (let x = west; x <= east && columns.size < scale; x++) {
+    columns.add(((x % scale) + scale) % scale)
+  }
+
+  const tiles = []
+  columns.forEach(x => {
+    for (let y = tileY(bounds.north); y <= tileY(bounds.south); y++) tiles.push({ z, x, y })
+  })
+  return tiles
+}
+
+// Thinning of scripts/build_vector_tiles.py: below VIEWPORT_TILE_MAX_ZOOM a tile
+// keeps its best ranked point per 256 x 256 cell of its 4096 extent, ranked by
+// category priority, then catalog order
+const THINNING_CELLS_PER_TILE = 16
+const THINNING_CATEGORY_PRIORITY = ['UNESCO', 'Parks', 'MostPhotographed', 'Jyotirlinga', 'ShaktiPeetha', 'Temples',
+  'DivyaDesam', 'OtherTemples', 'Forts', 'Matham', 'TrekkingFlights']
+
+/**
+ * The parks inside bounds (widened by padding, a fraction of the view on each
+ * side) that are drawn at zoom, thinned like the vector tiles but over the
+ * given parks only, so thinning follows whatever filters produced them
+ */
+export const thinParks = (parks, bounds, zoom, { padding = 0.5 } = {}) => {
+  const padLat = (bounds.north - bounds.south) * padding
+  const padLon = (bounds.east - bounds.west) * padding
+  const south = bounds.south - padLat
+  const north = bounds.north + padLat
+  const west = bounds.west - padLon
+  const width = Math.min(360, bounds.east + padLon - west)
+
+  const inView = parks.filter(park => {
+    const lat = parseFloat(park.Latitude)
+    const lon = parseFloat(park.Longitude)
+    if (isNaN(lat) || isNaN(lon) || lat < south || lat > north) return false
+    // Leaflet bounds can run past +-180
+    return ((((lon - west) % 360) + 360) % 360) <= width
+  })
+  const z = Math.floor(zoom)
+  if (z >= VIEWPORT_TILE_MAX_ZOOM) return inView
+
+  const priority = (park) => {
+    const rank = THINNING_CATEGORY_PRIORITY.indexOf(park.Category)
+    return rank === -1 ? THINNING_CATEGORY_PRIORITY.length : rank
+  }
+  const cellsPerSide = 2 ** z * THINNING_CELLS_PER_TILE
+  const best = new Map()
+  inView.forEach((park, order) => {
+    const sin = Math.sin((Math.max(-85.0511287798, Math.min(85.0511287798, parseFloat(park.Latitude))) * Math.PI) / 180)
+    const x = (parseFloat(park.Longitude) + 180) / 360
+    const y = 0.5 - Math.log((1 + sin) / (1 - sin)) / (4 * Math.PI)
+    const cell = Math.floor(x * cellsPerSide) * cellsPerSide + Math.floor(y * cellsPerSide)
+    const rank = priority(park)
+    const current = best.get(cell)
+    if (!current || rank < current.rank) best.set(cell, { park, rank, order })
+  })
+  return [...best.values()].sort((a, b) => a.order - b.order).map(entry => entry.park)
+}
+
+/**
+ * Viewport loader over the tile endpoint of scripts/catalog_service.py.
+ * load(bounds, zoom) fetches the tiles covering the view, thinned for the
+ * zoom, and resolves to the attractions in them. Tiles are kept in a small
+ * LRU: one fetched less than maxAge ms ago is reused as is, an older one is
+ * revalidated with its ETag, so unchanged tiles come back as empty 304s.
+ * filters ({ category, country, region }, comma-separated) narrow every tile,
+ * and the service thins only the attractions that match them. Without a
+ * baseUrl (no service, as on the deployed app) it reads the static vector
+ * tiles instead, which are thinned over the whole catalog and ignore filters
+ */
+export const createViewportLoader = (baseUrl, { maxTiles = 256, maxAge = 60000, filters = {} } = {}) => {
+  if (!baseUrl) return createVectorTileLoader({ maxTiles })
+
+  const tiles = new Map()
+  const search = new URLSearchParams(Object.entries(filters).filter(([, value]) => value)).toString()
+
+  const loadTile = async ({ z, x, y }) => {
+    const key = `${z}/${x}/${y}`
+    const cached = tiles.get(key)
+    if (cached) tiles.delete(key)
+    if (cached && Date.now() - cached.fetched < maxAge) {
+      tiles.set(key, cached)
+      return cached
+    }
+
+    let tile = cached
+    try {
+      const response = await fetch(`${baseUrl}/tiles/${key}.json${search ? `?${search}` : ''}`, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {}
+      })
+      if (response.status === 304 && cached) {
+        tile = { ...cached, fetched: Date.now() }
+      } else if (response.ok) {
+        const document = await response.json()
+        tile = { etag: response.headers.get('ETag'), fetched: Date.now(), results: document.results, hidden: document.hidden }
+      }
+    } catch (error) {
+      console.error(`Error loading tile ${key}:`, error)
+    }
+    if (!tile) return null
+
+    tiles.set(key, tile)
+    while (tiles.size > maxTiles) tiles.delete(tiles.keys().next().value)
+    return tile
+  }
+
+  return async (bounds, zoom) => {
+    const z = Math.min(VIEWPORT_TILE_MAX_ZOOM, Math.floor(zoom))
+    const loaded = await Promise.all(tilesForBounds(bounds, z).map(loadTile))
+    return loaded.filter(Boolean).flatMap(tile => tile.results)
+  }
+}
+
+/**
+ * Decode a Mapbox Vector Tile of the static pyramid written by
+ * scripts/build_vector_tiles.py into its points, as [{ id, category, name, lat, lon }].
+ * tile is the { z, x, y } the buffer was fetched for
+ */
+export const decodeVectorTile = (buffer, { z, x, y }) => {
+  const bytes = new Uint8Array(buffer)
+  const text = new TextDecoder()
+
+  const readVarint = (state) => {
+    let value = 0
+    let shift = 0
+    let byte
+    do {
+      byte = bytes[state.pos++]
+      value += (byte & 0x7f) * 2 ** shift
+      shift += 7
+    } while (byte & 0x80)
+    return value
+  }
+  // Fields of the message in bytes[start, end), as [[field number, value]], where
+  // a value is a number for varints and a [start, end) range for length-delimited fields
+  const readFields = (start, end) => {
+    const state = { pos: start }
+    const fields = []
+    while (state.pos < end) {
+      const key = readVarint(state)
+      const wireType = key & 0x7
+      if (wireType === 0) {
+        fields.push([key >> 3, readVarint(state)])
+      } else if (wireType === 2) {
+        const length = readVarint(state)
+        fields.push([key >> 3, [state.pos, state.pos + length]])
+        state.pos += length
+      } else {
+        state.pos += wireType === 1 ? 8 : 4
+      }
+    }
+    return fields
+  }
+  const readPacked = ([start, end]) => {
+    const state = { pos: start }
+    const values = []
+    while (state.pos < end) values.push(readVarint(state))
+    return values
+  }
+  const readString = ([start, end]) => text.decode(bytes.subarray(start, end))
+  const unzigzag = (value) => (value % 2 ? -(value + 1) / 2 : value / 2)
+
+  const scale = 2 ** z
+  const points = []
+  readFields(0, bytes.length).filter(([number]) => number === 3).forEach(([, layer]) => {
+    const keys = []
+    const values = []
+    const features = []
+    let extent = 4096
+    readFields(...layer).forEach(([number, value]) => {
+      if (number === 2) features.push(value)
+      else if (number === 3) keys.push(readString(value))
+      else if (number === 4) {
+        const string = readFields(...value).find(([valueNumber]) => valueNumber === 1)
+        values.push(string ? readString(string[1]) : null)
+      } else if (number === 5) extent = value
+    })
+
+    features.forEach(feature => {
+      const point = {}
+      let geometry = []
+      readFields(...feature).forEach(([number, value]) => {
+        if (number === 2) {
+          const tags = readPacked(value)
+          for (let i = 0; i < tags.length; i += 2) point[keys[tags[i]]] = values[tags[i + 1]]
+        } else if (number === 4) {
+          geometry = readPacked(value)
+        }
+      })
+      // A single MoveTo command: the point's position within the tile extent
+      if (geometry.length < 3) return
+      const worldX = (x + unzigzag(geometry[1]) / extent) / scale
+      const worldY = (y + unzigzag(geometry[2]) / extent) / scale
+      point.lon = worldX * 360 - 180
+      point.lat = (Math.atan(Math.sinh(Math.PI * (1 - 2 * worldY))) * 180) / Math.PI
+      points.push(point)
+    })
+  })
+  return points
+}
+
+/**
+ * Viewport loader over the static vector tile pyramid in public/tiles.
+ * load(bounds, zoom) fetches the .pbf tiles covering the view and resolves to
+ * the points drawn at that zoom. Tiles are kept in an LRU of maxTiles; missing
+ * tiles (no attractions there) count as empty
+ */
+export const createVectorTileLoader = ({ baseUrl = '/tiles', maxTiles = 256 } = {}) => {
+  const tiles = new Map()
+
+  const loadTile = async (tile) => {
+    const key = `${tile.z}/${tile.x}/${tile.y}`
+    if (tiles.has(key)) {
+      const points = tiles.get(key)
+      tiles.delete(key)
+      tiles.set(key, points)
+      return points
+    }
+
+    let points = []
+    try {
+      const response = await fetch(`${baseUrl}/${key}.pbf`)
+      // The dev server answers missing files with the app's index page
+      const type = response.headers.get('Content-Type') || ''
+      if (response.ok && !type.includes('text/html')) {
+        points = decodeVectorTile(await response.arrayBuffer(), tile)
+      } else if (!response.ok && response.status !== 404) {
+        return []
+      }
+    } catch (error) {
+      console.error(`Error loading vector tile ${key}:`, error)
+      return []
+    }
+
+    tiles.set(key, points)
+    while (tiles.size > maxTiles) tiles.delete(tiles.keys().next().value)
+    return points
+  }
+
+  return async (bounds, zoom) => {
+    const z = Math.min(VIEWPORT_TILE_MAX_ZOOM, Math.floor(zoom))
+    const loaded = await Promise.all(tilesForBounds(bounds, z).map(loadTile))
+    return loaded.flat()
+  }
+}
+
 /**
  * Categorize parks by region
  */
@@ -906,6 +1563,12 @@ export const categorizeParksByRegion = (parks) => {
   }
   
   parks.forEach(park => {
+    // Rows from the merged catalog come with their region already resolved
+    if (park.Region !== undefined) {
+      if (regions[park.Region]) regions[park.Region].push(park)
+      return
+    }
+
     const country = park.Country || 'United States'
     const states = (park.States || '').split(',').map(s => s.trim())
     
@@ -1,10 +1,195 @@
 // Service for reverse geocoding to get location names from coordinates
 
+const EARTH_RADIUS_MILES = 3958.8
+
+const haversineMiles = (lat1, lon1, lat2, lon2) => {
+  const toRadians = degrees => degrees * Math.PI / 180
+  const a = Math.sin(toRadians(lat2 - lat1) / 2) ** 2 +
+    Math.cos(toRadians(lat1)) * Math.cos(toRadians(lat2)) * Math.sin(toRadians(lon2 - lon1) / 2) ** 2
+  return 2 * EARTH_RADIUS_MILES * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a))
+}
+
+// Even-odd ray casting over flat [lon, lat, lon, lat, ...] rings
+const pointInRings = (lon, lat, rings) => {
+  let inside = false
+  for (const ring of rings) {
+    const n = ring.length / 2
+    for (let i = 0, j = n - 1; i < n; j = i++) {
+      const xi = ring[2 * i], yi = ring[2 * i + 1], xj = ring[2 * j], yj = ring[2 * j + 1]
+      if ((yi > lat) !== (yj > lat) && lon < (xj - xi) * (lat - yi) / (yj - yi) + xi) {
+        inside = !inside
+      }
+    }
+  }
+  return inside
+}
+
+/**
+ * Build a lookup over public/data/reverse_geocode.json, the same lookup as
+ * ReverseGeocoder in scripts/build_reverse_geocoder.py. lookup(lat, lon)
+ * returns { city, state, country, distance } from the nearest airport city
+ * and labelled places around the point, overridden by any boundary polygon
+ * containing it, or null when nothing is known nearby
+ */
+export const createReverseGeocoder = (index) => {
+  if (!index) return null
+
+  const { places, strings, cell_degrees: step, city_radius: cityRadius, region_radius: regionRadius } = index
+  const columns = Math.round(360 / step)
+  const rows = Math.round(180 / step)
+  const label = code => (code >= 0 ? strings[code] : null)
+  const cellKey = (lat, lon, cellStep = step) => {
+    const cellColumns = Math.round(360 / cellStep)
+    const row = Math.min(Math.floor((lat + 90) / cellStep), Math.round(180 / cellStep) - 1)
+    const column = ((Math.floor((lon + 180) / cellStep) % cellColumns) + cellColumns) % cellColumns
+    return row * cellColumns + column
+  }
+
+  // Cells within radius miles of the point, by bounding box
+  const nearbyCells = (lat, lon, radius) => {
+    const latSpan = radius / 69
+    const lonSpan = radius / Math.max(69 * Math.cos(Math.min(Math.abs(lat) + latSpan, 89) * Math.PI / 180), 1e-6)
+    const firstRow = Math.max(0, Math.floor((lat - latSpan + 90) / step))
+    const lastRow = Math.min(rows - 1, Math.floor((lat + latSpan + 90) / step))
+    const columnRange = []
+    if (lonSpan >= 180) {
+      for (let c = 0; c < columns; c++) columnRange.push(c)
+    } else {
+      const last = Math.floor((lon + lonSpan + 180) / step)
+      for (let c = Math.floor((lon - lonSpan + 180) / step); c <= last; c++) {
+        columnRange.push(((c % columns) + columns) % columns)
+      }
+    }
+    const keys = []
+    for (let row = firstRow; row <= lastRow; row++) {
+      for (const column of columnRange) keys.push(row * columns + column)
+    }
+    return keys
+  }
+
+  // Countries with a boundary polygon; small ones missing from the boundary
+  // data fall inside a neighbour's polygon and keep their nearest place's label
+  const bounded = new Set(index.regions.filter(region => region.level === 'country').map(region => region.name))
+
+  const boundaries = (lat, lon) => {
+    const found = {}
+    for (const r of index.region_cells[cellKey(lat, lon, index.region_cell_degrees)] || []) {
+      const region = index.regions[r]
+      const [west, south, east, north] = region.bbox
+      if (!found[region.level] && west <= lon && lon <= east && south <= lat && lat <= north &&
+          pointInRings(lon, lat, region.rings)) {
+        found[region.level] = region
+      }
+    }
+    return found
+  }
+
+  return (lat, lon) => {
+    let city = null
+    let region = null
+    let cityDistance = Infinity
+    let regionDistance = Infinity
+    for (const key of nearbyCells(lat, lon, Math.max(cityRadius, regionRadius))) {
+      for (const place of index.cells[key] || []) {
+        const distance = haversineMiles(lat, lon, places.lat[place], places.lon[place])
+        if (places.city[place] >= 0 && distance < cityDistance && distance <= cityRadius) {
+          city = place
+          cityDistance = distance
+        }
+        if (distance < regionDistance && distance <= regionRadius) {
+          region = place
+          regionDistance = distance
+        }
+      }
+    }
+
+    let state = null
+    let country = null
+    if (region !== null) {
+      state = label(places.state[region])
+      country = label(places.country[region])
+    }
+    if (city !== null && places.country[city] === places.country[region]) {
+      state = label(places.state[city]) || state
+    }
+
+    const boundary = boundaries(lat, lon)
+    if (region !== null && !bounded.has(places.country[region])) delete boundary.country
+    if (boundary.country) {
+      const name = label(boundary.country.name)
+      // The nearest place is across the border; its state is not this one
+      if (name !== country) state = null
+      country = name
+    }
+    if (boundary.state) {
+      state = label(boundary.state.name)
+      country = country || label(boundary.state.country)
+    }
+    if (city !== null && label(places.country[city]) !== country) city = null
+
+    if (city === null && state === null && country === null) return null
+    const distance = city !== null ? cityDistance : (Object.keys(boundary).length ? 0 : regionDistance)
+    return {
+      city: city !== null ? label(places.city[city]) : null,
+      state,
+      country,
+      distance: Math.round(distance * 10) / 10
+    }
+  }
+}
+
+let reverseGeocoderPromise = null
+
+/**
+ * Load the offline reverse geocoder once; resolves to null when the index
+ * is not deployed
+ */
+export const loadReverseGeocoder = () => {
+  if (!reverseGeocoderPromise) {
+    reverseGeocoderPromise = fetch('/data/reverse_geocode.json')
+      .then(response => (response.ok ? response.json() : null))
+      .then(createReverseGeocoder)
+      .catch(error => {
+        console.error('Error loading reverse geocoder:', error)
+        return null
+      })
+  }
+  return reverseGeocoderPromise
+}
+
+/**
+ * Reverse geocode coordinates from the bundled index, without a network call
+ * per lookup. Returns null when the index is missing or knows nothing nearby
+ */
+export const reverseGeocodeOffline = async (lat, lon) => {
+  const lookup = await loadReverseGeocoder()
+  return lookup ? lookup(lat, lon) : null
+}
+
 /**
  * Reverse geocode coordinates to get location information
- * Uses OpenStreetMap Nominatim API (free, no API key required)
+ * Answers from the offline index when it knows the city, otherwise uses
+ * OpenStreetMap Nominatim API (free, no API key required)
  */
 export const reverseGeocode = async (lat, lon) => {
+  const offline = await reverseGeocodeOffline(lat, lon)
+  if (offline && offline.city) {
+    const parts = [offline.city, offline.state, offline.country].filter(Boolean)
+    return {
+      city: offline.city,
+      state: offline.state,
+      country: offline.country,
+      displayName: parts.join(', '),
+      fullAddress: {
+        city: offline.city,
+        state: offline.state,
+        country: offline.country,
+        county: null,
+        postcode: null
+      }
+    }
+  }
+
   try {
     // Add delay to respect Nominatim's rate limit (1 request per second)
     await new Promise(resolve => setTimeout(resolve, 1000))